@@ -6,6 +6,8 @@ from .fbx_smallest_size import SmallestSize
 from .batch_list_resize import BatchListResize
 from .fbx_depth_node import FBX_Depth_Blender
 from .fbx_canny_node import FBX_Canny_Blender
+from .fbx_multipass_node import FBX_Multipass_Blender
+from .fbx_pose_render_node import FBX_Pose_Render, FBX_Pose_Render_MultiView
 
 NODE_CLASS_MAPPINGS = {
     "FBX_Info": FBX_Info,
@@ -16,6 +18,9 @@ NODE_CLASS_MAPPINGS = {
     "BatchListResize": BatchListResize,
     "FBX_Depth_Blender": FBX_Depth_Blender,
     "FBX_Canny_Blender": FBX_Canny_Blender,
+    "FBX_Multipass_Blender": FBX_Multipass_Blender,
+    "FBX_Pose_Render": FBX_Pose_Render,
+    "FBX_Pose_Render_MultiView": FBX_Pose_Render_MultiView,
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
@@ -27,4 +32,7 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     "BatchListResize": "BatchListResize",
     "FBX_Depth_Blender": "FBX Depth (Blender Z-Depth)",
     "FBX_Canny_Blender": "FBX Canny (Blender Edges)",
+    "FBX_Multipass_Blender": "FBX Multipass (Blender)",
+    "FBX_Pose_Render": "FBX Pose Render",
+    "FBX_Pose_Render_MultiView": "FBX Pose Render (Multi-View)",
 }
\ No newline at end of file
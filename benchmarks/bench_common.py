@@ -0,0 +1,109 @@
+# Shared bits for the benchmark scripts: importing the node package without
+# ComfyUI, timing, peak RSS and the baseline files.
+#
+# The repo is a ComfyUI custom node package (relative imports, __init__ that
+# registers nodes), so the benchmarks mount the repo folder as a package
+# under a private name instead of importing __init__.py.
+
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+import types
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+PACKAGE_NAME = "fbx_import_bench"
+
+
+def load_module(name):
+    """Import fbx_import_bench.<name> (a module of this repo) without running __init__.py."""
+    if PACKAGE_NAME not in sys.modules:
+        pkg = types.ModuleType(PACKAGE_NAME)
+        pkg.__path__ = [REPO_DIR]
+        sys.modules[PACKAGE_NAME] = pkg
+    return importlib.import_module(f"{PACKAGE_NAME}.{name}")
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None if unknown)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024.0 * 1024.0)
+    except Exception:
+        return None
+
+
+def time_best(fn, repeats, setup=None):
+    """
+    Best-of-N wall time of fn(setup()) in seconds; setup (untimed) builds
+    fresh inputs for every run so in-place helpers can't skew repeats.
+    Returns (seconds, last result).
+    """
+    best = None
+    result = None
+    for _ in range(max(1, repeats)):
+        arg = setup() if setup is not None else None
+        t0 = time.perf_counter()
+        result = fn(arg) if setup is not None else fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def machine_info():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def baseline_path(suite):
+    return os.path.join(BASELINE_DIR, f"{suite}.json")
+
+
+def save_baseline(suite, results):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    path = baseline_path(suite)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"machine": machine_info(), "results": results}, f, indent=2)
+    return path
+
+
+def compare_baseline(suite, results, tolerance, metric="seconds"):
+    """
+    Compare results (case -> stage -> {metric: value}) against the stored
+    baseline. Returns a list of regression strings (stage slower than
+    baseline * (1 + tolerance)); raises FileNotFoundError without a baseline.
+    """
+    with open(baseline_path(suite), "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressions = []
+    for case, stages in results.items():
+        base_stages = baseline.get(case)
+        if not base_stages:
+            continue
+        for stage, values in stages.items():
+            base = base_stages.get(stage, {}).get(metric)
+            now = values.get(metric)
+            if not base or now is None:
+                continue
+            if now > base * (1.0 + tolerance):
+                regressions.append(
+                    f"{case} / {stage}: {now * 1000:.2f} ms vs baseline {base * 1000:.2f} ms "
+                    f"(+{(now / base - 1.0) * 100:.0f}%)"
+                )
+    return regressions
@@ -0,0 +1,174 @@
+"""
+Benchmarks for the node side of the Blender-backed nodes, with mock_blender.py
+standing in for Blender (so the numbers are everything except the render).
+
+    python benchmarks/bench_nodes.py                  # full grid
+    python benchmarks/bench_nodes.py --quick          # small grid
+    python benchmarks/bench_nodes.py --save-baseline  # store results
+    python benchmarks/bench_nodes.py --compare        # fail on regressions
+
+Two kinds of case:
+    load_*   the loaders alone on a folder of mock output (_load_depth_stack,
+             _load_canny_stack, joint_data.json parse)
+    node_*   a full node call per transport, mock Blender run included
+
+Baselines go to benchmarks/baselines/nodes.json.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+from bench_common import compare_baseline, load_module, peak_rss_mb, save_baseline, time_best
+from mock_blender import depth_frame, rgb_frame
+from mock_harness import MockSetup, env, run_canny, run_depth, run_pose
+
+SUITE = "nodes"
+
+FULL_GRID = {
+    "frames": [24, 120],
+    "resolution": [(512, 512), (1024, 1024)],
+}
+QUICK_GRID = {
+    "frames": [24],
+    "resolution": [(512, 512)],
+}
+
+
+def write_depth_pngs(folder, frames, width, height):
+    os.makedirs(folder, exist_ok=True)
+    for f in range(1, frames + 1):
+        mist = depth_frame(f, frames, width, height)
+        Image.fromarray((mist * 65535.0 + 0.5).astype(np.uint16)).save(
+            os.path.join(folder, f"depth_{f:04d}.png")
+        )
+
+
+def write_rgb_pngs(folder, frames, width, height):
+    os.makedirs(folder, exist_ok=True)
+    for f in range(1, frames + 1):
+        Image.fromarray(rgb_frame(f, frames, width, height)).save(
+            os.path.join(folder, f"rgb_{f:04d}.png")
+        )
+
+
+def write_joint_json(path, frames):
+    from bench_pose_pipeline import synthetic_walk
+
+    clip = synthetic_walk(frames, root_motion=2.0)
+    data = {
+        "frame_indices": list(range(1, frames + 1)),
+        "frames": [{"frame_index": i + 1, "joints": j} for i, j in enumerate(clip)],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def bench_loaders(frames, width, height, repeats, workdir):
+    depth_node = load_module("fbx_depth_node").FBX_Depth_Blender()
+    canny_node = load_module("fbx_canny_node").FBX_Canny_Blender()
+    pose_mod = load_module("fbx_pose_node_body25_match")
+
+    depth_dir = os.path.join(workdir, "depth")
+    rgb_dir = os.path.join(workdir, "rgb")
+    joint_path = os.path.join(workdir, "joint_data.json")
+    write_depth_pngs(depth_dir, frames, width, height)
+    write_rgb_pngs(rgb_dir, frames, width, height)
+    write_joint_json(joint_path, frames)
+
+    def _parse_joints():
+        with open(joint_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return [pose_mod._clean_joints(item.get("joints", {})) for item in data.get("frames", [])]
+
+    stages = {}
+    for stage, fn in (
+        ("load_depth_stack", lambda: depth_node._load_depth_stack(depth_dir, width, height, True)),
+        ("load_canny_stack", lambda: canny_node._load_canny_stack(rgb_dir, width, height, 100, 200)),
+        ("parse_joint_json", _parse_joints),
+    ):
+        sec, _ = time_best(fn, repeats)
+        stages[stage] = {"seconds": sec, "fps": frames / sec if sec > 0 else None}
+    return stages
+
+
+def bench_nodes(setup, frames, width, height, repeats):
+    runs = (
+        ("pose_json", lambda: run_pose(setup, frames, width, height, "JSON Files")),
+        ("pose_shm", lambda: run_pose(setup, frames, width, height, "Shared Memory")),
+        ("pose_stream", lambda: run_pose(setup, frames, width, height, "Stream (stdout)")),
+        ("depth_png", lambda: run_depth(setup, frames, width, height, "PNG Files")),
+        ("depth_shm", lambda: run_depth(setup, frames, width, height, "Shared Memory")),
+        ("canny_png", lambda: run_canny(setup, frames, width, height, "PNG Files")),
+        ("canny_shm", lambda: run_canny(setup, frames, width, height, "Shared Memory")),
+    )
+    # The pose render cache would turn every repeat after the first into hits
+    cache = load_module("fbx_pose_render_cache").RENDER_CACHE
+
+    def _fresh():
+        cache.clear()
+
+    stages = {}
+    for stage, fn in runs:
+        sec, _ = time_best(lambda _: fn(), repeats, setup=_fresh)
+        stages[stage] = {"seconds": sec, "fps": frames / sec if sec > 0 else None}
+    return stages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="small grid for a fast check")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per stage, best is kept")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="exit 1 if a stage regressed")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown for --compare")
+    args = parser.parse_args(argv)
+
+    grid = QUICK_GRID if args.quick else FULL_GRID
+
+    results = {}
+    with MockSetup() as setup, env(FBX_MOCK_ANIM_FRAMES=max(grid["frames"])):
+        for frames in grid["frames"]:
+            for width, height in grid["resolution"]:
+                for kind in ("load", "node"):
+                    name = f"{kind}_f{frames}_{width}x{height}"
+                    if kind == "load":
+                        with tempfile.TemporaryDirectory(dir=setup.root) as workdir:
+                            stages = bench_loaders(frames, width, height, args.repeats, workdir)
+                    else:
+                        stages = bench_nodes(setup, frames, width, height, args.repeats)
+                    results[name] = stages
+
+                    print(name)
+                    for stage, values in stages.items():
+                        print(f"    {stage:<20} {values['seconds'] * 1000:9.2f} ms  {values['fps']:9.1f} frames/s")
+
+    rss = peak_rss_mb()
+    if rss is not None:
+        print(f"peak RSS {rss:.0f} MB")
+
+    if args.save_baseline:
+        print("Baseline written to", save_baseline(SUITE, results))
+
+    if args.compare:
+        try:
+            regressions = compare_baseline(SUITE, results, args.tolerance)
+        except FileNotFoundError:
+            print("No baseline yet, run with --save-baseline first.")
+            return 1
+        if regressions:
+            print("Regressions:")
+            for line in regressions:
+                print("   ", line)
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
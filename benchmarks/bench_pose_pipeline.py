@@ -0,0 +1,289 @@
+"""
+Benchmarks for the non-Blender half of FBX_Extraction: projection (single
+and four-view), reference alignment, stickman drawing, tensor conversion and
+the whole generate_aligned_pose_images() call, on synthetic walk cycles that use the
+same joint names as the Blender extractor (CANONICAL_JOINTS + face clusters).
+
+    python benchmarks/bench_pose_pipeline.py                  # full grid
+    python benchmarks/bench_pose_pipeline.py --quick          # small grid
+    python benchmarks/bench_pose_pipeline.py --save-baseline  # store results
+    python benchmarks/bench_pose_pipeline.py --compare        # fail on regressions
+
+Every case runs in a fresh process so its peak RSS is its own. Baselines go
+to benchmarks/baselines/pose_pipeline.json and are only meaningful on the
+machine that wrote them.
+"""
+
+import argparse
+import copy
+import math
+import multiprocessing
+import sys
+
+import numpy as np
+
+from bench_common import compare_baseline, load_module, peak_rss_mb, save_baseline, time_best
+
+SUITE = "pose_pipeline"
+
+FULL_GRID = {
+    "frames": [24, 120, 480],
+    "resolution": [(512, 512), (1024, 1024)],
+    "root_motion": [0.0, 4.0],
+}
+QUICK_GRID = {
+    "frames": [24, 120],
+    "resolution": [(512, 512)],
+    "root_motion": [0.0, 4.0],
+}
+
+# Rest pose in Blender space (metres, Z up, character facing -Y)
+REST_POSE = {
+    "hips": (0.0, 0.0, 1.0),
+    "spine": (0.0, 0.0, 1.15),
+    "chest": (0.0, 0.0, 1.35),
+    "neck": (0.0, 0.0, 1.55),
+    "head": (0.0, 0.0, 1.68),
+    "left_shoulder": (0.18, 0.0, 1.5),
+    "left_elbow": (0.45, 0.0, 1.5),
+    "left_wrist": (0.7, 0.0, 1.5),
+    "right_shoulder": (-0.18, 0.0, 1.5),
+    "right_elbow": (-0.45, 0.0, 1.5),
+    "right_wrist": (-0.7, 0.0, 1.5),
+    "left_hip": (0.1, 0.0, 0.95),
+    "left_knee": (0.1, 0.0, 0.52),
+    "left_ankle": (0.1, 0.0, 0.08),
+    "right_hip": (-0.1, 0.0, 0.95),
+    "right_knee": (-0.1, 0.0, 0.52),
+    "right_ankle": (-0.1, 0.0, 0.08),
+    "left_eye": (0.03, -0.08, 1.72),
+    "right_eye": (-0.03, -0.08, 1.72),
+    "nose": (0.0, -0.1, 1.69),
+    "left_ear": (0.08, 0.0, 1.7),
+    "right_ear": (-0.08, 0.0, 1.7),
+}
+
+FINGERS = ("thumb", "index", "middle", "ring", "pinky")
+
+# Face bones in CANONICAL_JOINTS order. The synthetic rig has all of them, so
+# like a real rig with face bones its joints come out in a different order
+# from POSE_JOINT_NAMES (which follows a rig without them).
+FACE_BONES = ("left_eye", "right_eye", "nose", "left_ear", "right_ear")
+
+
+def _rotate_x(vec, pivot, angle):
+    """Rotate vec about the X axis through pivot (limb swing)."""
+    y, z = vec[1] - pivot[1], vec[2] - pivot[2]
+    c, s = math.cos(angle), math.sin(angle)
+    return (vec[0], pivot[1] + y * c - z * s, pivot[2] + y * s + z * c)
+
+
+def synthetic_walk(num_frames, root_motion, seed=0):
+    """
+    Walk cycle as per-frame {joint_name: [x, y, z]} dicts, the same shape and
+    joint order the Blender extractor writes (CANONICAL_JOINTS, then the face
+    clusters). root_motion is the total X travel in metres (0 = in place).
+    """
+    pose_colors = load_module("fbx_pose_colors")
+    rng = np.random.default_rng(seed)
+    face_names = [
+        n for n in pose_colors.POSE_JOINT_NAMES
+        if n not in REST_POSE and "_base" not in n and "_tip" not in n
+    ]
+    names = [
+        n for n in pose_colors.POSE_JOINT_NAMES
+        if n not in FACE_BONES and n not in face_names
+    ] + list(FACE_BONES) + face_names
+    face_offsets = {n: rng.normal(scale=0.04, size=3) + (0.0, -0.09, 0.0) for n in face_names}
+
+    frames = []
+    for i in range(num_frames):
+        phase = 2.0 * math.pi * i / 30.0
+        swing = 0.5 * math.sin(phase)
+        shift = root_motion * i / max(num_frames - 1, 1)
+        bob = 0.03 * math.sin(2.0 * phase)
+
+        joints = {}
+        for name, rest in REST_POSE.items():
+            pos = rest
+            if name.startswith(("left_elbow", "left_wrist")):
+                pos = _rotate_x(pos, REST_POSE["left_shoulder"], -swing)
+            elif name.startswith(("right_elbow", "right_wrist")):
+                pos = _rotate_x(pos, REST_POSE["right_shoulder"], swing)
+            elif name in ("left_knee", "left_ankle"):
+                pos = _rotate_x(pos, REST_POSE["left_hip"], swing)
+            elif name in ("right_knee", "right_ankle"):
+                pos = _rotate_x(pos, REST_POSE["right_hip"], -swing)
+            joints[name] = [pos[0] + shift, pos[1], pos[2] + bob]
+
+        for side in ("left", "right"):
+            wx, wy, wz = joints[f"{side}_wrist"]
+            sign = 1.0 if side == "left" else -1.0
+            for k, finger in enumerate(FINGERS):
+                spread = (k - 2) * 0.015
+                joints[f"{side}_{finger}_base"] = [wx + sign * 0.05, wy + spread, wz]
+                joints[f"{side}_{finger}_tip"] = [wx + sign * 0.12, wy + spread, wz - 0.01]
+
+        hx, hy, hz = joints["head"]
+        for name, off in face_offsets.items():
+            joints[name] = [hx + off[0], hy + off[1], hz + off[2]]
+
+        frames.append({n: joints[n] for n in names if n in joints})
+    return frames
+
+
+def reference_image(width, height):
+    """A ref "stickman" batch: a lit rectangle covering most of the frame."""
+    import torch
+    ref = torch.zeros((1, height, width, 3), dtype=torch.float32)
+    ref[:, int(height * 0.1):int(height * 0.92), int(width * 0.3):int(width * 0.7), :] = 1.0
+    return ref
+
+
+def run_case(case, repeats):
+    """Time every stage of one (frames, resolution, root motion) case."""
+    body25 = load_module("fbx_pose_helpers_body25")
+    match = load_module("fbx_pose_helpers_body25_match")
+    cache = load_module("fbx_pose_render_cache")
+
+    num_frames, (width, height), root_motion = case
+    joint_frames = synthetic_walk(num_frames, root_motion)
+    ref = reference_image(width, height)
+    bbox = match._compute_ref_bbox_from_image(ref, width, height)
+    draw_args = (width, height, 4, 2, "ControlNet Colors", "Full Face (FACE_70)")
+
+    stages = {}
+
+    def record(stage, seconds):
+        stages[stage] = {"seconds": seconds, "fps": num_frames / seconds if seconds > 0 else None}
+
+    sec, projected = time_best(
+        lambda frames: body25.project_and_normalize(
+            frames, width, height, "Front", 1.0, False, "Orthographic (Stable)"
+        ),
+        repeats,
+        setup=lambda: copy.deepcopy(joint_frames),
+    )
+    record("project_and_normalize", sec)
+
+    # Front / sides / back in one vectorised pass (per frame of each view)
+    four_views = [("Front", 0.0), ("Left Side", 0.0), ("Right Side", 0.0), ("Back", 0.0)]
+    sec, _ = time_best(
+        lambda frames: body25.project_views(
+            frames, width, height, four_views, 1.0, "Orthographic (Stable)"
+        ),
+        repeats,
+        setup=lambda: copy.deepcopy(joint_frames),
+    )
+    stages["project_views_x4"] = {"seconds": sec, "fps": 4 * num_frames / sec if sec > 0 else None}
+
+    sec, aligned = time_best(
+        lambda frames: match._align_projected_frames_to_bbox(frames, bbox, "Match Full Body"),
+        repeats,
+        setup=lambda: copy.deepcopy(projected),
+    )
+    record("align_to_bbox", sec)
+
+    def _fresh_aligned():
+        # Empty render cache, otherwise every repeat after the first is all hits
+        cache.RENDER_CACHE.clear()
+        return copy.deepcopy(aligned)
+
+    sec, images = time_best(
+        lambda frames: body25.draw_pose_images(frames, *draw_args),
+        repeats,
+        setup=_fresh_aligned,
+    )
+    record("draw_pose_images", sec)
+
+    sec, _ = time_best(lambda: body25.numpy_to_comfy_image(images), repeats)
+    record("numpy_to_comfy_image", sec)
+
+    def _fresh_frames():
+        cache.RENDER_CACHE.clear()
+        return copy.deepcopy(joint_frames)
+
+    sec, _ = time_best(
+        lambda frames: match.generate_aligned_pose_images(
+            frames, width, height, "Front", 1.0, False,
+            "ControlNet Colors", "Full Face (FACE_70)", 4, 2,
+            ref, "Match Full Body", "Orthographic (Stable)",
+        ),
+        repeats,
+        setup=_fresh_frames,
+    )
+    record("generate_aligned_pose_images", sec)
+
+    stages["peak_rss"] = {"mb": peak_rss_mb()}
+    return stages
+
+
+def case_name(case):
+    num_frames, (width, height), root_motion = case
+    return f"f{num_frames}_{width}x{height}_root{root_motion:g}"
+
+
+def _worker(case, repeats, queue):
+    queue.put(run_case(case, repeats))
+
+
+def run_isolated(case, repeats):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_worker, args=(case, repeats, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="small grid for a fast check")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per stage, best is kept")
+    parser.add_argument("--in-process", action="store_true", help="don't spawn a process per case")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="exit 1 if a stage regressed")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown for --compare")
+    args = parser.parse_args(argv)
+
+    grid = QUICK_GRID if args.quick else FULL_GRID
+    cases = [
+        (frames, res, root)
+        for frames in grid["frames"]
+        for res in grid["resolution"]
+        for root in grid["root_motion"]
+    ]
+
+    results = {}
+    for case in cases:
+        name = case_name(case)
+        stages = run_case(case, args.repeats) if args.in_process else run_isolated(case, args.repeats)
+        results[name] = stages
+        rss = stages["peak_rss"]["mb"]
+        print(f"{name}  (peak RSS {rss:.0f} MB)" if rss is not None else name)
+        for stage, values in stages.items():
+            if "seconds" in values:
+                fps = values["fps"]
+                print(f"    {stage:<30} {values['seconds'] * 1000:9.2f} ms  {fps:9.1f} frames/s")
+
+    if args.save_baseline:
+        print("Baseline written to", save_baseline(SUITE, results))
+
+    if args.compare:
+        try:
+            regressions = compare_baseline(SUITE, results, args.tolerance)
+        except FileNotFoundError:
+            print("No baseline yet, run with --save-baseline first.")
+            return 1
+        if regressions:
+            print("Regressions:")
+            for line in regressions:
+                print("   ", line)
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
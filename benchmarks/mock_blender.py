@@ -0,0 +1,378 @@
+"""
+Stand-in for the Blender executable, for benchmarking / checking the node side
+of the subprocess nodes without a Blender install.
+
+Takes the same command line the nodes build:
+
+    mock_blender.py -b -P <repo>/fbx_pose_extract.py -- --fbx a.fbx --out DIR ...
+
+and looks at the -P script's name to decide what to write into --out:
+
+    fbx_pose_extract.py   joint_data.json + frame_info.json (or shared memory /
+                          stdout stream, like the real script)
+    fbx_depth_extract.py  depth/depth_NNNN.png (16-bit) + depth_info.json, or
+                          float mist into shared memory
+    fbx_canny_extract.py  rgb/rgb_NNNN.png + canny_info.json, or grey frames
+                          into shared memory
+
+Output only depends on the arguments, so two runs give identical files. The
+FBX file is never read (it only has to exist). Image size and frame count
+come from --out_width / --out_height / --num_frames as usual; these env vars
+tune the fake scene:
+
+    FBX_MOCK_ANIM_FRAMES   length of the fake animation (default 120), short
+                           clips give duplicate frame_indices / padding
+    FBX_MOCK_FRAME_DELAY   seconds to sleep per frame, to fake render time
+    FBX_MOCK_EXIT_CODE     exit with this code after writing (failure paths)
+    FBX_MOCK_VIEW_TRANSFORM  the fake scene's view transform (default Filmic,
+                           like a factory-settings Blender 3.x); anything but
+                           Standard gets a stand-in tone curve
+
+mock_harness.make_mock_blender() wraps this in a launcher the nodes can run.
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(_HERE)
+for _path in (_HERE, REPO_DIR):
+    if _path not in sys.path:
+        sys.path.append(_path)
+
+# Must match fbx_pose_extract.py
+STREAM_HEADER_PREFIX = "@FBX_FRAMES "
+STREAM_FRAME_PREFIX = "@FBX_FRAME "
+
+
+def parse_cli(argv):
+    """-P script + the '--' key/value pairs, same parsing as the real scripts (all values strings)."""
+    script = ""
+    if "-P" in argv:
+        i = argv.index("-P")
+        if i + 1 < len(argv):
+            script = argv[i + 1]
+
+    rest = argv[argv.index("--") + 1:] if "--" in argv else []
+    args = {}
+    i = 0
+    while i < len(rest):
+        key = rest[i]
+        if key.startswith("--") and i + 1 < len(rest):
+            args[key[2:]] = rest[i + 1]
+            i += 2
+        else:
+            i += 1
+    return script, args
+
+
+def _int(args, key, default):
+    try:
+        return int(args.get(key, default))
+    except ValueError:
+        return default
+
+
+def anim_range():
+    try:
+        length = max(1, int(os.environ.get("FBX_MOCK_ANIM_FRAMES", "120")))
+    except ValueError:
+        length = 120
+    return 1, length
+
+
+def compute_frames(args, default_start, default_end):
+    """Same frame selection as the extractors (Sample_N_Frames = Frame_Spread_TotalAnim)."""
+    mode = args.get("frame_mode", "Frame_Spread_TotalAnim")
+    num_frames = _int(args, "num_frames", 24)
+    start = _int(args, "start_frame", 0)
+    end = _int(args, "end_frame", 100)
+    step = max(_int(args, "frame_step", 1), 1)
+
+    if mode == "Frame_Range":
+        start = min(max(start, default_start), default_end)
+        frames = []
+        current = start
+        for _ in range(max(num_frames, 1)):
+            if current > default_end:
+                break
+            frames.append(current)
+            current += step
+        return frames or [start]
+
+    if end <= start:
+        start, end = default_start, default_end
+    else:
+        start = max(start, default_start)
+        end = max(min(end, default_end), start)
+    candidate = list(range(start, end + 1, step)) or [start]
+    if num_frames <= 1:
+        return [candidate[0]]
+    last_idx = len(candidate) - 1
+    return [
+        candidate[min(max(int(round(i / float(num_frames - 1) * last_idx)), 0), last_idx)]
+        for i in range(num_frames)
+    ]
+
+
+def _frame_delay():
+    try:
+        return max(0.0, float(os.environ.get("FBX_MOCK_FRAME_DELAY", "0")))
+    except ValueError:
+        return 0.0
+
+
+def _frame_phase(frame, anim_end):
+    return (frame - 1) / float(max(anim_end, 2) - 1)
+
+
+def depth_frame(frame, anim_end, width, height):
+    """Float mist in 0..1: a sphere-ish blob sliding left to right over a far floor."""
+    yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+    cx = width * (0.25 + 0.5 * _frame_phase(frame, anim_end))
+    cy = height * 0.5
+    radius = 0.3 * min(width, height)
+    dist = np.sqrt((xx - cx) ** 2 + (yy - cy) ** 2) / radius
+    mist = np.where(dist < 1.0, 0.2 + 0.5 * dist * dist, 1.0)
+    return mist.astype(np.float32)
+
+
+def scene_linear_frame(frame, anim_end, width, height):
+    """
+    float32 scene-linear [H, W, 3]: a coloured box (edges for Canny) moving
+    across a dark background, what the Viewer node would hold.
+    """
+    img = np.empty((height, width, 3), dtype=np.float32)
+    img[:] = (0.01, 0.012, 0.015)
+    phase = _frame_phase(frame, anim_end)
+    x0 = int(width * (0.1 + 0.5 * phase))
+    x1 = x0 + max(width // 4, 2)
+    y0, y1 = height // 5, height - height // 5
+    img[y0:y1, x0:x1] = (0.62, 0.35, 0.12)
+    img[y0 + (y1 - y0) // 3:y1 - (y1 - y0) // 3, x0 + 2:x1 - 2] = (0.18, 0.22, 0.47)
+    return img
+
+
+def _view_settings():
+    from types import SimpleNamespace
+
+    return SimpleNamespace(
+        view_transform=os.environ.get("FBX_MOCK_VIEW_TRANSFORM", "Filmic"),
+        look="None",
+        exposure=0.0,
+        gamma=1.0,
+    )
+
+
+def display_frame(linear, view_settings):
+    """Scene-linear -> 8-bit display RGB the way Blender writes a PNG under view_settings."""
+    from fbx_shm import STANDARD_VIEW_SETTINGS, linear_to_srgb
+
+    if all(getattr(view_settings, attr) == value for attr, value in STANDARD_VIEW_SETTINGS):
+        display = linear_to_srgb(linear)
+    else:
+        # Stand-in for Filmic / AgX: any other curve shows up as a different grey
+        display = np.power(np.clip(linear, 0.0, None) / (linear + 0.25), 0.7)
+    return np.floor(np.clip(display, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+
+def rgb_frame(frame, anim_end, width, height):
+    """uint8 [H, W, 3] RGB frame as the Standard-view PNG path writes it."""
+    from fbx_shm import apply_standard_view
+
+    view = _view_settings()
+    apply_standard_view(view)
+    return display_frame(scene_linear_frame(frame, anim_end, width, height), view)
+
+
+def _attach(args, shape, dtype):
+    from fbx_shm import attach_block
+    return attach_block(args["shm_name"], shape, dtype)
+
+
+def mock_pose(args, info, frame_indices):
+    from bench_pose_pipeline import synthetic_walk
+
+    _, anim_end = anim_range()
+    clip = synthetic_walk(anim_end, root_motion=2.0)
+    delay = _frame_delay()
+
+    def joints_at(f):
+        if delay:
+            time.sleep(delay)
+        return clip[min(max(f - 1, 0), len(clip) - 1)]
+
+    layout = [n for n in args.get("joint_layout", "").split(",") if n]
+    if args.get("shm_name") and layout:
+        from fbx_shm import release_block
+
+        capacity = max(_int(args, "shm_frames", 0), 0)
+        shm, block = _attach(args, (capacity, len(layout), 3), np.float32)
+        index = {name: j for j, name in enumerate(layout)}
+        count = 0
+        for f in frame_indices[:capacity]:
+            row = block[count]
+            row.fill(np.nan)
+            for name, pos in joints_at(f).items():
+                if name in index:
+                    row[index[name]] = pos
+            count += 1
+        block = row = None
+        release_block(shm)
+        info["shm_count"] = count
+        info["joint_order"] = list(clip[0].keys())
+    elif _int(args, "stream", 0):
+        print(STREAM_HEADER_PREFIX + json.dumps({"total": len(frame_indices)}), flush=True)
+        for i, f in enumerate(frame_indices):
+            record = {"i": i, "frame_index": f, "joints": joints_at(f)}
+            print(STREAM_FRAME_PREFIX + json.dumps(record), flush=True)
+    else:
+        data = {
+            "fbx_file": info["fbx_file"],
+            "frame_indices": frame_indices,
+            "frames": [{"frame_index": f, "joints": joints_at(f)} for f in frame_indices],
+        }
+        with open(os.path.join(args["out"], "joint_data.json"), "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=2)
+
+    info["found_joints"] = list(clip[0].keys())
+    info["missing_joints"] = []
+    return "frame_info.json"
+
+
+def mock_depth(args, info, frame_indices):
+    if args.get("depth_engine") == "MESH":
+        raise SystemExit("mock_blender: depth_engine MESH (mesh_frames.npz) is not mocked")
+
+    _, anim_end = anim_range()
+    width, height = _int(args, "out_width", 512), _int(args, "out_height", 512)
+    rendered = sorted(set(frame_indices))
+    delay = _frame_delay()
+
+    if args.get("shm_name"):
+        from fbx_shm import release_block
+
+        capacity = max(_int(args, "shm_frames", 0), 0)
+        shm, block = _attach(args, (capacity, height, width), np.float32)
+        count = 0
+        for f in rendered[:capacity]:
+            if delay:
+                time.sleep(delay)
+            block[count] = depth_frame(f, anim_end, width, height)
+            count += 1
+        block = None
+        release_block(shm)
+        info["shm_count"] = count
+    else:
+        depth_dir = os.path.join(args["out"], "depth")
+        os.makedirs(depth_dir, exist_ok=True)
+        for f in rendered:
+            if delay:
+                time.sleep(delay)
+            mist = depth_frame(f, anim_end, width, height)
+            png = Image.fromarray((mist * 65535.0 + 0.5).astype(np.uint16))
+            png.save(os.path.join(depth_dir, f"depth_{f:04d}.png"))
+
+    info["rendered_frames"] = rendered
+    info["depth_engine"] = args.get("depth_engine", "CYCLES")
+    return "depth_info.json"
+
+
+def mock_canny(args, info, frame_indices):
+    if args.get("edge_source") == "MESH":
+        raise SystemExit("mock_blender: edge_source MESH (mesh_frames.npz) is not mocked")
+
+    from fbx_shm import apply_standard_view, linear_to_srgb, rgb_to_gray
+
+    _, anim_end = anim_range()
+    width, height = _int(args, "out_width", 512), _int(args, "out_height", 512)
+    delay = _frame_delay()
+
+    # Like ensure_camera_and_rgb: both transports force the Standard view
+    view = _view_settings()
+    apply_standard_view(view)
+
+    if args.get("shm_name"):
+        from fbx_shm import release_block
+
+        capacity = max(_int(args, "shm_frames", 0), 0)
+        rendered = sorted(set(frame_indices))[:capacity]
+        shm, block = _attach(args, (capacity, height, width), np.uint8)
+        for i, f in enumerate(rendered):
+            if delay:
+                time.sleep(delay)
+            # read_viewer_gray: Viewer pixels are linear whatever the view transform
+            linear = scene_linear_frame(f, anim_end, width, height)
+            block[i] = rgb_to_gray(np.floor(linear_to_srgb(linear) * 255.0 + 0.5).astype(np.uint8))
+        block = None
+        release_block(shm)
+        info["shm_count"] = len(rendered)
+        info["rendered_frames"] = rendered
+    else:
+        rgb_dir = os.path.join(args["out"], "rgb")
+        os.makedirs(rgb_dir, exist_ok=True)
+        # Like the Cycles path: one file per requested frame (duplicates re-rendered)
+        for i, f in enumerate(frame_indices):
+            if delay:
+                time.sleep(delay)
+            rgb = display_frame(scene_linear_frame(f, anim_end, width, height), view)
+            Image.fromarray(rgb).save(
+                os.path.join(rgb_dir, f"rgb_{i:04d}.png")
+            )
+
+    info["edge_source"] = args.get("edge_source", "RENDER")
+    return "canny_info.json"
+
+
+MOCKS = {
+    "fbx_pose_extract.py": mock_pose,
+    "fbx_depth_extract.py": mock_depth,
+    "fbx_canny_extract.py": mock_canny,
+}
+
+
+def main(argv):
+    t0 = time.perf_counter()
+    script, args = parse_cli(argv)
+    mock = MOCKS.get(os.path.basename(script))
+    if mock is None:
+        print(f"mock_blender: no mock for script {script!r}", file=sys.stderr)
+        return 2
+
+    fbx_path = args.get("fbx", "")
+    out_dir = args.get("out", "")
+    if not fbx_path or not os.path.isfile(fbx_path):
+        print("ERROR: FBX file missing or invalid:", fbx_path)
+        return 0
+    if not out_dir:
+        print("ERROR: Output folder not specified.")
+        return 0
+    os.makedirs(out_dir, exist_ok=True)
+
+    anim_start, anim_end = anim_range()
+    frame_indices = compute_frames(args, anim_start, anim_end)
+    info = {
+        "fbx_file": os.path.abspath(fbx_path),
+        "frame_indices": frame_indices,
+        "frame_start": anim_start,
+        "frame_end": anim_end,
+        "frame_mode": args.get("frame_mode", ""),
+        "num_frames": _int(args, "num_frames", 24),
+        "mock_blender": True,
+    }
+    info_name = mock(args, info, frame_indices)
+    info["timings"] = {"total": round(time.perf_counter() - t0, 6)}
+    with open(os.path.join(out_dir, info_name), "w", encoding="utf-8") as fh:
+        json.dump(info, fh, indent=2)
+
+    print("mock_blender: done,", len(frame_indices), "frames")
+    return int(os.environ.get("FBX_MOCK_EXIT_CODE", "0") or 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
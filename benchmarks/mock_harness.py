@@ -0,0 +1,318 @@
+"""
+Runs the Blender-backed nodes (FBX_Extraction, FBX_Depth_Blender,
+FBX_Canny_Blender) against mock_blender.py, so their node side (JSON / shared
+memory / stream parsing, PNG decode, padding, frame-index expansion, job
+folder cleanup) can be checked on a machine without Blender.
+
+    python benchmarks/mock_harness.py        # run the checks, exit 1 on failure
+
+bench_nodes.py uses the same helpers for timings.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import traceback
+from contextlib import contextmanager
+
+import numpy as np
+
+from bench_common import load_module
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MOCK_SCRIPT = os.path.join(HERE, "mock_blender.py")
+
+
+def make_mock_blender(folder):
+    """
+    Write a launcher that runs mock_blender.py with this interpreter and
+    return its path, for the nodes' Blender_Executable input.
+    """
+    os.makedirs(folder, exist_ok=True)
+    if sys.platform == "win32":
+        path = os.path.join(folder, "blender.cmd")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f'@"{sys.executable}" "{MOCK_SCRIPT}" %*\r\n')
+        return path
+
+    path = os.path.join(folder, "blender")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'#!/bin/sh\nexec "{sys.executable}" "{MOCK_SCRIPT}" "$@"\n')
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return path
+
+
+def make_fake_fbx(folder):
+    """The nodes only check the FBX exists; the mock never reads it."""
+    path = os.path.join(folder, "mock_character.fbx")
+    with open(path, "wb") as f:
+        f.write(b"Kaydara FBX Binary  \x00")
+    return path
+
+
+@contextmanager
+def env(**values):
+    """Temporarily set (or with None, unset) environment variables."""
+    saved = {k: os.environ.get(k) for k in values}
+    try:
+        for k, v in values.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = str(v)
+        yield
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+class MockSetup:
+    """Temp folder with the launcher, a fake FBX and a scratch root for the job folders."""
+
+    def __init__(self):
+        self.root = tempfile.mkdtemp(prefix="fbx_mock_")
+        self.blender = make_mock_blender(os.path.join(self.root, "bin"))
+        self.fbx = make_fake_fbx(self.root)
+        self.scratch = os.path.join(self.root, "scratch")
+        os.makedirs(self.scratch, exist_ok=True)
+        self._env = None
+
+    def __enter__(self):
+        self._env = env(FBX_IMPORT_SCRATCH_DIR=self.scratch, FBX_IMPORT_BLENDER_RETRIES=0)
+        self._env.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self._env.__exit__(*exc)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def job_dirs(self):
+        return [d for d in os.listdir(self.scratch) if os.path.isdir(os.path.join(self.scratch, d))]
+
+
+def run_pose(setup, num_frames=24, width=512, height=512, transport="JSON Files",
+             frame_mode="Frame_Spread_TotalAnim", start_frame=0, end_frame=500, ref_image=None):
+    node = load_module("fbx_pose_node_body25_match").FBX_Extraction()
+    return asyncio.run(node.generate_pose_images(
+        setup.blender, setup.fbx, frame_mode, num_frames, start_frame, end_frame, 1,
+        width, height, "Front", "Orthographic (Stable)", "ControlNet Colors",
+        "Full Face (FACE_70)", 4, 2, 1.0,
+        "Match Full Body" if ref_image is not None else "Off",
+        Transport=transport, Ref_Pose_Image=ref_image,
+    ))
+
+
+def run_depth(setup, num_frames=24, width=512, height=512, transport="PNG Files",
+              frame_mode="Frame_Spread_TotalAnim", start_frame=0, end_frame=100):
+    node = load_module("fbx_depth_node").FBX_Depth_Blender()
+    return asyncio.run(node.generate_depth_images(
+        setup.blender, setup.fbx, frame_mode, num_frames, start_frame, end_frame, 1,
+        width, height, 1.0, "Front", True,
+        Depth_Engine="Cycles (Mist)", Transport=transport,
+    ))
+
+
+def run_canny(setup, num_frames=24, width=512, height=512, transport="PNG Files",
+              frame_mode="Sample_N_Frames", start_frame=0, end_frame=100, thresholds=""):
+    node = load_module("fbx_canny_node").FBX_Canny_Blender()
+    return asyncio.run(node.generate_canny_images(
+        setup.blender, setup.fbx, frame_mode, num_frames, start_frame, end_frame, 1,
+        width, height, 1.0, "Front", 100, 200,
+        Edge_Source="Cycles RGB + Canny", Transport=transport, Canny_Thresholds=thresholds,
+    ))
+
+
+# ---------------------------------------------------------------------------
+# Checks
+# ---------------------------------------------------------------------------
+
+def _expect(cond, message):
+    if not cond:
+        raise AssertionError(message)
+
+
+def check_pose_transports(setup):
+    """JSON, shared memory and stream give the same stickmen."""
+    results = {t: run_pose(setup, num_frames=12, width=256, height=256, transport=t)
+               for t in ("JSON Files", "Shared Memory", "Stream (stdout)")}
+    base, info, _ = results["JSON Files"]
+    _expect(tuple(base.shape) == (12, 256, 256, 3), f"pose shape {tuple(base.shape)}")
+    _expect(float(base.max()) > 0.0, "pose images are blank")
+    _expect(json.loads(info)["transport"] == "JSON Files", "transport not recorded")
+    base_names = results["JSON Files"][2]["joint_names"]
+    for transport, (images, _, joints) in results.items():
+        _expect(np.array_equal(images.numpy(), base.numpy()), f"{transport} differs from JSON Files")
+        # Joint order is the dot draw order
+        _expect(joints["joint_names"] == base_names, f"{transport} joint order differs from JSON Files")
+
+
+def check_pose_padding(setup):
+    """Frame_Range past the end of the clip pads with the last real frame."""
+    with env(FBX_MOCK_ANIM_FRAMES=10):
+        images, _, _ = run_pose(setup, num_frames=16, width=256, height=256, frame_mode="Frame_Range")
+    arr = images.numpy()
+    _expect(arr.shape[0] == 16, f"padded to {arr.shape[0]} frames, wanted 16")
+    for i in range(10, 16):
+        _expect(np.array_equal(arr[i], arr[9]), f"pad frame {i} is not the last real frame")
+    _expect(not np.array_equal(arr[0], arr[9]), "clip frames should differ")
+
+
+def check_pose_track_padding(setup):
+    """With a tracked reference video longer than the clip, padded frames keep following it."""
+    import torch
+
+    with env(FBX_MOCK_ANIM_FRAMES=10):
+        _, _, joints = run_pose(setup, num_frames=16, width=128, height=128, frame_mode="Frame_Range")
+    ref = torch.zeros((16, 128, 128, 3), dtype=torch.float32)
+    for i in range(16):
+        ref[i, 20:110, 10 + 4 * i:40 + 4 * i, :] = 1.0
+    node = load_module("fbx_pose_render_node").FBX_Pose_Render()
+    images, _ = node.render_pose_images(
+        joints, 16, 128, 128, "Front", "Orthographic (Stable)", "ControlNet Colors",
+        "Full Face (FACE_70)", 4, 2, 1.0, "Track Ref Video (Per-Frame)", Ref_Pose_Image=ref,
+    )
+    arr = images.numpy()
+    _expect(arr.shape[0] == 16, f"padded to {arr.shape[0]} frames, wanted 16")
+    _expect(not np.array_equal(arr[15], arr[9]), "padded frames stopped following the reference video")
+
+
+def check_pose_render(setup):
+    """FBX_Pose_Render on the Joints output reproduces FBX_Extraction, and re-renders at another size."""
+    with env(FBX_MOCK_ANIM_FRAMES=10):
+        images, _, joints = run_pose(setup, num_frames=14, width=256, height=256, frame_mode="Frame_Range")
+    node = load_module("fbx_pose_render_node").FBX_Pose_Render()
+    args = ("Front", "Orthographic (Stable)", "ControlNet Colors", "Full Face (FACE_70)", 4, 2, 1.0, "Off")
+    same, info = node.render_pose_images(joints, 0, 256, 256, *args)
+    _expect(np.array_equal(same.numpy(), images.numpy()), "FBX_Pose_Render differs from FBX_Extraction")
+    _expect(json.loads(info)["num_frames_requested"] == 14, "Num_Frames 0 should follow the extraction")
+    other, _ = node.render_pose_images(joints, 5, 128, 96, *args)
+    _expect(tuple(other.shape) == (10, 96, 128, 3), f"re-render shape {tuple(other.shape)}")
+
+    # Joints round trip: exact values, joints outside POSE_JOINT_NAMES kept
+    pose_mod = load_module("fbx_pose_node_body25_match")
+    frames = [{"hips": [0.1, 0.2, 1.0000001], "prop_sword": [0.3, -0.1, 1.2]}, {"hips": [0.1, 0.2, 1.0]}]
+    names, block = pose_mod._joint_block_from_frames(frames)
+    back = pose_mod.fbx_joints_to_frames(pose_mod.make_fbx_joints(names, block, {}))
+    _expect(back == frames, f"Joints round trip changed the frames: {back}")
+
+
+def check_pose_multiview(setup):
+    """One multi-view render matches a FBX_Pose_Render per view; orbit and frame-major order work."""
+    with env(FBX_MOCK_ANIM_FRAMES=10):
+        _, _, joints = run_pose(setup, num_frames=12, width=128, height=128, frame_mode="Frame_Range")
+    style = ("Orthographic (Stable)", "ControlNet Colors", "Full Face (FACE_70)", 4, 2, 1.0, "Off")
+    single = load_module("fbx_pose_render_node").FBX_Pose_Render()
+    multi = load_module("fbx_pose_render_node").FBX_Pose_Render_MultiView()
+
+    out = multi.render_views(joints, "Front, Left Side, Back", 0, "View by View", 0, 128, 128, *style)
+    all_views, per_view, info = out[0], out[1:-1], json.loads(out[-1])
+    _expect(tuple(all_views.shape) == (36, 128, 128, 3), f"all views shape {tuple(all_views.shape)}")
+    _expect(per_view[3].shape[0] == 1, "unused view socket should be a single blank frame")
+    for i, view in enumerate(("Front", "Left Side", "Back")):
+        ref, _ = single.render_pose_images(joints, 0, 128, 128, view, *style)
+        _expect(np.array_equal(per_view[i].numpy(), ref.numpy()), f"multi-view {view} differs from FBX_Pose_Render")
+        _expect(np.array_equal(all_views[i * 12:(i + 1) * 12].numpy(), ref.numpy()), f"All_Views block {i} is not {view}")
+    _expect([v["camera_view"] for v in info["views"]] == ["Front", "Left Side", "Back"], "views not recorded")
+
+    out = multi.render_views(joints, "", 4, "Frame by Frame", 0, 128, 128, *style)
+    _expect(out[0].shape[0] == 48, f"orbit batch has {out[0].shape[0]} frames, wanted 48")
+    _expect(np.array_equal(out[0][1].numpy(), out[2][0].numpy()), "Frame by Frame order is wrong")
+
+
+def check_depth(setup):
+    """PNG and shared memory agree; repeated frames come back as repeats."""
+    with env(FBX_MOCK_ANIM_FRAMES=8):
+        png, png_info = run_depth(setup, num_frames=20, width=200, height=120)
+        shm, _ = run_depth(setup, num_frames=20, width=200, height=120, transport="Shared Memory")
+    _expect(tuple(png.shape) == (20, 120, 200, 3), f"depth shape {tuple(png.shape)}")
+    _expect(tuple(shm.shape) == tuple(png.shape), f"shm depth shape {tuple(shm.shape)}")
+    # 16-bit PNG quantisation only
+    _expect(np.abs(png.numpy() - shm.numpy()).max() < 1e-3, "PNG and shared-memory depth differ")
+
+    frames = json.loads(png_info)["frame_indices"]
+    arr = png.numpy()
+    for i, f in enumerate(frames):
+        j = frames.index(f)
+        _expect(np.array_equal(arr[i], arr[j]), f"depth frame {i} is not a repeat of frame {j}")
+    _expect(len(set(frames)) == 8, "expected duplicate frame_indices for a short clip")
+
+
+def check_canny(setup):
+    """PNG and shared memory give the same edges, also when the scene isn't on the Standard view."""
+    with env(FBX_MOCK_VIEW_TRANSFORM="Filmic"):
+        png, _ = run_canny(setup, num_frames=6, width=160, height=160)
+        shm, _ = run_canny(setup, num_frames=6, width=160, height=160, transport="Shared Memory")
+    _expect(tuple(png.shape) == (6, 160, 160, 3), f"canny shape {tuple(png.shape)}")
+    _expect(float(png.max()) == 1.0, "no edges found")
+    _expect(np.array_equal(png.numpy(), shm.numpy()), "PNG and shared-memory edges differ")
+
+    # Short clip: frames repeat, the shared-memory block has one slot per
+    # distinct frame, but threshold keys still follow the output frames
+    keys = "0, 100, 200\n7, 1000, 2000"
+    with env(FBX_MOCK_ANIM_FRAMES=4):
+        png, _ = run_canny(setup, num_frames=8, width=160, height=160, thresholds=keys)
+        shm, _ = run_canny(setup, num_frames=8, width=160, height=160, transport="Shared Memory",
+                           thresholds=keys)
+    _expect(tuple(shm.shape) == (8, 160, 160, 3), f"keyed canny shape {tuple(shm.shape)}")
+    _expect(np.array_equal(png.numpy(), shm.numpy()), "keyed PNG and shared-memory edges differ")
+
+
+def check_failure(setup):
+    """A failing Blender run surfaces as the node's RuntimeError (its job folder is kept)."""
+    with env(FBX_MOCK_EXIT_CODE=3):
+        try:
+            run_depth(setup, num_frames=2, width=64, height=64)
+        except RuntimeError as e:
+            _expect("Blender depth extractor failed" in str(e), f"unexpected error: {e}")
+            return
+    raise AssertionError("no RuntimeError for a failed Blender run")
+
+
+def check_cleanup(setup):
+    """Job folders are gone once the node has loaded their output."""
+    before = set(setup.job_dirs())
+    run_depth(setup, num_frames=2, width=64, height=64)
+    run_pose(setup, num_frames=2, width=64, height=64)
+    run_canny(setup, num_frames=2, width=64, height=64)
+    left = set(setup.job_dirs()) - before
+    _expect(not left, f"job folders left behind: {sorted(left)}")
+
+
+CHECKS = [
+    check_pose_transports,
+    check_pose_padding,
+    check_pose_track_padding,
+    check_pose_render,
+    check_pose_multiview,
+    check_depth,
+    check_canny,
+    check_failure,
+    check_cleanup,
+]
+
+
+def main():
+    failed = 0
+    with MockSetup() as setup:
+        for check in CHECKS:
+            try:
+                check(setup)
+            except Exception:
+                failed += 1
+                print(f"FAIL {check.__name__}")
+                traceback.print_exc()
+            else:
+                print(f"ok   {check.__name__}")
+    print(f"{len(CHECKS) - failed}/{len(CHECKS)} checks passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
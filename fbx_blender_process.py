@@ -0,0 +1,286 @@
+# Supervisor for the headless Blender runs behind the FBX nodes.
+# subprocess.run() with no timeout meant a malformed FBX could hang a ComfyUI
+# worker forever and cancelling the queue left Blender running. Every node
+# awaits run_blender() instead, which queues the run on the package
+# scheduler (fbx_blender_scheduler.py) and supervises it there:
+#
+#   - wall-clock timeout (FBX_IMPORT_BLENDER_TIMEOUT, seconds, 0 = none)
+#   - ComfyUI interrupts kill the whole Blender process tree
+#   - optional address-space cap (FBX_IMPORT_BLENDER_MAX_MB, POSIX only)
+#   - runs that die from a signal we didn't send (segfault, OOM killer) are
+#     retried (FBX_IMPORT_BLENDER_RETRIES); timeouts, normal errors and crashes
+#     caused by the address-space cap are not (the retry would hit it again)
+
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from .fbx_blender_scheduler import get_scheduler
+
+TIMEOUT_ENV = "FBX_IMPORT_BLENDER_TIMEOUT"
+MAX_MB_ENV = "FBX_IMPORT_BLENDER_MAX_MB"
+RETRIES_ENV = "FBX_IMPORT_BLENDER_RETRIES"
+
+DEFAULT_TIMEOUT = 60 * 60
+DEFAULT_RETRIES = 1
+
+# How often the supervisor checks for timeout / interrupt
+POLL_SECONDS = 0.25
+
+# Time Blender gets to exit after SIGTERM before it is SIGKILLed
+KILL_GRACE_SECONDS = 5.0
+
+# Longest stdout line the stream reader accepts (streamed frame records)
+STREAM_LINE_LIMIT = 16 * 1024 * 1024
+
+# What a failed allocation under RLIMIT_AS leaves in Blender's output
+# (guardedalloc, Python, C++ runtime, libc)
+OUT_OF_MEMORY_MARKERS = (
+    "unable to allocate memory",
+    "returns null",
+    "MemoryError",
+    "std::bad_alloc",
+    "Cannot allocate memory",
+    "out of memory",
+)
+
+try:
+    import comfy.model_management as _model_management
+    INTERRUPT_EXCEPTIONS = (_model_management.InterruptProcessingException,)
+except Exception:
+    _model_management = None
+    INTERRUPT_EXCEPTIONS = ()
+
+
+class BlenderTimeout(RuntimeError):
+    pass
+
+
+class BlenderResult:
+    def __init__(self, args, returncode, stdout, stderr, attempts, seconds):
+        self.args = args
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.attempts = attempts
+        # Wall time of the last attempt (launch to exit)
+        self.seconds = seconds
+
+
+def _env_number(name, default):
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def _interrupted():
+    if _model_management is None:
+        return False
+    try:
+        return bool(_model_management.processing_interrupted())
+    except Exception:
+        return False
+
+
+# The address-space cap is never set with preexec_fn: Blender is started from
+# the scheduler thread while ComfyUI runs threads of its own, and preexec_fn
+# can deadlock the child when the parent has threads. Linux caps the running
+# process with prlimit() right after the spawn; other POSIX systems go
+# through a "ulimit -v" shell wrapper that execs Blender.
+def _prlimit_available():
+    try:
+        import resource
+    except ImportError:
+        return False
+    return hasattr(resource, "prlimit")
+
+
+def _limited_args(args, max_mb):
+    """args, wrapped in a ulimit shell where prlimit() isn't available."""
+    if max_mb <= 0 or sys.platform == "win32" or _prlimit_available():
+        return list(args)
+    max_kb = int(max_mb * 1024)
+    return ["/bin/sh", "-c", f'ulimit -v {max_kb} 2>/dev/null; exec "$0" "$@"'] + list(args)
+
+
+def _limit_memory(proc, max_mb):
+    """Cap a just-started Blender's address space (Linux)."""
+    if max_mb <= 0 or sys.platform == "win32" or not _prlimit_available():
+        return
+    import resource
+
+    max_bytes = int(max_mb * 1024 * 1024)
+    try:
+        resource.prlimit(proc.pid, resource.RLIMIT_AS, (max_bytes, max_bytes))
+    except (OSError, ValueError) as e:
+        print(f"[FBX Blender] could not apply {MAX_MB_ENV} ({e}), running without a memory cap")
+
+
+def _popen_kwargs():
+    # Own process group / session so the whole tree can be killed at once
+    if sys.platform == "win32":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+async def kill_tree(proc):
+    """Terminate Blender and anything it spawned; SIGKILL if it won't go."""
+    if proc.returncode is not None:
+        return
+    if sys.platform == "win32":
+        killer = await asyncio.create_subprocess_exec(
+            "taskkill", "/F", "/T", "/PID", str(proc.pid),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        await killer.wait()
+    else:
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+        except OSError:
+            proc.terminate()
+        try:
+            await asyncio.wait_for(proc.wait(), KILL_GRACE_SECONDS)
+            return
+        except asyncio.TimeoutError:
+            pass
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except OSError:
+            proc.kill()
+    await proc.wait()
+
+
+def _crashed(returncode):
+    # POSIX: negative = killed by a signal; Windows: NTSTATUS crash codes
+    if sys.platform == "win32":
+        return returncode >= 0xC0000000
+    return returncode < 0
+
+
+def _hit_memory_limit(returncode, stdout, stderr, max_mb):
+    """A crash under our own RLIMIT_AS cap: SIGKILL or an allocation failure in the output."""
+    if max_mb <= 0 or sys.platform == "win32" or not _crashed(returncode):
+        return False
+    if returncode == -signal.SIGKILL:
+        return True
+    output = stdout + stderr
+    return any(marker in output for marker in OUT_OF_MEMORY_MARKERS)
+
+
+async def _drain(stream, lines, on_line):
+    while True:
+        raw = await stream.readline()
+        if not raw:
+            return
+        line = raw.decode("utf-8", errors="replace")
+        if on_line is None or on_line(line) is not False:
+            lines.append(line)
+
+
+async def _run_once(args, label, timeout, max_mb, on_stdout_line):
+    proc = await asyncio.create_subprocess_exec(
+        *_limited_args(args, max_mb),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=STREAM_LINE_LIMIT,
+        **_popen_kwargs(),
+    )
+    _limit_memory(proc, max_mb)
+
+    # Both pipes are drained alongside so a chatty Blender never blocks
+    stdout_lines, stderr_lines = [], []
+    readers = asyncio.gather(
+        _drain(proc.stdout, stdout_lines, on_stdout_line),
+        _drain(proc.stderr, stderr_lines, None),
+    )
+
+    started = time.monotonic()
+    reason = None
+    try:
+        while True:
+            try:
+                await asyncio.wait_for(proc.wait(), POLL_SECONDS)
+                break
+            except asyncio.TimeoutError:
+                pass
+            if timeout > 0 and time.monotonic() - started > timeout:
+                reason = "timeout"
+                break
+            if _interrupted():
+                reason = "interrupt"
+                break
+    finally:
+        # Also covers the job being cancelled by its caller
+        if proc.returncode is None:
+            await asyncio.shield(kill_tree(proc))
+        await asyncio.shield(readers)
+
+    stdout, stderr = "".join(stdout_lines), "".join(stderr_lines)
+
+    if reason == "interrupt":
+        _model_management.throw_exception_if_processing_interrupted()
+        raise RuntimeError(f"{label}: Blender run interrupted.")
+    if reason == "timeout":
+        raise BlenderTimeout(
+            f"{label}: Blender did not finish within {timeout:g}s and was killed "
+            f"(set {TIMEOUT_ENV} to change the limit).\n"
+            f"Command: {' '.join(args)}\n"
+            f"STDOUT:\n{stdout}\n"
+            f"STDERR:\n{stderr}\n"
+        )
+    return proc.returncode, stdout, stderr
+
+
+async def run_blender_async(args, label, timeout=None, on_stdout_line=None, retries=None):
+    """
+    Run a Blender command under supervision and return a BlenderResult
+    (returncode / stdout / stderr, like subprocess.run). Raises BlenderTimeout
+    on timeout and ComfyUI's interrupt exception on cancel.
+
+    on_stdout_line(line) is called for every stdout line as it arrives (on
+    the scheduler thread); returning False keeps that line out of
+    result.stdout. A retried run replays from the start, so streamed
+    consumers must reset on the header.
+    """
+    if timeout is None:
+        timeout = _env_number(TIMEOUT_ENV, DEFAULT_TIMEOUT)
+    if retries is None:
+        retries = int(_env_number(RETRIES_ENV, DEFAULT_RETRIES))
+    max_mb = _env_number(MAX_MB_ENV, 0)
+
+    attempt = 0
+    while True:
+        attempt += 1
+        started = time.perf_counter()
+        returncode, stdout, stderr = await _run_once(args, label, timeout, max_mb, on_stdout_line)
+        if _hit_memory_limit(returncode, stdout, stderr, max_mb):
+            # Same cap, same FBX: another go would crash the same way
+            print(
+                f"[{label}] Blender crashed (exit code {returncode}) at the {max_mb:g} MB "
+                f"memory cap, not retrying (raise {MAX_MB_ENV} to allow more)"
+            )
+        # Crashed (segfault / OOM killer) rather than failed: worth another go
+        elif _crashed(returncode) and attempt <= retries:
+            print(f"[{label}] Blender crashed (exit code {returncode}), retrying ({attempt}/{retries})")
+            continue
+        return BlenderResult(args, returncode, stdout, stderr, attempt, time.perf_counter() - started)
+
+
+def submit_blender(args, label, **kwargs):
+    """Queue a supervised Blender run on the package scheduler; returns a concurrent Future."""
+    return get_scheduler().submit(lambda: run_blender_async(args, label, **kwargs))
+
+
+async def run_blender(args, label, **kwargs):
+    """
+    For the (async) nodes: queue the job on the scheduler and await its result
+    from the caller's own event loop, so ComfyUI can run other nodes of the
+    prompt meanwhile. Cancelling the awaiting task cancels the job and kills
+    Blender.
+    """
+    return await asyncio.wrap_future(submit_blender(args, label, **kwargs))
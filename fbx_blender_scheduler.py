@@ -0,0 +1,100 @@
+# Package-wide asyncio scheduler for Blender jobs.
+# One event loop runs on a daemon thread; every Blender run (pose, depth,
+# canny, multipass, info) is queued on it as a coroutine and started with
+# asyncio.create_subprocess_exec once a slot is free. Callers get a
+# concurrent.futures.Future back. The Blender nodes are async and await it
+# (fbx_blender_process.run_blender), so ComfyUI runs independent nodes of a
+# prompt alongside: pose, depth and canny branches of one workflow overlap
+# their Blender work up to the slot limit. ComfyUI still executes queued
+# prompts one at a time, so separate workflows only share the limit, they
+# don't overlap each other.
+#
+# Slots default to what the machine can take: a Blender render already uses
+# several cores, and each job needs its own RAM. FBX_IMPORT_BLENDER_JOBS
+# overrides the count, FBX_IMPORT_BLENDER_JOB_MB the per-job RAM estimate.
+
+import asyncio
+import os
+import threading
+
+JOBS_ENV = "FBX_IMPORT_BLENDER_JOBS"
+JOB_MB_ENV = "FBX_IMPORT_BLENDER_JOB_MB"
+
+DEFAULT_JOB_MB = 2048
+
+# Cores per Blender job when sizing the slot count
+CORES_PER_JOB = 4
+
+
+def _total_ram_bytes():
+    try:
+        import psutil
+        return int(psutil.virtual_memory().total)
+    except Exception:
+        pass
+    try:
+        return int(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES"))
+    except (AttributeError, ValueError, OSError):
+        return 0
+
+
+def default_slots():
+    try:
+        return max(1, int(os.environ[JOBS_ENV]))
+    except (KeyError, ValueError):
+        pass
+
+    by_cores = max(1, (os.cpu_count() or 1) // CORES_PER_JOB)
+
+    try:
+        job_mb = float(os.environ.get(JOB_MB_ENV, DEFAULT_JOB_MB))
+    except ValueError:
+        job_mb = DEFAULT_JOB_MB
+    ram = _total_ram_bytes()
+    if ram <= 0 or job_mb <= 0:
+        return by_cores
+    # Leave half the RAM to ComfyUI itself (models, image batches)
+    by_ram = max(1, int(ram * 0.5 // (job_mb * 1024 * 1024)))
+    return min(by_cores, by_ram)
+
+
+class BlenderScheduler:
+    """Event loop thread + semaphore; submit() coroutine factories from any thread."""
+
+    def __init__(self, slots=None):
+        self.slots = int(slots) if slots else default_slots()
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="fbx-blender-scheduler", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._semaphore = asyncio.Semaphore(self.slots)
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _guarded(self, make_coro):
+        async with self._semaphore:
+            return await make_coro()
+
+    def submit(self, make_coro):
+        """
+        Queue make_coro() (a zero-arg callable returning a coroutine) and
+        return a concurrent.futures.Future for its result. Cancelling the
+        future cancels the job (and with it the Blender process).
+        """
+        return asyncio.run_coroutine_threadsafe(self._guarded(make_coro), self._loop)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = BlenderScheduler()
+        return _scheduler
@@ -2,6 +2,8 @@ import bpy
 import sys
 import os
 import json
+import time
+import numpy as np
 from mathutils import Vector
 
 
@@ -24,6 +26,10 @@ def parse_args():
         "out_height": 512,
         "zoom_factor": 1.0,
         "view_mode": "Front",
+        "edge_source": "RENDER",
+        # Shared-memory transport (fbx_shm.py): block name + frame capacity
+        "shm_name": "",
+        "shm_frames": 0,
     }
 
     i = 0
@@ -83,12 +89,34 @@ def parse_args():
         elif a == "--view_mode" and i + 1 < len(argv):
             args["view_mode"] = argv[i + 1]
             i += 2
+        elif a == "--edge_source" and i + 1 < len(argv):
+            args["edge_source"] = argv[i + 1]
+            i += 2
+        elif a == "--shm_name" and i + 1 < len(argv):
+            args["shm_name"] = argv[i + 1]
+            i += 2
+        elif a == "--shm_frames" and i + 1 < len(argv):
+            try:
+                args["shm_frames"] = int(argv[i + 1])
+            except Exception:
+                pass
+            i += 2
         else:
             i += 1
 
+    if args["edge_source"] not in ("RENDER", "MESH"):
+        args["edge_source"] = "RENDER"
+
     return args
 
 
+def _add_script_dir_to_path():
+    # Blender doesn't put the -P script's folder on sys.path; the helper modules live there
+    here = os.path.dirname(os.path.abspath(__file__))
+    if here not in sys.path:
+        sys.path.append(here)
+
+
 def clear_scene():
     bpy.ops.wm.read_homefile(use_empty=True)
 
@@ -156,12 +184,20 @@ def _get_camera_position(center, radius, ref_obj, view_mode):
     return pos
 
 
-def ensure_camera_and_rgb(scene, ref_obj, out_width, out_height, rgb_dir, zoom_factor, view_mode):
+def ensure_camera_and_rgb(scene, ref_obj, out_width, out_height, rgb_dir, zoom_factor, view_mode, to_viewer=False):
     scene.render.engine = "CYCLES"
     scene.render.image_settings.file_format = "PNG"
     scene.render.image_settings.color_mode = "RGB"
     scene.render.image_settings.color_depth = "8"
 
+    # Same display transform (and no dither noise) on the PNG and the Viewer
+    # readback path, so the Transport setting can't change the grey frames
+    _add_script_dir_to_path()
+    from fbx_shm import apply_standard_view
+
+    apply_standard_view(scene.view_settings)
+    scene.render.dither_intensity = 0.0
+
     world = scene.world
     if world is None:
         world = bpy.data.worlds.new("FBXCannyWorld")
@@ -218,6 +254,13 @@ def ensure_camera_and_rgb(scene, ref_obj, out_width, out_height, rgb_dir, zoom_f
     rl = tree.nodes.new("CompositorNodeRLayers")
     rl.location = (0, 0)
 
+    if to_viewer:
+        # Shared-memory transport reads the frame back from the Viewer node
+        viewer = tree.nodes.new("CompositorNodeViewer")
+        viewer.location = (200, 0)
+        tree.links.new(rl.outputs["Image"], viewer.inputs[0])
+        return
+
     out = tree.nodes.new("CompositorNodeOutputFile")
     out.location = (200, 0)
     out.base_path = rgb_dir_abs
@@ -229,6 +272,69 @@ def ensure_camera_and_rgb(scene, ref_obj, out_width, out_height, rgb_dir, zoom_f
     tree.links.new(rl.outputs["Image"], out.inputs[0])
 
 
+def frame_camera_params(ref_obj, zoom_factor, view_mode):
+    """
+    Same framing as ensure_camera_and_rgb for the current frame, as plain
+    values for the mesh export (no camera object or render setup needed).
+    """
+    center, radius, height = _get_world_bbox_center_radius_height(ref_obj)
+
+    scale_base = max(radius * 2.5, height * 1.4)
+    if zoom_factor <= 0.0:
+        zoom_factor = 1.0
+
+    location = _get_camera_position(center, radius, ref_obj, view_mode)
+    direction = (center - location).normalized()
+    quat = direction.to_track_quat("-Z", "Y")
+    distance = (location - center).length
+
+    return {
+        "location": location,
+        "rotation": quat.to_euler(),
+        "ortho_scale": scale_base / zoom_factor,
+        "clip_start": max(distance * 0.1, 0.01),
+        "clip_end": distance * 10.0,
+        "mist_depth": radius * 4.0,
+    }
+
+
+def export_canny_mesh(scene, ref_obj, frames, out_dir, zoom_factor, view_mode):
+    """
+    --edge_source MESH: no Cycles render, just the per-frame mesh + camera for
+    the node to pull silhouette / crease edges from (fbx_mesh_raster.py).
+    Reuses the depth script's exporter so both stay in step.
+    """
+    _add_script_dir_to_path()
+    from fbx_depth_extract import MESH_FRAMES_FILE, export_mesh_frames
+
+    export_mesh_frames(
+        scene,
+        frames,
+        lambda: frame_camera_params(ref_obj, zoom_factor, view_mode),
+        os.path.join(out_dir, MESH_FRAMES_FILE),
+    )
+
+
+def read_viewer_gray(out_width, out_height, rgba):
+    """
+    Viewer node pixels (linear RGB) -> display-referred 8-bit luma. Both
+    transports render with the Standard view transform (see
+    ensure_camera_and_rgb), under which this is the grey of the PNG frame.
+    None if the viewer is missing.
+    """
+    _add_script_dir_to_path()
+    from fbx_shm import linear_to_srgb, rgb_to_gray, viewer_pixels
+
+    viewer = bpy.data.images.get("Viewer Node")
+    if viewer is None or tuple(viewer.size) != (out_width, out_height):
+        return None
+    viewer_pixels(viewer, rgba)
+    # 8-bit per channel first, rounded like Blender's PNG writer, then the
+    # node's grey conversion
+    srgb8 = np.floor(linear_to_srgb(rgba[:, :, :3]) * 255.0 + 0.5).astype(np.uint8)
+    return rgb_to_gray(srgb8)
+
+
 def compute_frame_indices(scene, frame_mode, num_frames, start, end, step):
     if not scene:
         return []
@@ -272,6 +378,11 @@ def compute_frame_indices(scene, frame_mode, num_frames, start, end, step):
 
 
 def main():
+    _add_script_dir_to_path()
+    from fbx_timing import StageTimer, dump_profile, start_profile
+
+    timer = StageTimer()
+    prof = start_profile()
     args = parse_args()
 
     fbx_path = args["fbx"]
@@ -284,8 +395,10 @@ def main():
         print("ERROR: output directory not specified.")
         return
 
-    clear_scene()
-    ref_obj = import_fbx(fbx_path)
+    with timer.stage("factory_reset"):
+        clear_scene()
+    with timer.stage("fbx_import"):
+        ref_obj = import_fbx(fbx_path)
     if ref_obj is None:
         print("ERROR: Failed to import FBX or find reference object.")
         return
@@ -302,10 +415,45 @@ def main():
 
     rgb_dir = os.path.join(out_dir, "rgb")
     frame_indices = []
+    rendered_frames = []
+
+    if args["edge_source"] == "MESH":
+        os.makedirs(out_dir, exist_ok=True)
+        frame_indices = list(frames)
+        # Each distinct frame once, the node maps them back via frame_indices
+        rendered_frames = sorted(set(frames))
+        with timer.stage("mesh_export"):
+            export_canny_mesh(
+                scene,
+                ref_obj,
+                rendered_frames,
+                out_dir,
+                args["zoom_factor"],
+                args["view_mode"],
+            )
+        frames = []
+
+    shm = block = rgba = None
+    if frames and args["shm_name"]:
+        _add_script_dir_to_path()
+        from fbx_shm import attach_block
+
+        frame_indices = list(frames)
+        rendered_frames = sorted(set(frames))[: max(args["shm_frames"], 0)]
+        frames = rendered_frames
+        shm, block = attach_block(
+            args["shm_name"],
+            (args["shm_frames"], args["out_height"], args["out_width"]),
+            np.uint8,
+        )
+        rgba = np.empty((args["out_height"], args["out_width"], 4), dtype=np.float32)
+    shm_count = 0
 
     for frame in frames:
+        t0 = time.perf_counter()
         scene.frame_set(frame)
-        frame_indices.append(frame)
+        if shm is None:
+            frame_indices.append(frame)
 
         ensure_camera_and_rgb(
             scene,
@@ -315,8 +463,30 @@ def main():
             rgb_dir,
             args["zoom_factor"],
             args["view_mode"],
+            to_viewer=shm is not None,
         )
-        bpy.ops.render.render(write_still=True)
+        t1 = time.perf_counter()
+        timer.sample("frame_eval", t1 - t0)
+
+        # Render + PNG write (or Viewer -> shared memory copy)
+        if shm is None:
+            bpy.ops.render.render(write_still=True)
+            timer.sample("render", time.perf_counter() - t1)
+            continue
+
+        bpy.ops.render.render(write_still=False)
+        gray = read_viewer_gray(args["out_width"], args["out_height"], rgba)
+        timer.sample("render", time.perf_counter() - t1)
+        if gray is None:
+            break
+        block[shm_count] = gray
+        shm_count += 1
+
+    if shm is not None:
+        from fbx_shm import release_block
+
+        block = None
+        release_block(shm)
 
     frame_info = {
         "fbx_file": os.path.abspath(fbx_path),
@@ -330,7 +500,16 @@ def main():
         "out_height": args["out_height"],
         "zoom_factor": args["zoom_factor"],
         "view_mode": args["view_mode"],
+        "edge_source": args["edge_source"],
     }
+    if rendered_frames:
+        frame_info["rendered_frames"] = rendered_frames
+    if args["shm_name"]:
+        frame_info["shm_count"] = shm_count
+    profile_path = dump_profile(prof, "fbx_canny_extract")
+    if profile_path:
+        frame_info["profile"] = profile_path
+    frame_info["timings"] = timer.summary()
     info_path = os.path.join(out_dir, "canny_info.json")
     with open(info_path, "w", encoding="utf-8") as f:
         json.dump(frame_info, f, indent=2)
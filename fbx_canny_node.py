@@ -1,14 +1,100 @@
 import os
 import json
-import uuid
-import subprocess
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import torch
-from PIL import Image
 import cv2
 
+from .fbx_blender_process import run_blender
+from .fbx_mesh_raster import EDGE_CREASE_ANGLE, load_mesh_frames, render_mesh_frames
+from .fbx_scratch import finish_job_dir, new_job_dir
+from .fbx_shm import create_block, release_block, rgb_to_gray
+from .fbx_timing import StageTimer, attach_timings, start_profile
+
+# Worker threads for decode + Canny (OpenCV releases the GIL in both)
+CANNY_WORKERS = min(16, os.cpu_count() or 1)
+
+# Edge_Source dropdown -> --edge_source for fbx_canny_extract.py
+EDGE_SOURCES = {
+    "Cycles RGB + Canny": "RENDER",
+    "Mesh Geometry (No Render)": "MESH",
+}
+
+
+def _parse_threshold_keys(text):
+    """
+    Parse a multiline "frame, low, high" string (one key per line, "#" lines
+    ignored, same layout as the Camera Director keys). Returns sorted
+    [(frame, low, high)], later duplicates of a frame win.
+    """
+    keys = {}
+    if not text:
+        return []
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.replace(":", ",").split(",")
+        if len(parts) < 3:
+            continue
+        try:
+            frame = int(parts[0].strip())
+            low = float(parts[1].strip())
+            high = float(parts[2].strip())
+        except Exception:
+            continue
+        keys[max(frame, 0)] = (low, high)
+
+    return [(f, lo, hi) for f, (lo, hi) in sorted(keys.items())]
+
+
+def _threshold_curves(keys, count, low, high):
+    """
+    Per-frame (low, high) int arrays of length count, linearly interpolated
+    between keys and held flat outside them. No keys -> constant low / high.
+    """
+    if not keys:
+        return np.full(count, int(low)), np.full(count, int(high))
+
+    frames = np.array([k[0] for k in keys], dtype=np.float64)
+    idx = np.arange(count, dtype=np.float64)
+    lows = np.interp(idx, frames, [k[1] for k in keys])
+    highs = np.interp(idx, frames, [k[2] for k in keys])
+    return np.rint(lows).astype(int), np.rint(highs).astype(int)
+
+
+def _frame_order(canny_info, slots):
+    """
+    Output frame -> stack slot, for a stack made once per distinct frame
+    (rendered_frames) but requested as frame_indices. None when the stack
+    already has one slot per output frame (or the info doesn't say).
+    """
+    frame_indices = canny_info.get("frame_indices")
+    rendered = canny_info.get("rendered_frames")
+    if not isinstance(frame_indices, list) or not isinstance(rendered, list):
+        return None
+    if not rendered or slots != len(rendered):
+        return None
+
+    pos = {f: i for i, f in enumerate(rendered)}
+    if not all(f in pos for f in frame_indices):
+        return None
+    order = [pos[f] for f in frame_indices]
+    if order == list(range(slots)):
+        return None
+    return order
+
+
+def _pil_gray(bgr):
+    """
+    uint8 [H, W, 3] BGR -> grey the way PIL's convert("L") does. cv2's own
+    BGR2GRAY and IMREAD_GRAYSCALE round differently, which moves Canny edges
+    on some frames.
+    """
+    return rgb_to_gray(bgr[..., ::-1])
+
 
 class FBX_Canny_Blender:
     @classmethod
@@ -40,7 +126,34 @@ class FBX_Canny_Blender:
                 ),
                 "Canny_Low": ("INT", {"default": 100, "min": 0, "max": 1000}),
                 "Canny_High": ("INT", {"default": 200, "min": 0, "max": 2000}),
-            }
+                "Edge_Source": (
+                    list(EDGE_SOURCES.keys()),
+                    {"default": "Cycles RGB + Canny"},
+                ),
+                # Mesh Geometry only: face angle (degrees) drawn as a crease line
+                "Crease_Angle": (
+                    "FLOAT",
+                    {"default": EDGE_CREASE_ANGLE, "min": 1.0, "max": 180.0, "step": 1.0},
+                ),
+                # Shared Memory: Blender writes grey frames straight into a block
+                # the node maps, no PNG files (Cycles RGB + Canny only)
+                "Transport": (
+                    ["PNG Files", "Shared Memory"],
+                    {"default": "PNG Files"},
+                ),
+            },
+            "optional": {
+                # Overrides Canny_Low / Canny_High per output frame when keyed
+                "Canny_Thresholds": (
+                    "STRING",
+                    {
+                        "default": "# Threshold keys (frame, low, high) - leave empty to use Canny_Low / Canny_High\n",
+                        "multiline": True,
+                    },
+                ),
+                # Shared FBX_Multipass_Blender result instead of a Blender run here
+                "Multipass": ("FBX_MULTIPASS",),
+            },
         }
 
     RETURN_TYPES = ("IMAGE", "STRING",)
@@ -63,7 +176,38 @@ class FBX_Canny_Blender:
         arr = np.zeros((frames, height, width, 3), dtype=np.float32)
         return torch.from_numpy(arr)
 
-    def _load_canny_stack(self, rgb_dir, width, height, low, high):
+    def _canny_frame(self, path, width, height, low, high, out):
+        """
+        Decode one frame, convert it to grey the way PIL does, run Canny and
+        write the 0..1 edges into out (a [H, W] float32 view of the batch).
+        """
+        try:
+            # np.fromfile + imdecode copes with non-ASCII Windows paths
+            bgr = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
+        except Exception:
+            bgr = None
+        if bgr is None:
+            return False
+        return self._canny_gray(_pil_gray(bgr), width, height, low, high, out)
+
+    def _canny_gray(self, gray, width, height, low, high, out):
+        """Canny on a uint8 [h, w] grey frame, 0..1 edges written into out."""
+        edges = cv2.Canny(gray, int(low), int(high))
+
+        if edges.shape[1] != width or edges.shape[0] != height:
+            edges = edges.astype(np.float32) / 255.0
+            out[...] = cv2.resize(edges, (width, height), interpolation=cv2.INTER_LINEAR)
+        else:
+            np.multiply(edges, np.float32(1.0 / 255.0), out=out)
+        return True
+
+    def _load_canny_stack(self, rgb_dir, width, height, low, high, threshold_keys=None, canny_info=None):
+        """
+        Canny over the rgb_NNNN files, one batch entry per output frame. When
+        the files are one per distinct frame (rendered_frames in canny_info)
+        they are mapped back onto frame_indices; threshold keys index output
+        frames, so with keys a frame requested twice is run once per request.
+        """
         if not os.path.isdir(rgb_dir):
             return None
 
@@ -74,32 +218,107 @@ class FBX_Canny_Blender:
         if not files:
             return None
 
-        images = []
-        for fname in files:
-            path = os.path.join(rgb_dir, fname)
-            try:
-                img = Image.open(path).convert("L")
-            except Exception:
-                continue
+        sources, order = self._canny_sources(len(files), canny_info, threshold_keys)
+        lows, highs = _threshold_curves(threshold_keys, len(sources), low, high)
 
-            arr = np.array(img, dtype=np.uint8)
-            edges = cv2.Canny(arr, int(low), int(high))
+        # One [F, H, W, 1] batch, frames processed in parallel straight into it
+        edges = torch.empty((len(sources), height, width, 1), dtype=torch.float32)
+        edges_np = edges.numpy()
 
-            edges = edges.astype(np.float32) / 255.0
+        def _run(idx):
+            path = os.path.join(rgb_dir, files[sources[idx]])
+            return self._canny_frame(
+                path, width, height, lows[idx], highs[idx], edges_np[idx, :, :, 0]
+            )
 
-            if edges.shape[1] != width or edges.shape[0] != height:
-                edges = cv2.resize(edges, (width, height), interpolation=cv2.INTER_LINEAR)
+        with ThreadPoolExecutor(max_workers=CANNY_WORKERS) as pool:
+            ok = list(pool.map(_run, range(len(sources))))
 
-            edges_rgb = np.stack([edges, edges, edges], axis=-1)
-            images.append(edges_rgb)
+        if not any(ok):
+            return None
+        if not all(ok):
+            # Slots no longer line up with rendered_frames, keep what decoded
+            edges = edges[[idx for idx, good in enumerate(ok) if good]]
+            order = None
+
+        return self._output_frames(edges, order)
+
+    def _canny_shm_stack(self, block, info_path, width, height, low, high, threshold_keys=None):
+        """
+        Shared Memory transport: Canny straight off the grey frames Blender
+        wrote into the block (shm_count of them, one per rendered frame), no
+        PNG decode. Returns one batch entry per output frame, like
+        _load_canny_stack.
+        """
+        try:
+            with open(info_path, "r", encoding="utf-8") as f:
+                shm_info = json.load(f)
+            count = int(shm_info.get("shm_count", 0))
+        except Exception:
+            shm_info, count = {}, 0
+        count = min(count, block.shape[0])
+        if count <= 0:
+            return None
+
+        sources, order = self._canny_sources(count, shm_info, threshold_keys)
+        lows, highs = _threshold_curves(threshold_keys, len(sources), low, high)
+
+        edges = torch.empty((len(sources), height, width, 1), dtype=torch.float32)
+        edges_np = edges.numpy()
+
+        def _run(idx):
+            self._canny_gray(
+                block[sources[idx]], width, height, lows[idx], highs[idx], edges_np[idx, :, :, 0]
+            )
 
-        if not images:
+        with ThreadPoolExecutor(max_workers=CANNY_WORKERS) as pool:
+            list(pool.map(_run, range(len(sources))))
+
+        return self._output_frames(edges, order)
+
+    def _canny_sources(self, slots, canny_info, threshold_keys):
+        """
+        (source slot per Canny run, order still to apply afterwards). Without
+        threshold keys each distinct frame is run once and order maps the
+        result onto the output frames; with keys the runs already follow the
+        output frames so each gets its own thresholds.
+        """
+        order = _frame_order(canny_info or {}, slots)
+        if order is None:
+            return list(range(slots)), None
+        if threshold_keys:
+            return order, None
+        return list(range(slots)), order
+
+    def _output_frames(self, edges, order):
+        """[F, H, W, 1] edges -> 3-channel broadcast view, reordered onto the output frames."""
+        if order is not None:
+            edges = edges[order]
+        # Grey edges -> 3 identical channels as a broadcast view (no copies)
+        return edges.expand(-1, -1, -1, 3)
+
+    def _geometry_edge_stack(self, mesh_path, width, height, crease_angle):
+        """
+        Mesh Geometry source: silhouette / occlusion / crease lines straight
+        from the rasterised mesh, no RGB render or Canny pass.
+        """
+        mesh = load_mesh_frames(mesh_path)
+        if mesh is None or mesh["verts"].shape[0] == 0:
             return None
 
-        stack = np.stack(images, axis=0)
-        return torch.from_numpy(stack.astype(np.float32))
+        edges = render_mesh_frames(
+            mesh, width, height, passes=("edges",), crease_angle=crease_angle
+        )["edges"]
+        return torch.from_numpy(edges).unsqueeze(-1).expand(-1, -1, -1, 3)
 
-    def generate_canny_images(
+    def _expand_to_frame_indices(self, canny_tensor, canny_info):
+        """Map the once-per-distinct-frame stack back onto frame_indices."""
+        order = _frame_order(canny_info, canny_tensor.shape[0])
+        if order is None:
+            return canny_tensor
+        return canny_tensor[..., :1][order].expand(-1, -1, -1, 3)
+
+    async def generate_canny_images(
         self,
         Blender_Executable,
         FBX_File,
@@ -114,6 +333,11 @@ class FBX_Canny_Blender:
         View_Mode,
         Canny_Low,
         Canny_High,
+        Edge_Source="Cycles RGB + Canny",
+        Crease_Angle=EDGE_CREASE_ANGLE,
+        Transport="PNG Files",
+        Canny_Thresholds="",
+        Multipass=None,
     ):
         blender_exe = Blender_Executable.strip().strip('"')
         if not blender_exe or not os.path.isfile(blender_exe):
@@ -127,66 +351,89 @@ class FBX_Canny_Blender:
                 f"FBX Canny (Blender Edges): FBX file not found:\n{fbx_path}"
             )
 
-        script_path = self._get_script_path()
+        timer = StageTimer()
+        prof = start_profile()
+        blender_seconds = None
+        shm_tensor = None
+        if Multipass is not None:
+            from .fbx_multipass_node import multipass_output
 
-        if Frame_Mode == "Sample_N_Frames":
-            if End_Frame <= Start_Frame:
-                End_Frame = Start_Frame + max(Num_Frames - 1, 0)
+            needed = "mesh" if EDGE_SOURCES.get(Edge_Source) == "MESH" else "rgb"
+            out_dir, multipass_info = multipass_output(
+                Multipass, needed, "FBX Canny (Blender Edges)"
+            )
         else:
-            if End_Frame < Start_Frame:
-                End_Frame = Start_Frame
+            multipass_info = None
+            script_path = self._get_script_path()
 
-        out_dir = os.path.join(
-            tempfile.gettempdir(),
-            f"fbx_canny_blender_{uuid.uuid4().hex}",
-        )
-        os.makedirs(out_dir, exist_ok=True)
-
-        args = [
-            blender_exe,
-            "-b",
-            "-P", script_path,
-            "--",
-            "--fbx", fbx_path,
-            "--out", out_dir,
-            "--frame_mode", Frame_Mode,
-            "--num_frames", str(Num_Frames),
-            "--start_frame", str(Start_Frame),
-            "--end_frame", str(End_Frame),
-            "--frame_step", str(Frame_Step),
-            "--out_width", str(Output_Width),
-            "--out_height", str(Output_Height),
-            "--zoom_factor", str(float(Zoom_Factor)),
-            "--view_mode", View_Mode,
-        ]
-
-        result = subprocess.run(
-            args,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=False,
-        )
+            if Frame_Mode == "Sample_N_Frames":
+                if End_Frame <= Start_Frame:
+                    End_Frame = Start_Frame + max(Num_Frames - 1, 0)
+            else:
+                if End_Frame < Start_Frame:
+                    End_Frame = Start_Frame
 
-        if result.returncode != 0:
-            raise RuntimeError(
-                "FBX Canny (Blender Edges): Blender canny extractor failed.\n"
-                f"Command: {' '.join(args)}\n"
-                f"STDOUT:\n{result.stdout}\n"
-                f"STDERR:\n{result.stderr}\n"
-            )
+            out_dir = new_job_dir("fbx_canny_blender")
 
-        rgb_dir = os.path.join(out_dir, "rgb")
-        canny_tensor = self._load_canny_stack(
-            rgb_dir, Output_Width, Output_Height, Canny_Low, Canny_High
-        )
-        if canny_tensor is None:
-            canny_tensor = self._blank_image_stack(
-                Num_Frames, Output_Width, Output_Height
-            )
+            args = [
+                blender_exe,
+                "-b",
+                "-P", script_path,
+                "--",
+                "--fbx", fbx_path,
+                "--out", out_dir,
+                "--frame_mode", Frame_Mode,
+                "--num_frames", str(Num_Frames),
+                "--start_frame", str(Start_Frame),
+                "--end_frame", str(End_Frame),
+                "--frame_step", str(Frame_Step),
+                "--out_width", str(Output_Width),
+                "--out_height", str(Output_Height),
+                "--zoom_factor", str(float(Zoom_Factor)),
+                "--view_mode", View_Mode,
+                "--edge_source", EDGE_SOURCES.get(Edge_Source, "RENDER"),
+            ]
+
+            shm = shm_block = None
+            if Transport == "Shared Memory" and EDGE_SOURCES.get(Edge_Source) != "MESH":
+                # Distinct frames never exceed Num_Frames, so that is the capacity
+                shm, shm_block = create_block(
+                    (max(Num_Frames, 1), Output_Height, Output_Width), np.uint8
+                )
+                args += ["--shm_name", shm.name, "--shm_frames", str(max(Num_Frames, 1))]
+
+            try:
+                result = await run_blender(args, "FBX Canny (Blender Edges)")
+                blender_seconds = result.seconds
+
+                if result.returncode != 0:
+                    raise RuntimeError(
+                        "FBX Canny (Blender Edges): Blender canny extractor failed.\n"
+                        f"Command: {' '.join(args)}\n"
+                        f"STDOUT:\n{result.stdout}\n"
+                        f"STDERR:\n{result.stderr}\n"
+                    )
+
+                if shm is not None:
+                    with timer.stage("canny"):
+                        shm_tensor = self._canny_shm_stack(
+                            shm_block,
+                            os.path.join(out_dir, "canny_info.json"),
+                            Output_Width,
+                            Output_Height,
+                            Canny_Low,
+                            Canny_High,
+                            _parse_threshold_keys(Canny_Thresholds),
+                        )
+            finally:
+                if shm is not None:
+                    shm_block = None
+                    release_block(shm, unlink=True)
 
         info_path = os.path.join(out_dir, "canny_info.json")
-        if os.path.isfile(info_path):
+        if multipass_info is not None:
+            canny_info = multipass_info
+        elif os.path.isfile(info_path):
             try:
                 with open(info_path, "r", encoding="utf-8") as f:
                     canny_info = json.load(f)
@@ -195,6 +442,34 @@ class FBX_Canny_Blender:
         else:
             canny_info = {}
 
+        threshold_keys = _parse_threshold_keys(Canny_Thresholds)
+
+        if shm_tensor is not None:
+            canny_tensor = shm_tensor
+        elif EDGE_SOURCES.get(Edge_Source) == "MESH":
+            with timer.stage("rasterization"):
+                canny_tensor = self._geometry_edge_stack(
+                    os.path.join(out_dir, "mesh_frames.npz"),
+                    Output_Width,
+                    Output_Height,
+                    Crease_Angle,
+                )
+            if canny_tensor is not None:
+                canny_tensor = self._expand_to_frame_indices(canny_tensor, canny_info)
+        else:
+            rgb_dir = os.path.join(out_dir, "rgb")
+            # PNG decode + Canny, interleaved per frame in the thread pool
+            with timer.stage("png_load_canny"):
+                canny_tensor = self._load_canny_stack(
+                    rgb_dir, Output_Width, Output_Height, Canny_Low, Canny_High,
+                    threshold_keys, canny_info,
+                )
+        if canny_tensor is None:
+            with timer.stage("tensor_conversion"):
+                canny_tensor = self._blank_image_stack(
+                    Num_Frames, Output_Width, Output_Height
+                )
+
         canny_info.setdefault("fbx_file", fbx_path)
         canny_info.setdefault("frame_mode", Frame_Mode)
         canny_info.setdefault("num_frames_requested", Num_Frames)
@@ -204,5 +479,14 @@ class FBX_Canny_Blender:
         canny_info.setdefault("view_mode", View_Mode)
         canny_info.setdefault("canny_low", int(Canny_Low))
         canny_info.setdefault("canny_high", int(Canny_High))
+        canny_info.setdefault("edge_source", Edge_Source)
+        canny_info.setdefault("transport", Transport if shm_tensor is not None else "PNG Files")
+        if threshold_keys:
+            canny_info.setdefault("canny_threshold_keys", [list(k) for k in threshold_keys])
+        attach_timings(canny_info, timer, blender_seconds, prof, "fbx_canny_node")
+
+        if multipass_info is None:
+            # Everything is loaded, the job folder can go
+            finish_job_dir(out_dir)
 
         return (canny_tensor, json.dumps(canny_info))
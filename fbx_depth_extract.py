@@ -3,8 +3,24 @@ import sys
 import os
 import json
 import math
+import shutil
+import time
+import numpy as np
 from mathutils import Vector
 
+# Blender doesn't put the -P script's folder on sys.path; the helper modules live there
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:
+    sys.path.append(_HERE)
+
+from fbx_timing import StageTimer, dump_profile, start_profile
+
+# --depth_engine MESH writes this instead of rendering (see fbx_mesh_raster.py)
+MESH_FRAMES_FILE = "mesh_frames.npz"
+
+# Throwaway target for the beauty frames an animation render always writes
+BEAUTY_DIR = "_beauty"
+
 
 def parse_args():
     argv = sys.argv
@@ -25,6 +41,10 @@ def parse_args():
         "out_height": 512,
         "zoom_factor": 1.0,
         "view_mode": "Front",
+        "depth_engine": "CYCLES",
+        # Shared-memory transport (fbx_shm.py): block name + frame capacity
+        "shm_name": "",
+        "shm_frames": 0,
     }
 
     key = None
@@ -33,7 +53,7 @@ def parse_args():
             key = item[2:]
         else:
             if key in args:
-                if key in ["num_frames", "start_frame", "end_frame", "frame_step", "out_width", "out_height"]:
+                if key in ["num_frames", "start_frame", "end_frame", "frame_step", "out_width", "out_height", "shm_frames"]:
                     args[key] = int(item)
                 elif key == "zoom_factor":
                     try:
@@ -53,6 +73,9 @@ def parse_args():
     if args["view_mode"] not in valid_views:
         args["view_mode"] = "Front"
 
+    if args["depth_engine"] not in ("CYCLES", "EEVEE", "MESH"):
+        args["depth_engine"] = "CYCLES"
+
     return args
 
 
@@ -204,8 +227,56 @@ def _get_camera_position(center, radius, ref_obj, view_mode):
     return pos
 
 
-def ensure_camera_and_mist(scene, ref_obj, out_width, out_height, depth_dir, zoom_factor, view_mode):
-    scene.render.engine = 'CYCLES'
+def _setup_fast_eevee(scene):
+    """
+    EEVEE with everything but the z-buffer switched off. The mist pass is
+    just normalised view depth, so one rasterised sample gives the same map
+    as Cycles path tracing for a tiny fraction of the render time.
+    """
+    try:
+        scene.render.engine = 'BLENDER_EEVEE'
+    except TypeError:
+        # Blender 4.2+ renamed it
+        scene.render.engine = 'BLENDER_EEVEE_NEXT'
+
+    eevee = scene.eevee
+    for attr, value in (
+        ("taa_render_samples", 1),
+        ("use_gtao", False),
+        ("use_bloom", False),
+        ("use_ssr", False),
+        ("use_motion_blur", False),
+        ("use_volumetric_lights", False),
+        ("use_soft_shadows", False),
+        ("use_shadows", False),
+        ("use_raytracing", False),
+    ):
+        if hasattr(eevee, attr):
+            try:
+                setattr(eevee, attr, value)
+            except Exception:
+                pass
+
+
+def setup_depth_render(scene, out_width, out_height, depth_dir, out_dir, depth_engine="CYCLES", to_viewer=False):
+    """
+    One-time render setup: engine, mist pass, camera object and the
+    compositor tree (Mist -> Normalize -> 16-bit PNG). Per-frame framing is
+    keyframed afterwards by key_camera_for_frame, so nothing in here has to be
+    rebuilt between frames.
+
+    depth_engine: "CYCLES" (original path) or "EEVEE" (fast, rasterised mist).
+    to_viewer: send the normalised mist to a Viewer node instead of PNG files,
+    for the shared-memory transport (read back with fbx_shm.viewer_pixels).
+
+    Returns (cam, world) or None if the Mist pass is unavailable.
+    """
+    if depth_engine == "EEVEE":
+        _setup_fast_eevee(scene)
+    else:
+        scene.render.engine = 'CYCLES'
+        # Keep BVH / scene data warm between frames of the same job
+        scene.render.use_persistent_data = True
 
     for view_layer in scene.view_layers:
         view_layer.use_pass_mist = True
@@ -215,11 +286,8 @@ def ensure_camera_and_mist(scene, ref_obj, out_width, out_height, depth_dir, zoo
         world = bpy.data.worlds.new("FBXDepthWorld")
         scene.world = world
 
-    center, radius, height = _get_world_bbox_center_radius_height(ref_obj)
-
     world.mist_settings.use_mist = True
     world.mist_settings.start = 0.0
-    world.mist_settings.depth = radius * 4.0
     world.mist_settings.falloff = 'LINEAR'
 
     cam = None
@@ -236,30 +304,20 @@ def ensure_camera_and_mist(scene, ref_obj, out_width, out_height, depth_dir, zoo
     scene.camera = cam
 
     cam.data.type = 'ORTHO'
-    # Base scale uses both radius and height so we keep the whole body
-    base_scale = max(radius * 2.6, height * 1.4)
-    cam.data.ortho_scale = base_scale / zoom_factor
-
-    cam.location = _get_camera_position(center, radius, ref_obj, view_mode)
-
-    direction = (center - cam.location).normalized()
-    up = Vector((0.0, 0.0, 1.0))
-    if view_mode == "Top":
-        up = Vector((0.0, 1.0, 0.0))
-
-    quat = direction.to_track_quat('-Z', 'Y')
-    cam.rotation_euler = quat.to_euler()
     cam.data.shift_x = 0.0
     cam.data.shift_y = 0.0
 
-    distance = (cam.location - center).length
-    cam.data.clip_start = max(distance * 0.1, 0.01)
-    cam.data.clip_end = distance * 10.0
-
     scene.render.resolution_x = out_width
     scene.render.resolution_y = out_height
     scene.render.resolution_percentage = 100
 
+    # The beauty pass is not used. Animation renders write it regardless, so
+    # it goes to a throwaway folder (uncompressed, cheapest to write) that
+    # render_depth_frames() removes
+    scene.render.filepath = os.path.join(os.path.abspath(out_dir), BEAUTY_DIR, "frame_")
+    scene.render.image_settings.file_format = 'PNG'
+    scene.render.image_settings.compression = 0
+
     depth_dir_abs = os.path.abspath(depth_dir)
     os.makedirs(depth_dir_abs, exist_ok=True)
 
@@ -278,11 +336,19 @@ def ensure_camera_and_mist(scene, ref_obj, out_width, out_height, depth_dir, zoo
 
     if mist_socket_name is None:
         print("FBX Depth: WARNING - no Mist output on Render Layers node; depth maps will not be saved.")
-        return
+        return None
 
     normalize = tree.nodes.new('CompositorNodeNormalize')
     normalize.location = (200, 0)
 
+    tree.links.new(rl.outputs[mist_socket_name], normalize.inputs[0])
+
+    if to_viewer:
+        viewer = tree.nodes.new('CompositorNodeViewer')
+        viewer.location = (400, 0)
+        tree.links.new(normalize.outputs[0], viewer.inputs[0])
+        return cam, world
+
     out = tree.nodes.new('CompositorNodeOutputFile')
     out.location = (400, 0)
     out.base_path = depth_dir_abs
@@ -291,11 +357,373 @@ def ensure_camera_and_mist(scene, ref_obj, out_width, out_height, depth_dir, zoo
     out.format.color_mode = 'BW'
     out.format.color_depth = '16'
 
-    tree.links.new(rl.outputs[mist_socket_name], normalize.inputs[0])
     tree.links.new(normalize.outputs[0], out.inputs[0])
 
+    return cam, world
+
+
+def frame_camera_params(ref_obj, zoom_factor, view_mode):
+    """
+    Camera framing for the *current* frame (call after scene.frame_set).
+    Recomputed per frame from the bbox so nothing clips out.
+    """
+    center, radius, height = _get_world_bbox_center_radius_height(ref_obj)
+
+    # Base scale uses both radius and height so we keep the whole body
+    base_scale = max(radius * 2.6, height * 1.4)
+
+    location = _get_camera_position(center, radius, ref_obj, view_mode)
+    direction = (center - location).normalized()
+    quat = direction.to_track_quat('-Z', 'Y')
+
+    distance = (location - center).length
+
+    return {
+        "location": location,
+        "rotation": quat.to_euler(),
+        "ortho_scale": base_scale / zoom_factor,
+        "clip_start": max(distance * 0.1, 0.01),
+        "clip_end": distance * 10.0,
+        "mist_depth": radius * 4.0,
+    }
+
+
+def key_camera_for_frame(cam, world, frame, params):
+    """Set + keyframe the per-frame camera / mist values at frame."""
+    cam.location = params["location"]
+    cam.rotation_euler = params["rotation"]
+    cam.data.ortho_scale = params["ortho_scale"]
+    cam.data.clip_start = params["clip_start"]
+    cam.data.clip_end = params["clip_end"]
+    world.mist_settings.depth = params["mist_depth"]
+
+    cam.keyframe_insert(data_path="location", frame=frame)
+    cam.keyframe_insert(data_path="rotation_euler", frame=frame)
+    cam.data.keyframe_insert(data_path="ortho_scale", frame=frame)
+    cam.data.keyframe_insert(data_path="clip_start", frame=frame)
+    cam.data.keyframe_insert(data_path="clip_end", frame=frame)
+    world.keyframe_insert(data_path="mist_settings.depth", frame=frame)
+
+
+def _set_constant_interpolation(*ids):
+    # Camera must jump to each frame's framing, not ease between keys
+    for id_block in ids:
+        anim = id_block.animation_data
+        if anim is None or anim.action is None:
+            continue
+        for fcu in anim.action.fcurves:
+            for kp in fcu.keyframe_points:
+                kp.interpolation = 'CONSTANT'
+
+
+def _uniform_step(frames):
+    """Return the step if frames is an evenly spaced increasing run, else None."""
+    if len(frames) < 2:
+        return 1
+    step = frames[1] - frames[0]
+    if step <= 0:
+        return None
+    for a, b in zip(frames, frames[1:]):
+        if b - a != step:
+            return None
+    return step
+
+
+def render_depth_frames(scene, frames):
+    """
+    Render the (sorted, unique) frames. Evenly spaced runs go out as a single
+    animation render job; anything else falls back to one render per frame,
+    still without touching the scene setup in between. The File Output nodes
+    write the passes either way; the unused beauty frames are deleted.
+    """
+    step = _uniform_step(frames)
+    if step is not None:
+        scene.frame_start = frames[0]
+        scene.frame_end = frames[-1]
+        scene.frame_step = step
+        bpy.ops.render.render(animation=True)
+        shutil.rmtree(os.path.dirname(scene.render.filepath), ignore_errors=True)
+        return
+
+    for f in frames:
+        scene.frame_set(f)
+        bpy.ops.render.render(write_still=False)
+
+
+def render_depth_to_shm(scene, frames, shm_name, capacity, out_width, out_height):
+    """
+    Shared-memory transport: render each frame and copy the Viewer node's
+    normalised mist straight into the node's [capacity, H, W] float32 block.
+    Frames go out one render at a time because the Viewer buffer only holds
+    the latest frame. Returns the number of frames written.
+    """
+    from fbx_shm import attach_block, release_block, viewer_pixels
+
+    shm, block = attach_block(shm_name, (capacity, out_height, out_width), np.float32)
+    written = 0
+    try:
+        rgba = np.empty((out_height, out_width, 4), dtype=np.float32)
+        for f in frames[:capacity]:
+            scene.frame_set(f)
+            bpy.ops.render.render(write_still=False)
+            viewer = bpy.data.images.get("Viewer Node")
+            if viewer is None or tuple(viewer.size) != (out_width, out_height):
+                break
+            viewer_pixels(viewer, rgba)
+            block[written] = rgba[:, :, 0]
+            written += 1
+    finally:
+        del block
+        release_block(shm)
+    return written
+
+
+def _evaluated_world_verts(obj, depsgraph):
+    """World-space vertex positions of the evaluated (skinned/modified) mesh."""
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+    finally:
+        eval_obj.to_mesh_clear()
+
+    mat = np.array(eval_obj.matrix_world, dtype=np.float64)
+    co = co.reshape(-1, 3).astype(np.float64)
+    return (co @ mat[:3, :3].T + mat[:3, 3]).astype(np.float32)
+
+
+def _evaluated_triangles(obj, depsgraph):
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        mesh.calc_loop_triangles()
+        tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("vertices", tris)
+        vert_count = len(mesh.vertices)
+    finally:
+        eval_obj.to_mesh_clear()
+    return tris.reshape(-1, 3), vert_count
+
+
+# Bone influences kept per vertex for the skinned export (Blender is not capped)
+SKIN_MAX_INFLUENCES = 4
+
+
+def _mesh_armature(obj):
+    """
+    The armature driving obj if its deformation is plain linear blend skinning
+    (one Armature modifier, no shape keys / other modifiers / dual quaternion),
+    else None. Anything else has to be exported as baked per-frame vertices.
+    """
+    if obj.data.shape_keys is not None:
+        return None
+    arm_mods = [m for m in obj.modifiers if m.show_render]
+    if len(arm_mods) != 1 or arm_mods[0].type != 'ARMATURE':
+        return None
+    mod = arm_mods[0]
+    if mod.object is None or not mod.use_vertex_groups or mod.use_deform_preserve_volume:
+        return None
+    return mod.object
+
+
+def _collect_skin_data(mesh_objs):
+    """
+    One-time skin export (call on the first exported frame): rest vertices,
+    top-K bone indices / normalised weights and inverse bind matrices.
+
+    Skinned vertices live in armature space and use real bones; vertices
+    with no deform weight stay rigid and use a per-mesh "object bone" whose
+    matrix is just the mesh's matrix_world. Returns None if any mesh can't
+    be reproduced by LBS.
+    """
+    arms = []
+    for obj in mesh_objs:
+        arm = _mesh_armature(obj)
+        if arm is None:
+            return None
+        arms.append(arm)
+
+    # Global bone table: every deform bone of every armature, then one object bone per mesh
+    bones = []
+    bone_index = {}
+    inv_bind = []
+    for arm in dict.fromkeys(arms):
+        for bone in arm.data.bones:
+            if not bone.use_deform:
+                continue
+            bone_index[(arm.name, bone.name)] = len(bones)
+            bones.append(("BONE", arm, bone.name))
+            inv_bind.append(np.array(bone.matrix_local.inverted(), dtype=np.float64))
+    for obj in mesh_objs:
+        bones.append(("OBJECT", obj, None))
+        inv_bind.append(np.eye(4))
+
+    rest_list, idx_list, w_list, tris_list = [], [], [], []
+    offset = 0
+    for mesh_i, (obj, arm) in enumerate(zip(mesh_objs, arms)):
+        mesh = obj.data
+        count = len(mesh.vertices)
+        co = np.empty(count * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        co = co.reshape(-1, 3).astype(np.float64)
+
+        group_bone = {
+            vg.index: bone_index.get((arm.name, vg.name)) for vg in obj.vertex_groups
+        }
+        object_bone = len(bones) - len(mesh_objs) + mesh_i
+
+        idx = np.full((count, SKIN_MAX_INFLUENCES), object_bone, dtype=np.int32)
+        wts = np.zeros((count, SKIN_MAX_INFLUENCES), dtype=np.float32)
+        for v in mesh.vertices:
+            infl = []
+            for g in v.groups:
+                b = group_bone.get(g.group)
+                if b is not None and g.weight > 0.0:
+                    infl.append((g.weight, b))
+            if not infl:
+                continue
+            infl.sort(reverse=True)
+            for k, (weight, b) in enumerate(infl[:SKIN_MAX_INFLUENCES]):
+                idx[v.index, k] = b
+                wts[v.index, k] = weight
+
+        total = wts.sum(axis=1)
+        skinned = total > 0.0
+        wts[skinned] /= total[skinned, None]
+        # Rigid vertices follow their mesh object only
+        wts[~skinned, 0] = 1.0
+
+        # Skinned rest positions in armature space (mesh assumed parented to its rig)
+        to_arm = np.array(arm.matrix_world.inverted() @ obj.matrix_world, dtype=np.float64)
+        rest = co.copy()
+        rest[skinned] = co[skinned] @ to_arm[:3, :3].T + to_arm[:3, 3]
+
+        mesh.calc_loop_triangles()
+        tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("vertices", tris)
+
+        rest_list.append(rest)
+        idx_list.append(idx)
+        w_list.append(wts)
+        tris_list.append(tris.reshape(-1, 3) + offset)
+        offset += count
+
+    return {
+        "bones": bones,
+        "rest": np.concatenate(rest_list).astype(np.float32) if rest_list else np.zeros((0, 3), np.float32),
+        "bone_idx": np.concatenate(idx_list) if idx_list else np.zeros((0, SKIN_MAX_INFLUENCES), np.int32),
+        "bone_w": np.concatenate(w_list) if w_list else np.zeros((0, SKIN_MAX_INFLUENCES), np.float32),
+        "inv_bind": np.asarray(inv_bind, dtype=np.float32).reshape(-1, 4, 4),
+        "tris": np.concatenate(tris_list) if tris_list else np.zeros((0, 3), np.int32),
+    }
+
+
+def _bone_matrices(bones):
+    """World matrices of the skin bone table at the current frame, [B, 4, 4]."""
+    mats = np.empty((len(bones), 4, 4), dtype=np.float64)
+    for i, (kind, owner, name) in enumerate(bones):
+        if kind == "BONE":
+            mats[i] = np.array(owner.matrix_world @ owner.pose.bones[name].matrix, dtype=np.float64)
+        else:
+            mats[i] = np.array(owner.matrix_world, dtype=np.float64)
+    return mats
+
+
+def export_mesh_frames(scene, frames, camera_params, path):
+    """
+    Write the mesh of every frame plus that frame's camera framing (from
+    camera_params(), called after each frame_set) to one .npz, so the depth/normal/silhouette maps can be rasterised outside
+    Blender. All render-visible meshes are merged into one vertex/triangle set.
+
+    Plain armature-skinned rigs are exported compactly as skin data (rest
+    verts, weights, inverse binds once + bone matrices per frame) and
+    re-posed by fbx_skinning.py. Anything else (shape keys, other modifiers)
+    is baked as evaluated vertices per frame, topology from the first frame.
+    """
+    mesh_objs = [o for o in scene.objects if o.type == 'MESH' and not o.hide_render]
+
+    scene.frame_set(frames[0])
+    bpy.context.view_layer.update()
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+
+    skin = _collect_skin_data(mesh_objs)
+
+    num = len(frames)
+    arrays = {}
+    if skin is not None:
+        tris = skin["tris"]
+        bone_mats = np.zeros((num, len(skin["bones"]), 4, 4), dtype=np.float32)
+        arrays.update(
+            rest=skin["rest"],
+            bone_idx=skin["bone_idx"],
+            bone_w=skin["bone_w"],
+            inv_bind=skin["inv_bind"],
+            bone_mats=bone_mats,
+        )
+    else:
+        tris_list = []
+        vert_counts = []
+        offset = 0
+        for obj in mesh_objs:
+            obj_tris, count = _evaluated_triangles(obj, depsgraph)
+            tris_list.append(obj_tris + offset)
+            vert_counts.append(count)
+            offset += count
+        tris = np.concatenate(tris_list) if tris_list else np.zeros((0, 3), dtype=np.int32)
+        verts = np.full((num, offset, 3), np.nan, dtype=np.float32)
+        arrays["verts"] = verts
+
+    cam_loc = np.zeros((num, 3), dtype=np.float64)
+    cam_rot = np.zeros((num, 3, 3), dtype=np.float64)
+    ortho_scale = np.zeros(num, dtype=np.float64)
+    clip_start = np.zeros(num, dtype=np.float64)
+    clip_end = np.zeros(num, dtype=np.float64)
+    mist_depth = np.zeros(num, dtype=np.float64)
+
+    for i, f in enumerate(frames):
+        scene.frame_set(f)
+        bpy.context.view_layer.update()
+
+        if skin is not None:
+            bone_mats[i] = _bone_matrices(skin["bones"])
+        else:
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            start = 0
+            for obj, count in zip(mesh_objs, vert_counts):
+                co = _evaluated_world_verts(obj, depsgraph)
+                if co.shape[0] == count:
+                    verts[i, start:start + count] = co
+                else:
+                    # Topology changed (e.g. a generative modifier): drop it for this frame
+                    print(f"FBX Depth: WARNING - vertex count of {obj.name} changed on frame {f}, skipped.")
+                start += count
+
+        params = camera_params()
+        cam_loc[i] = tuple(params["location"])
+        cam_rot[i] = [tuple(row) for row in params["rotation"].to_matrix()]
+        ortho_scale[i] = params["ortho_scale"]
+        clip_start[i] = params["clip_start"]
+        clip_end[i] = params["clip_end"]
+        mist_depth[i] = params["mist_depth"]
+
+    np.savez(
+        path,
+        frames=np.asarray(frames, dtype=np.int32),
+        tris=tris,
+        cam_loc=cam_loc,
+        cam_rot=cam_rot,
+        ortho_scale=ortho_scale,
+        clip_start=clip_start,
+        clip_end=clip_end,
+        mist_depth=mist_depth,
+        **arrays,
+    )
+
 
 def main():
+    timer = StageTimer()
+    prof = start_profile()
     args = parse_args()
 
     fbx_path = args["fbx"]
@@ -311,8 +739,10 @@ def main():
 
     os.makedirs(out_dir, exist_ok=True)
 
-    clear_scene()
-    import_fbx(fbx_path)
+    with timer.stage("factory_reset"):
+        clear_scene()
+    with timer.stage("fbx_import"):
+        import_fbx(fbx_path)
 
     ref_obj = find_ref_object()
     if ref_obj is None:
@@ -326,24 +756,64 @@ def main():
 
     depth_dir = os.path.join(out_dir, "depth")
 
-    for f in frame_indices:
-        scene.frame_set(f)
-        bpy.context.view_layer.update()
-        # Recompute bbox & camera per frame so nothing clips out
-        ensure_camera_and_mist(
-            scene,
-            ref_obj,
-            args["out_width"],
-            args["out_height"],
-            depth_dir,
-            args["zoom_factor"],
-            args["view_mode"],
-        )
-        bpy.ops.render.render(write_still=True)
+    # Duplicate frames (spread over a short anim) only need rendering once,
+    # the node maps them back via frame_indices / rendered_frames.
+    rendered_frames = sorted(set(frame_indices))
+    shm_count = 0
+
+    if args["depth_engine"] == "MESH":
+        # No render at all, the node rasterises the exported geometry itself
+        setup = None
+        with timer.stage("mesh_export"):
+            export_mesh_frames(
+                scene,
+                rendered_frames,
+                lambda: frame_camera_params(ref_obj, args["zoom_factor"], args["view_mode"]),
+                os.path.join(out_dir, MESH_FRAMES_FILE),
+            )
+    else:
+        with timer.stage("render_setup"):
+            setup = setup_depth_render(
+                scene,
+                args["out_width"],
+                args["out_height"],
+                depth_dir,
+                out_dir,
+                args["depth_engine"],
+                to_viewer=bool(args["shm_name"]),
+            )
+
+    if setup is not None:
+        cam, world = setup
+
+        # Evaluate every frame once to key the camera follow, then render the lot
+        for f in rendered_frames:
+            t0 = time.perf_counter()
+            scene.frame_set(f)
+            bpy.context.view_layer.update()
+            params = frame_camera_params(ref_obj, args["zoom_factor"], args["view_mode"])
+            key_camera_for_frame(cam, world, f, params)
+            timer.sample("frame_eval", time.perf_counter() - t0)
+
+        _set_constant_interpolation(cam, cam.data, world)
+        # Render + PNG write (or Viewer -> shared memory copy)
+        with timer.stage("render"):
+            if args["shm_name"]:
+                shm_count = render_depth_to_shm(
+                    scene,
+                    rendered_frames,
+                    args["shm_name"],
+                    args["shm_frames"],
+                    args["out_width"],
+                    args["out_height"],
+                )
+            else:
+                render_depth_frames(scene, rendered_frames)
 
     frame_info = {
         "fbx_file": os.path.abspath(fbx_path),
         "frame_indices": frame_indices,
+        "rendered_frames": rendered_frames,
         "frame_start": f_start,
         "frame_end": f_end,
         "frame_mode": args["frame_mode"],
@@ -355,7 +825,14 @@ def main():
         "out_height": args["out_height"],
         "zoom_factor": args["zoom_factor"],
         "view_mode": args["view_mode"],
+        "depth_engine": args["depth_engine"],
     }
+    if args["shm_name"]:
+        frame_info["shm_count"] = shm_count
+    profile_path = dump_profile(prof, "fbx_depth_extract")
+    if profile_path:
+        frame_info["profile"] = profile_path
+    frame_info["timings"] = timer.summary()
     info_path = os.path.join(out_dir, "depth_info.json")
     with open(info_path, "w", encoding="utf-8") as f:
         json.dump(frame_info, f, indent=2)
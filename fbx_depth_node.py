@@ -1,13 +1,27 @@
 import os
 import json
-import uuid
-import subprocess
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import torch
 from PIL import Image
 
+from .fbx_blender_process import run_blender
+from .fbx_mesh_raster import load_mesh_frames, render_mesh_frames
+from .fbx_scratch import finish_job_dir, new_job_dir
+from .fbx_shm import create_block, release_block
+from .fbx_timing import StageTimer, attach_timings, start_profile
+
+# Worker threads for decoding depth frames (PIL releases the GIL while decoding)
+LOAD_WORKERS = min(16, os.cpu_count() or 1)
+
+# Depth_Engine dropdown -> --depth_engine for fbx_depth_extract.py
+DEPTH_ENGINES = {
+    "Cycles (Mist)": "CYCLES",
+    "EEVEE (Fast Mist)": "EEVEE",
+    "NumPy Z-Buffer": "MESH",
+}
+
 
 class FBX_Depth_Blender:
     @classmethod
@@ -38,7 +52,21 @@ class FBX_Depth_Blender:
                     {"default": "Front"},
                 ),
                 "Invert_Depth": ("BOOLEAN", {"default": True}),
-            }
+                "Depth_Engine": (
+                    list(DEPTH_ENGINES.keys()),
+                    {"default": "Cycles (Mist)"},
+                ),
+                # Shared Memory: Blender writes float mist straight into a block
+                # the node maps, no PNG files (not used by NumPy Z-Buffer)
+                "Transport": (
+                    ["PNG Files", "Shared Memory"],
+                    {"default": "PNG Files"},
+                ),
+            },
+            "optional": {
+                # Shared FBX_Multipass_Blender result instead of a Blender run here
+                "Multipass": ("FBX_MULTIPASS",),
+            },
         }
 
     RETURN_TYPES = ("IMAGE", "STRING",)
@@ -61,6 +89,36 @@ class FBX_Depth_Blender:
         arr = np.zeros((frames, height, width, 3), dtype=np.float32)
         return torch.from_numpy(arr)
 
+    def _decode_depth_frame(self, path, width, height, invert, out):
+        """
+        Decode one depth PNG straight into out (a [H, W] float32 view of the
+        preallocated batch). Returns False if the file could not be read.
+        """
+        try:
+            img = Image.open(path)
+            img.load()
+        except Exception:
+            return False
+
+        if img.mode in ("I;16", "I"):
+            arr = np.asarray(img).astype(np.uint16, copy=False)
+            maxval = 65535.0
+        else:
+            arr = np.asarray(img.convert("L"), dtype=np.uint8)
+            maxval = 255.0
+
+        if arr.shape != (height, width):
+            img_resized = Image.fromarray(arr)
+            img_resized = img_resized.resize((width, height), Image.BILINEAR)
+            arr = np.asarray(img_resized)
+
+        out[...] = arr
+        out /= np.float32(maxval)
+        np.clip(out, 0.0, 1.0, out=out)
+        if invert:
+            np.subtract(np.float32(1.0), out, out=out)
+        return True
+
     def _load_depth_stack(self, depth_dir, width, height, invert):
         if not os.path.isdir(depth_dir):
             return None
@@ -72,42 +130,87 @@ class FBX_Depth_Blender:
         if not files:
             return None
 
-        images = []
-        for fname in files:
+        # One [F, H, W, 1] batch, frames decoded in parallel straight into it
+        depth = torch.empty((len(files), height, width, 1), dtype=torch.float32)
+        depth_np = depth.numpy()
+
+        def _load(item):
+            idx, fname = item
             path = os.path.join(depth_dir, fname)
-            try:
-                img = Image.open(path)
-            except Exception:
-                continue
+            return self._decode_depth_frame(path, width, height, invert, depth_np[idx, :, :, 0])
 
-            if img.mode in ("I;16", "I"):
-                arr = np.array(img, dtype=np.uint16).astype(np.float32)
-                maxval = 65535.0
-            else:
-                img = img.convert("L")
-                arr = np.array(img, dtype=np.float32)
-                maxval = 255.0
+        with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as pool:
+            ok = list(pool.map(_load, enumerate(files)))
 
-            if arr.shape != (height, width):
-                img_resized = Image.fromarray(
-                    arr.astype(np.uint16) if maxval == 65535.0 else arr.astype(np.uint8)
-                )
-                img_resized = img_resized.resize((width, height), Image.BILINEAR)
-                arr = np.array(img_resized, dtype=np.float32)
+        if not any(ok):
+            return None
+        if not all(ok):
+            keep = [idx for idx, good in enumerate(ok) if good]
+            depth = depth[keep]
 
-            arr = np.clip(arr / maxval, 0.0, 1.0)
-            if invert:
-                arr = 1.0 - arr
-            arr3 = np.stack([arr, arr, arr], axis=-1)
-            images.append(arr3)
+        # Grey depth -> 3 identical channels as a broadcast view (no copies)
+        return depth.expand(-1, -1, -1, 3)
 
-        if not images:
+    def _rasterize_depth_stack(self, mesh_path, width, height, invert):
+        """
+        NumPy Z-Buffer engine: rasterise the exported mesh frames in-process
+        instead of loading rendered PNGs. Same [F, H, W, 3] layout.
+        """
+        mesh = load_mesh_frames(mesh_path)
+        if mesh is None or mesh["verts"].shape[0] == 0:
             return None
 
-        depth_np = np.stack(images, axis=0)
-        return torch.from_numpy(depth_np.astype(np.float32))
+        depth = render_mesh_frames(mesh, width, height, passes=("depth",))["depth"]
+        if invert:
+            np.subtract(np.float32(1.0), depth, out=depth)
+
+        return torch.from_numpy(depth).unsqueeze(-1).expand(-1, -1, -1, 3)
+
+    def _copy_shm_stack(self, block, info_path, invert):
+        """
+        Shared Memory transport: copy the frames Blender wrote (shm_count in
+        depth_info.json) out of the block into a [F, H, W, 3] tensor view.
+        One memcpy; the block itself is released by the caller.
+        """
+        try:
+            with open(info_path, "r", encoding="utf-8") as f:
+                count = int(json.load(f).get("shm_count", 0))
+        except Exception:
+            count = 0
+        count = min(count, block.shape[0])
+        if count <= 0:
+            return None
+
+        depth = torch.empty((count,) + block.shape[1:] + (1,), dtype=torch.float32)
+        depth_np = depth.numpy()[..., 0]
+        np.clip(block[:count], 0.0, 1.0, out=depth_np)
+        if invert:
+            np.subtract(np.float32(1.0), depth_np, out=depth_np)
+        return depth.expand(-1, -1, -1, 3)
+
+    def _expand_to_frame_indices(self, depth_tensor, depth_info):
+        """
+        Blender renders each distinct frame once (rendered_frames); map the
+        stack back onto the requested frame_indices so repeated frames come
+        back as repeats instead of being dropped.
+        """
+        frame_indices = depth_info.get("frame_indices")
+        rendered = depth_info.get("rendered_frames")
+        if not isinstance(frame_indices, list) or not isinstance(rendered, list):
+            return depth_tensor
+        if not rendered or depth_tensor.shape[0] != len(rendered):
+            return depth_tensor
+
+        pos = {f: i for i, f in enumerate(rendered)}
+        if not all(f in pos for f in frame_indices):
+            return depth_tensor
+        order = [pos[f] for f in frame_indices]
+        if order == list(range(len(rendered))):
+            return depth_tensor
 
-    def generate_depth_images(
+        return depth_tensor[..., :1][order].expand(-1, -1, -1, 3)
+
+    async def generate_depth_images(
         self,
         Blender_Executable,
         FBX_File,
@@ -121,6 +224,9 @@ class FBX_Depth_Blender:
         Zoom_Factor,
         View_Mode,
         Invert_Depth,
+        Depth_Engine="Cycles (Mist)",
+        Transport="PNG Files",
+        Multipass=None,
     ):
         blender_exe = Blender_Executable.strip().strip('"')
         if not blender_exe or not os.path.isfile(blender_exe):
@@ -134,66 +240,84 @@ class FBX_Depth_Blender:
                 f"FBX Depth (Blender Z-Depth): FBX file not found:\n{fbx_path}"
             )
 
-        script_path = self._get_script_path()
+        timer = StageTimer()
+        prof = start_profile()
+        blender_seconds = None
+        shm_tensor = None
+        if Multipass is not None:
+            from .fbx_multipass_node import multipass_output
 
-        if Frame_Mode == "Frame_Spread_TotalAnim":
-            if End_Frame <= Start_Frame:
-                End_Frame = Start_Frame + max(Num_Frames - 1, 0)
+            out_dir, multipass_info = multipass_output(
+                Multipass, "depth", "FBX Depth (Blender Z-Depth)"
+            )
+            depth_engine = multipass_info.get("depth_engine", "CYCLES")
         else:
-            if End_Frame < Start_Frame:
-                End_Frame = Start_Frame
+            multipass_info = None
+            depth_engine = DEPTH_ENGINES.get(Depth_Engine, "CYCLES")
+            script_path = self._get_script_path()
 
-        out_dir = os.path.join(
-            tempfile.gettempdir(),
-            f"fbx_pose_blender_depth_{uuid.uuid4().hex}",
-        )
-        os.makedirs(out_dir, exist_ok=True)
-
-        args = [
-            blender_exe,
-            "-b",
-            "-P", script_path,
-            "--",
-            "--fbx", fbx_path,
-            "--out", out_dir,
-            "--frame_mode", Frame_Mode,
-            "--num_frames", str(Num_Frames),
-            "--start_frame", str(Start_Frame),
-            "--end_frame", str(End_Frame),
-            "--frame_step", str(Frame_Step),
-            "--out_width", str(Output_Width),
-            "--out_height", str(Output_Height),
-            "--zoom_factor", str(Zoom_Factor),
-            "--view_mode", View_Mode,
-        ]
-
-        result = subprocess.run(
-            args,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=False,
-        )
+            if Frame_Mode == "Frame_Spread_TotalAnim":
+                if End_Frame <= Start_Frame:
+                    End_Frame = Start_Frame + max(Num_Frames - 1, 0)
+            else:
+                if End_Frame < Start_Frame:
+                    End_Frame = Start_Frame
 
-        if result.returncode != 0:
-            raise RuntimeError(
-                "FBX Depth (Blender Z-Depth): Blender depth extractor failed.\n"
-                f"Command: {' '.join(args)}\n"
-                f"STDOUT:\n{result.stdout}\n"
-                f"STDERR:\n{result.stderr}\n"
-            )
+            out_dir = new_job_dir("fbx_pose_blender_depth")
 
-        depth_dir = os.path.join(out_dir, "depth")
-        depth_tensor = self._load_depth_stack(
-            depth_dir, Output_Width, Output_Height, Invert_Depth
-        )
-        if depth_tensor is None:
-            depth_tensor = self._blank_image_stack(
-                Num_Frames, Output_Width, Output_Height
-            )
+            args = [
+                blender_exe,
+                "-b",
+                "-P", script_path,
+                "--",
+                "--fbx", fbx_path,
+                "--out", out_dir,
+                "--frame_mode", Frame_Mode,
+                "--num_frames", str(Num_Frames),
+                "--start_frame", str(Start_Frame),
+                "--end_frame", str(End_Frame),
+                "--frame_step", str(Frame_Step),
+                "--out_width", str(Output_Width),
+                "--out_height", str(Output_Height),
+                "--zoom_factor", str(Zoom_Factor),
+                "--view_mode", View_Mode,
+                "--depth_engine", depth_engine,
+            ]
+
+            shm = shm_block = None
+            if Transport == "Shared Memory" and depth_engine != "MESH":
+                # Distinct frames never exceed Num_Frames, so that is the capacity
+                shm, shm_block = create_block(
+                    (max(Num_Frames, 1), Output_Height, Output_Width), np.float32
+                )
+                args += ["--shm_name", shm.name, "--shm_frames", str(max(Num_Frames, 1))]
+
+            try:
+                result = await run_blender(args, "FBX Depth (Blender Z-Depth)")
+                blender_seconds = result.seconds
+
+                if result.returncode != 0:
+                    raise RuntimeError(
+                        "FBX Depth (Blender Z-Depth): Blender depth extractor failed.\n"
+                        f"Command: {' '.join(args)}\n"
+                        f"STDOUT:\n{result.stdout}\n"
+                        f"STDERR:\n{result.stderr}\n"
+                    )
+
+                if shm is not None:
+                    with timer.stage("array_load"):
+                        shm_tensor = self._copy_shm_stack(
+                            shm_block, os.path.join(out_dir, "depth_info.json"), Invert_Depth
+                        )
+            finally:
+                if shm is not None:
+                    shm_block = None
+                    release_block(shm, unlink=True)
 
         info_path = os.path.join(out_dir, "depth_info.json")
-        if os.path.isfile(info_path):
+        if multipass_info is not None:
+            depth_info = multipass_info
+        elif os.path.isfile(info_path):
             try:
                 with open(info_path, "r", encoding="utf-8") as f:
                     depth_info = json.load(f)
@@ -202,6 +326,30 @@ class FBX_Depth_Blender:
         else:
             depth_info = {}
 
+        if shm_tensor is not None:
+            depth_tensor = shm_tensor
+        elif depth_engine == "MESH":
+            with timer.stage("rasterization"):
+                depth_tensor = self._rasterize_depth_stack(
+                    os.path.join(out_dir, "mesh_frames.npz"),
+                    Output_Width,
+                    Output_Height,
+                    Invert_Depth,
+                )
+        else:
+            depth_dir = os.path.join(out_dir, "depth")
+            with timer.stage("png_load"):
+                depth_tensor = self._load_depth_stack(
+                    depth_dir, Output_Width, Output_Height, Invert_Depth
+                )
+        with timer.stage("tensor_conversion"):
+            if depth_tensor is None:
+                depth_tensor = self._blank_image_stack(
+                    Num_Frames, Output_Width, Output_Height
+                )
+            else:
+                depth_tensor = self._expand_to_frame_indices(depth_tensor, depth_info)
+
         depth_info.setdefault("fbx_file", fbx_path)
         depth_info.setdefault("frame_mode", Frame_Mode)
         depth_info.setdefault("num_frames_requested", Num_Frames)
@@ -210,5 +358,12 @@ class FBX_Depth_Blender:
         depth_info.setdefault("zoom_factor", Zoom_Factor)
         depth_info.setdefault("view_mode", View_Mode)
         depth_info.setdefault("inverted", bool(Invert_Depth))
+        depth_info.setdefault("depth_engine", Depth_Engine)
+        depth_info.setdefault("transport", Transport if shm_tensor is not None else "PNG Files")
+        attach_timings(depth_info, timer, blender_seconds, prof, "fbx_depth_node")
+
+        if multipass_info is None:
+            # Everything is loaded, the job folder can go
+            finish_job_dir(out_dir)
 
         return (depth_tensor, json.dumps(depth_info))
@@ -1,7 +1,7 @@
-
 import os
 import json
-import subprocess
+
+from .fbx_blender_process import INTERRUPT_EXCEPTIONS, run_blender
 
 
 class FBX_Info:
@@ -115,7 +115,7 @@ class FBX_Info:
 
         return "Unknown"
 
-    def analyze_fbx(self, fbx_path, blender_path, video_fps_target):
+    async def analyze_fbx(self, fbx_path, blender_path, video_fps_target):
         raw_fbx = fbx_path.strip()
         raw_blender = blender_path.strip()
 
@@ -169,13 +169,9 @@ class FBX_Info:
         ]
 
         try:
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                check=False,
-            )
+            result = await run_blender(cmd, "FBX_Info_Blender")
+        except INTERRUPT_EXCEPTIONS:
+            raise
         except Exception as e:
             print(f"[FBX_Info_Blender] Failed to run Blender: {e}")
             debug = basic_debug()
@@ -0,0 +1,386 @@
+# CPU z-buffer rasterizer for the mesh frames written by fbx_depth_extract.py
+# (--depth_engine MESH). Blender only exports the mesh (baked vertices, or skin
+# data re-posed by fbx_skinning.py) + the per-frame ortho camera; depth /
+# normal / silhouette / edge maps are rasterised here with plain NumPy, so the
+# cost scales with triangles and pixels instead of Cycles samples, and frames
+# run in parallel on all cores.
+#
+# Camera conventions match the Blender render path exactly:
+#   - cam_rot columns are the camera axes in world space (looks down -Z, +Y up)
+#   - ortho_scale spans the larger image side (sensor fit AUTO)
+#   - depth is mist: linear from 0 to mist_depth, background = 1, then
+#     normalised per frame like the compositor Normalize node
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .fbx_skinning import skin_mesh_frames
+
+# Frames rasterised in parallel (NumPy releases the GIL in the heavy bits)
+RASTER_WORKERS = min(8, os.cpu_count() or 1)
+
+# Max pixel candidates handled per vectorised step, bounds the temp arrays
+RASTER_CHUNK = 1 << 20
+
+# Geometric edges: normal angle (degrees) counted as a crease, and depth jump
+# (in pixel widths) counted as an occlusion contour
+EDGE_CREASE_ANGLE = 45.0
+EDGE_DEPTH_PIXELS = 8.0
+
+# Depth output is snapped to the same 16-bit grid as the PNG render path
+DEPTH_LEVELS = 65535.0
+
+
+def load_mesh_frames(path):
+    """
+    Load the .npz written by export_mesh_frames into a plain dict. Skinned
+    exports are re-posed here, so "verts" [F, V, 3] is always present.
+    """
+    if not os.path.isfile(path):
+        return None
+    with np.load(path) as data:
+        mesh = {key: data[key] for key in data.files}
+    return skin_mesh_frames(mesh)
+
+
+def _next_pow2(values):
+    values = np.maximum(values, 1)
+    return (1 << np.ceil(np.log2(values)).astype(np.int64)).astype(np.int64)
+
+
+def project_vertices(verts, cam_loc, cam_rot, ortho_scale, width, height):
+    """
+    World [V, 3] -> (camera space [V, 3], screen [V, 3] as x_px, y_px, depth).
+    Screen y grows downwards like image rows.
+    """
+    cam = (np.asarray(verts, dtype=np.float64) - cam_loc) @ cam_rot
+    scale = max(width, height) / float(ortho_scale)
+
+    screen = np.empty_like(cam)
+    screen[:, 0] = cam[:, 0] * scale + width * 0.5
+    screen[:, 1] = height * 0.5 - cam[:, 1] * scale
+    screen[:, 2] = -cam[:, 2]
+    return cam, screen
+
+
+def rasterize(screen, tris, width, height, near=0.0, far=np.inf):
+    """
+    Z-buffer the triangles. screen: [V, 3] from project_vertices, tris: [T, 3].
+
+    Triangles are bucketed by (power-of-two) bbox size so each bucket tests a
+    dense [n, bh, bw] grid of pixel centres at once; the nearest candidate per
+    pixel wins via one sort instead of a per-pixel loop.
+
+    Returns (zbuf [H, W] float64 with inf for background, tri_id [H, W] int64
+    with -1 for background).
+    """
+    zbuf = np.full(height * width, np.inf, dtype=np.float64)
+    tri_id = np.full(height * width, -1, dtype=np.int64)
+    if len(tris) == 0:
+        return zbuf.reshape(height, width), tri_id.reshape(height, width)
+
+    tv = screen[tris]
+    x0, y0, d0 = tv[:, 0, 0], tv[:, 0, 1], tv[:, 0, 2]
+    x1, y1, d1 = tv[:, 1, 0], tv[:, 1, 1], tv[:, 1, 2]
+    x2, y2, d2 = tv[:, 2, 0], tv[:, 2, 1], tv[:, 2, 2]
+
+    area = (x1 - x0) * (y2 - y0) - (y1 - y0) * (x2 - x0)
+
+    # Pixel (i, j) is sampled at its centre (i + 0.5, j + 0.5)
+    with np.errstate(invalid="ignore"):
+        i_lo = np.ceil(np.minimum(np.minimum(x0, x1), x2) - 0.5)
+        i_hi = np.floor(np.maximum(np.maximum(x0, x1), x2) - 0.5)
+        j_lo = np.ceil(np.minimum(np.minimum(y0, y1), y2) - 0.5)
+        j_hi = np.floor(np.maximum(np.maximum(y0, y1), y2) - 0.5)
+
+        keep = np.isfinite(tv).all(axis=(1, 2)) & (np.abs(area) > 1e-12)
+        keep &= (i_hi >= 0) & (i_lo <= width - 1) & (j_hi >= 0) & (j_lo <= height - 1)
+        keep &= (np.maximum(np.maximum(d0, d1), d2) >= near)
+        keep &= (np.minimum(np.minimum(d0, d1), d2) <= far)
+
+    idx_all = np.nonzero(keep)[0]
+    if idx_all.size == 0:
+        return zbuf.reshape(height, width), tri_id.reshape(height, width)
+
+    i_lo = np.clip(i_lo[idx_all], 0, width - 1).astype(np.int64)
+    i_hi = np.clip(i_hi[idx_all], 0, width - 1).astype(np.int64)
+    j_lo = np.clip(j_lo[idx_all], 0, height - 1).astype(np.int64)
+    j_hi = np.clip(j_hi[idx_all], 0, height - 1).astype(np.int64)
+
+    bw = _next_pow2(i_hi - i_lo + 1)
+    bh = _next_pow2(j_hi - j_lo + 1)
+    buckets, bucket_of = np.unique(bw * (1 << 32) + bh, return_inverse=True)
+
+    cand_pix = []
+    cand_d = []
+    cand_tri = []
+
+    for b, key in enumerate(buckets):
+        gw = int(key >> 32)
+        gh = int(key & 0xFFFFFFFF)
+        members = np.nonzero(bucket_of == b)[0]
+        step = max(1, RASTER_CHUNK // (gw * gh))
+        ox = np.arange(gw, dtype=np.int64)[None, None, :]
+        oy = np.arange(gh, dtype=np.int64)[None, :, None]
+
+        for start in range(0, members.size, step):
+            m = members[start:start + step]
+            t = idx_all[m]
+
+            px = i_lo[m][:, None, None] + ox
+            py = j_lo[m][:, None, None] + oy
+            inside = (px <= i_hi[m][:, None, None]) & (py <= j_hi[m][:, None, None])
+
+            sx = px + 0.5
+            sy = py + 0.5
+
+            ax, ay = x0[t][:, None, None], y0[t][:, None, None]
+            bx, by = x1[t][:, None, None], y1[t][:, None, None]
+            cx, cy = x2[t][:, None, None], y2[t][:, None, None]
+            inv_area = (1.0 / area[t])[:, None, None]
+
+            w0 = ((cx - bx) * (sy - by) - (cy - by) * (sx - bx)) * inv_area
+            w1 = ((ax - cx) * (sy - cy) - (ay - cy) * (sx - cx)) * inv_area
+            w2 = 1.0 - w0 - w1
+            inside &= (w0 >= 0.0) & (w1 >= 0.0) & (w2 >= 0.0)
+
+            # Ortho camera: depth is affine in screen space, no perspective fix
+            d = (
+                w0 * d0[t][:, None, None]
+                + w1 * d1[t][:, None, None]
+                + w2 * d2[t][:, None, None]
+            )
+            inside &= (d >= near) & (d <= far)
+
+            n, r, c = np.nonzero(inside)
+            if n.size == 0:
+                continue
+            cand_pix.append(py[n, r, 0] * width + px[n, 0, c])
+            cand_d.append(d[n, r, c])
+            cand_tri.append(t[n])
+
+    if not cand_pix:
+        return zbuf.reshape(height, width), tri_id.reshape(height, width)
+
+    pix = np.concatenate(cand_pix)
+    dep = np.concatenate(cand_d)
+    tri = np.concatenate(cand_tri)
+
+    # Nearest candidate per pixel = first after sorting by (pixel, depth)
+    order = np.lexsort((dep, pix))
+    pix = pix[order]
+    first = np.ones(pix.size, dtype=bool)
+    first[1:] = pix[1:] != pix[:-1]
+    win = order[first]
+
+    zbuf[pix[first]] = dep[win]
+    tri_id[pix[first]] = tri[win]
+    return zbuf.reshape(height, width), tri_id.reshape(height, width)
+
+
+def vertex_normals(cam_verts, tris):
+    """Area-weighted smooth vertex normals (camera space), [V, 3] unit length."""
+    v0 = cam_verts[tris[:, 0]]
+    v1 = cam_verts[tris[:, 1]]
+    v2 = cam_verts[tris[:, 2]]
+    face_n = np.cross(v1 - v0, v2 - v0)
+    face_n = np.nan_to_num(face_n)
+
+    flat = tris.ravel()
+    count = cam_verts.shape[0]
+    normals = np.empty((count, 3), dtype=np.float64)
+    for axis in range(3):
+        normals[:, axis] = np.bincount(
+            flat, weights=np.repeat(face_n[:, axis], 3), minlength=count
+        )
+
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    return normals / np.maximum(length, 1e-12)
+
+
+def _pixel_normals(screen, cam_verts, tris, tri_id):
+    """
+    Smooth camera-space normals interpolated at each covered pixel, flipped
+    to face the camera (two-sided). Returns [H, W, 3], zeros on background.
+    """
+    height, width = tri_id.shape
+    out = np.zeros((height, width, 3), dtype=np.float64)
+    rows, cols = np.nonzero(tri_id >= 0)
+    if rows.size == 0:
+        return out
+
+    t = tris[tri_id[rows, cols]]
+    sx = cols + 0.5
+    sy = rows + 0.5
+
+    a = screen[t[:, 0]]
+    b = screen[t[:, 1]]
+    c = screen[t[:, 2]]
+    area = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+    w0 = ((c[:, 0] - b[:, 0]) * (sy - b[:, 1]) - (c[:, 1] - b[:, 1]) * (sx - b[:, 0])) / area
+    w1 = ((a[:, 0] - c[:, 0]) * (sy - c[:, 1]) - (a[:, 1] - c[:, 1]) * (sx - c[:, 0])) / area
+    w2 = 1.0 - w0 - w1
+
+    vn = vertex_normals(cam_verts, tris)
+    n = w0[:, None] * vn[t[:, 0]] + w1[:, None] * vn[t[:, 1]] + w2[:, None] * vn[t[:, 2]]
+    n /= np.maximum(np.linalg.norm(n, axis=1, keepdims=True), 1e-12)
+
+    n[n[:, 2] < 0.0] *= -1.0
+
+    out[rows, cols] = n
+    return out
+
+
+def _pixel_face_normals(cam_verts, tris, tri_id):
+    """Flat (per-triangle) camera-facing normals per pixel, [H, W, 3]."""
+    v0 = cam_verts[tris[:, 0]]
+    face_n = np.cross(cam_verts[tris[:, 1]] - v0, cam_verts[tris[:, 2]] - v0)
+    face_n /= np.maximum(np.linalg.norm(face_n, axis=1, keepdims=True), 1e-12)
+    face_n[face_n[:, 2] < 0.0] *= -1.0
+
+    out = np.zeros(tri_id.shape + (3,), dtype=np.float64)
+    covered = tri_id >= 0
+    out[covered] = face_n[tri_id[covered]]
+    return out
+
+
+def _normal_map(normals, tri_id):
+    """Encode as rgb = n * 0.5 + 0.5 (x right, y up, z towards the camera). Background 0."""
+    out = (normals * 0.5 + 0.5).astype(np.float32)
+    out[tri_id < 0] = 0.0
+    return out
+
+
+def edge_map(zbuf, tri_id, normals, pixel_size, crease_angle=EDGE_CREASE_ANGLE):
+    """
+    Geometric line art without a render: a pixel is an edge where it differs
+    from its right or lower neighbour by coverage (silhouette), by a depth
+    jump of more than EDGE_DEPTH_PIXELS pixel widths (occlusion contour) or
+    by a normal angle above crease_angle degrees (crease). One-sided
+    differences keep the lines 1px wide like Canny output. Returns [H, W] 0/1.
+    """
+    covered = tri_id >= 0
+    depth_jump = EDGE_DEPTH_PIXELS * pixel_size
+    cos_crease = np.cos(np.radians(crease_angle))
+
+    edges = np.zeros(tri_id.shape, dtype=bool)
+    for axis in (0, 1):
+        head = [slice(None), slice(None)]
+        tail = [slice(None), slice(None)]
+        head[axis] = slice(None, -1)
+        tail[axis] = slice(1, None)
+        head = tuple(head)
+        tail = tuple(tail)
+
+        cov_a = covered[head]
+        cov_b = covered[tail]
+        both = cov_a & cov_b
+
+        diff = cov_a != cov_b
+        with np.errstate(invalid="ignore"):
+            diff |= both & (np.abs(zbuf[head] - zbuf[tail]) > depth_jump)
+        dots = np.einsum("ijk,ijk->ij", normals[head], normals[tail])
+        diff |= both & (dots < cos_crease)
+
+        # Mark the nearer (covered) side so silhouettes sit on the mesh
+        mark_a = diff & (cov_a & (~cov_b | (zbuf[head] <= zbuf[tail])))
+        mark_b = diff & ~mark_a
+        edges[head] |= mark_a
+        edges[tail] |= mark_b
+
+    return edges.astype(np.float32)
+
+
+def mist_from_zbuf(zbuf, mist_depth):
+    """
+    Mist pass (start 0, linear falloff, background 1) followed by the
+    Normalize node, snapped to 16-bit. 0 = nearest surface, 1 = farthest/bg.
+    """
+    covered = np.isfinite(zbuf)
+    mist = np.ones(zbuf.shape, dtype=np.float64)
+    if mist_depth > 0.0:
+        mist[covered] = np.clip(zbuf[covered] / mist_depth, 0.0, 1.0)
+    else:
+        mist[covered] = 0.0
+
+    lo = mist.min()
+    hi = mist.max()
+    if hi - lo <= 1e-12:
+        return np.zeros(zbuf.shape, dtype=np.float32)
+
+    norm = (mist - lo) / (hi - lo)
+    return (np.round(norm * DEPTH_LEVELS) / DEPTH_LEVELS).astype(np.float32)
+
+
+def render_mesh_frame(mesh, index, width, height, passes=("depth",), crease_angle=EDGE_CREASE_ANGLE):
+    """
+    Rasterise frame `index` of a load_mesh_frames() dict.
+    Returns {pass_name: array}: depth [H, W], normal [H, W, 3],
+    silhouette [H, W], edges [H, W].
+    """
+    cam, screen = project_vertices(
+        mesh["verts"][index],
+        mesh["cam_loc"][index],
+        mesh["cam_rot"][index],
+        mesh["ortho_scale"][index],
+        width,
+        height,
+    )
+    tris = mesh["tris"]
+    zbuf, tri_id = rasterize(
+        screen,
+        tris,
+        width,
+        height,
+        near=float(mesh["clip_start"][index]),
+        far=float(mesh["clip_end"][index]),
+    )
+
+    result = {}
+    if "depth" in passes:
+        result["depth"] = mist_from_zbuf(zbuf, float(mesh["mist_depth"][index]))
+    if "normal" in passes:
+        normals = _pixel_normals(screen, cam, tris, tri_id)
+        result["normal"] = _normal_map(normals, tri_id)
+    if "edges" in passes:
+        # Creases are between faces, so compare flat normals, not smoothed ones
+        pixel_size = float(mesh["ortho_scale"][index]) / max(width, height)
+        face_normals = _pixel_face_normals(cam, tris, tri_id)
+        result["edges"] = edge_map(zbuf, tri_id, face_normals, pixel_size, crease_angle)
+    if "silhouette" in passes:
+        result["silhouette"] = (tri_id >= 0).astype(np.float32)
+    return result
+
+
+def render_mesh_frames(
+    mesh,
+    width,
+    height,
+    passes=("depth",),
+    workers=RASTER_WORKERS,
+    crease_angle=EDGE_CREASE_ANGLE,
+):
+    """
+    Rasterise every exported frame in a thread pool, straight into
+    preallocated [F, H, W] / [F, H, W, 3] float32 stacks.
+    """
+    count = int(mesh["verts"].shape[0])
+    shapes = {
+        "depth": (count, height, width),
+        "normal": (count, height, width, 3),
+        "silhouette": (count, height, width),
+        "edges": (count, height, width),
+    }
+    stacks = {name: np.empty(shapes[name], dtype=np.float32) for name in passes}
+
+    def _run(index):
+        frame = render_mesh_frame(mesh, index, width, height, passes, crease_angle)
+        for name, arr in frame.items():
+            stacks[name][index] = arr
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(_run, range(count)))
+
+    return stacks
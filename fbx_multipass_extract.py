@@ -0,0 +1,284 @@
+# One Blender job for the whole ControlNet stack: imports the FBX once, walks
+# the frame list once and writes pose joints, mist depth and RGB (for canny)
+# from a single render per frame. Frame selection, joint extraction, camera
+# framing and the depth compositor all come from the single-pass scripts so
+# the outputs match what FBX_Extraction / FBX_Depth_Blender would produce.
+# That includes the frame range: pose frames span the armature's action like
+# fbx_pose_extract.py, the rendered passes span the reference object's (mesh
+# first) like fbx_depth_extract.py, and the walk covers both.
+import bpy
+import sys
+import os
+import json
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:
+    sys.path.append(_HERE)
+
+from fbx_pose_extract import (
+    build_pose_bone_map,
+    compute_frames,
+    extract_frame_joints,
+    find_armature,
+)
+from fbx_depth_extract import (
+    MESH_FRAMES_FILE,
+    export_mesh_frames,
+    find_ref_object,
+    frame_camera_params,
+    get_action_and_range,
+    key_camera_for_frame,
+    render_depth_frames,
+    setup_depth_render,
+    _set_constant_interpolation,
+)
+from fbx_shm import apply_standard_view
+from fbx_timing import StageTimer, dump_profile, start_profile
+
+VALID_PASSES = ("pose", "depth", "rgb", "mesh")
+
+
+def parse_args():
+    argv = sys.argv
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    else:
+        argv = []
+
+    args = {
+        "fbx": "",
+        "out": "",
+        "frame_mode": "Frame_Spread_TotalAnim",
+        "num_frames": 24,
+        "start_frame": 0,
+        "end_frame": 100,
+        "frame_step": 1,
+        "out_width": 512,
+        "out_height": 512,
+        "zoom_factor": 1.0,
+        "view_mode": "Front",
+        "depth_engine": "CYCLES",
+        "passes": "pose,depth,rgb",
+    }
+
+    key = None
+    for item in argv:
+        if item.startswith("--"):
+            key = item[2:]
+        else:
+            if key in args:
+                if key in ["num_frames", "start_frame", "end_frame", "frame_step", "out_width", "out_height"]:
+                    args[key] = int(item)
+                elif key == "zoom_factor":
+                    args[key] = float(item)
+                else:
+                    args[key] = item
+            key = None
+
+    valid_views = {"Front", "Back", "Left_Side", "Right_Side", "Top", "Auto_Rotate"}
+    if args["view_mode"] not in valid_views:
+        args["view_mode"] = "Front"
+
+    if args["depth_engine"] not in ("CYCLES", "EEVEE", "MESH"):
+        args["depth_engine"] = "CYCLES"
+
+    args["passes"] = [p for p in args["passes"].split(",") if p in VALID_PASSES]
+
+    return args
+
+
+def frame_range(args, obj):
+    """Requested frames over obj's action range (scene range without one)."""
+    _action, f_start, f_end = get_action_and_range(obj)
+    frame_indices = compute_frames(args, f_start, f_end)
+    return {
+        "frame_indices": frame_indices,
+        "rendered_frames": sorted(set(frame_indices)),
+        "frame_start": f_start,
+        "frame_end": f_end,
+    }
+
+
+def add_rgb_output(scene, rgb_dir):
+    """Second File Output on the depth compositor tree: the beauty pass as 8-bit RGB."""
+    tree = scene.node_tree
+    rl = None
+    for node in tree.nodes:
+        if node.bl_idname == "CompositorNodeRLayers":
+            rl = node
+            break
+    if rl is None:
+        return
+
+    rgb_dir_abs = os.path.abspath(rgb_dir)
+    os.makedirs(rgb_dir_abs, exist_ok=True)
+
+    out = tree.nodes.new("CompositorNodeOutputFile")
+    out.location = (400, -200)
+    out.base_path = rgb_dir_abs
+    out.file_slots[0].path = "rgb_"
+    out.format.file_format = "PNG"
+    out.format.color_mode = "RGB"
+    out.format.color_depth = "8"
+    # Same display transform as fbx_canny_extract.py, but only on this output:
+    # the depth PNGs keep the scene settings the standalone depth script uses
+    if hasattr(out.format, "color_management"):
+        out.format.color_management = "OVERRIDE"
+        apply_standard_view(out.format.view_settings)
+    else:
+        print("FBX Multipass: this Blender can't override colour management per output, "
+              "RGB frames use the scene view transform")
+
+    tree.links.new(rl.outputs["Image"], out.inputs[0])
+
+
+def main():
+    timer = StageTimer()
+    prof = start_profile()
+    args = parse_args()
+
+    fbx_path = args["fbx"]
+    out_dir = args["out"]
+    passes = args["passes"]
+
+    if not fbx_path or not os.path.isfile(fbx_path):
+        print("ERROR: FBX file missing or invalid:", fbx_path)
+        return
+
+    if not out_dir:
+        print("ERROR: Output folder not specified.")
+        return
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    with timer.stage("factory_reset"):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+    with timer.stage("fbx_import"):
+        bpy.ops.import_scene.fbx(filepath=fbx_path)
+
+    arm = find_armature()
+    ref_obj = find_ref_object()
+    if ref_obj is None:
+        print("ERROR: No armature or mesh found in FBX.")
+        return
+    if "pose" in passes and arm is None:
+        print("ERROR: No armature found in FBX.")
+        return
+
+    scene = bpy.context.scene
+    engine = args["depth_engine"]
+
+    want_mesh = "mesh" in passes or ("depth" in passes and engine == "MESH")
+    want_render = "rgb" in passes or ("depth" in passes and engine != "MESH")
+    if want_mesh and "mesh" not in passes:
+        passes.append("mesh")
+
+    # Each pass gets the frame list its standalone script would pick
+    pass_frames = {}
+    pose_range = render_range = None
+    if "pose" in passes:
+        pose_range = frame_range(args, arm)
+        pass_frames["pose"] = pose_range
+    if want_render or want_mesh:
+        render_range = frame_range(args, ref_obj)
+        for name in ("depth", "rgb", "mesh"):
+            if name in passes:
+                pass_frames[name] = render_range
+    pose_frames = set(pose_range["rendered_frames"]) if pose_range else set()
+    render_frames = set(render_range["rendered_frames"]) if render_range else set()
+
+    setup = None
+    if want_render:
+        with timer.stage("render_setup"):
+            setup = setup_depth_render(
+                scene,
+                args["out_width"],
+                args["out_height"],
+                os.path.join(out_dir, "depth"),
+                out_dir,
+                "EEVEE" if engine == "EEVEE" else "CYCLES",
+            )
+            if setup is not None and "rgb" in passes:
+                add_rgb_output(scene, os.path.join(out_dir, "rgb"))
+
+    pbone_map, found_joints, missing_joints = ({}, [], [])
+    if "pose" in passes:
+        with timer.stage("bone_mapping"):
+            pbone_map, found_joints, missing_joints = build_pose_bone_map(arm)
+
+    # The single walk over the frames: joints + camera keys per distinct frame
+    joints_by_frame = {}
+    for f in sorted(pose_frames | render_frames):
+        t0 = time.perf_counter()
+        scene.frame_set(f)
+        bpy.context.view_layer.update()
+
+        if f in pose_frames:
+            joints_by_frame[f] = extract_frame_joints(arm, pbone_map, timer)
+
+        if setup is not None and f in render_frames:
+            cam, world = setup
+            params = frame_camera_params(ref_obj, args["zoom_factor"], args["view_mode"])
+            key_camera_for_frame(cam, world, f, params)
+        timer.sample("frame_eval", time.perf_counter() - t0)
+
+    if setup is not None:
+        cam, world = setup
+        _set_constant_interpolation(cam, cam.data, world)
+        # Render + PNG write of every pass
+        with timer.stage("render"):
+            render_depth_frames(scene, render_range["rendered_frames"])
+
+    if want_mesh:
+        with timer.stage("mesh_export"):
+            export_mesh_frames(
+                scene,
+                render_range["rendered_frames"],
+                lambda: frame_camera_params(ref_obj, args["zoom_factor"], args["view_mode"]),
+                os.path.join(out_dir, MESH_FRAMES_FILE),
+            )
+
+    if "pose" in passes:
+        data = {
+            "fbx_file": os.path.abspath(fbx_path),
+            "frame_indices": pose_range["frame_indices"],
+            "frames": [
+                {"frame_index": int(f), "joints": joints_by_frame[f]}
+                for f in pose_range["frame_indices"]
+            ],
+        }
+        with timer.stage("file_write"):
+            with open(os.path.join(out_dir, "joint_data.json"), "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+
+    # Consumers read their own pass's entry (multipass_output on the node side)
+    frame_info = {
+        "fbx_file": os.path.abspath(fbx_path),
+        "pass_frames": pass_frames,
+        "frame_mode": args["frame_mode"],
+        "num_frames": args["num_frames"],
+        "start_frame_arg": args["start_frame"],
+        "end_frame_arg": args["end_frame"],
+        "frame_step": args["frame_step"],
+        "out_width": args["out_width"],
+        "out_height": args["out_height"],
+        "zoom_factor": args["zoom_factor"],
+        "view_mode": args["view_mode"],
+        "depth_engine": engine,
+        "passes": passes,
+        "found_joints": found_joints,
+        "missing_joints": missing_joints,
+    }
+    profile_path = dump_profile(prof, "fbx_multipass_extract")
+    if profile_path:
+        frame_info["profile"] = profile_path
+    frame_info["timings"] = timer.summary()
+    with open(os.path.join(out_dir, "multipass_info.json"), "w", encoding="utf-8") as f:
+        json.dump(frame_info, f, indent=2)
+
+    print("FBX multipass extraction complete.")
+
+
+if __name__ == "__main__":
+    main()
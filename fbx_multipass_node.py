@@ -0,0 +1,220 @@
+# FBX_Multipass_Blender: runs fbx_multipass_extract.py once and hands the
+# result to FBX_Extraction / FBX_Depth_Blender / FBX_Canny_Blender through
+# their optional Multipass input, so a full pose + depth + canny stack costs
+# one Blender import and one render per frame instead of three.
+
+import os
+import json
+
+from .fbx_blender_process import run_blender
+from .fbx_depth_node import DEPTH_ENGINES
+from .fbx_scratch import new_job_dir, pin_job_dir, pinned_job_dir, touch_job_dir, unpin_job_dir
+from .fbx_timing import StageTimer, attach_timings, start_profile
+
+# node id -> bumped whenever that node's pinned output folder went missing,
+# so IS_CHANGED makes ComfyUI run it again instead of serving the dead result
+_generations = {}
+
+
+def multipass_output(multipass, needed_pass, node_label):
+    """
+    Return (out_dir, info dict copy) of a FBX_MULTIPASS result, or raise if
+    the job was run without the pass this node needs. The copy carries that
+    pass's frame list (frame_indices / rendered_frames / frame_start /
+    frame_end) at the top level, like the standalone script's info.
+    """
+    passes = multipass.get("info", {}).get("passes", [])
+    if needed_pass not in passes:
+        raise RuntimeError(
+            f"{node_label}: Multipass input was run without the '{needed_pass}' pass.\n"
+            f"Passes available: {', '.join(passes) or 'none'}"
+        )
+    out_dir = multipass["out_dir"]
+    if not os.path.isdir(out_dir):
+        raise RuntimeError(
+            f"{node_label}: Multipass output folder no longer exists (deleted outside this "
+            f"ComfyUI process), queue the prompt again to re-run FBX Multipass (Blender).\n{out_dir}"
+        )
+    # Consumers reading it count as use, the janitor trims least recently used first
+    touch_job_dir(out_dir)
+    info = dict(multipass["info"])
+    info.update(info.get("pass_frames", {}).get(needed_pass, {}))
+    return out_dir, info
+
+
+class FBX_Multipass_Blender:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "Blender_Executable": (
+                    "STRING",
+                    {
+                        "default": "C:\\Program Files\\Blender Foundation\\Blender 3.6\\blender.exe",
+                        "multiline": False,
+                    },
+                ),
+                "FBX_File": ("STRING", {"default": "", "multiline": False}),
+                "Frame_Mode": (
+                    ["Frame_Spread_TotalAnim", "Frame_Range"],
+                    {"default": "Frame_Spread_TotalAnim"},
+                ),
+                "Num_Frames": ("INT", {"default": 81, "min": 1, "max": 9999}),
+                "Start_Frame": ("INT", {"default": 0, "min": 0, "max": 999999}),
+                "End_Frame": ("INT", {"default": 500, "min": 0, "max": 999999}),
+                "Frame_Step": ("INT", {"default": 1, "min": 1, "max": 9999}),
+                "Output_Width": ("INT", {"default": 512, "min": 64, "max": 4096}),
+                "Output_Height": ("INT", {"default": 512, "min": 64, "max": 4096}),
+                "Zoom_Factor": ("FLOAT", {"default": 1.0, "min": 0.1, "max": 20.0, "step": 0.1}),
+                "View_Mode": (
+                    ["Front", "Back", "Left_Side", "Right_Side", "Top", "Auto_Rotate"],
+                    {"default": "Front"},
+                ),
+                "Depth_Engine": (
+                    list(DEPTH_ENGINES.keys()),
+                    {"default": "Cycles (Mist)"},
+                ),
+                "Pose_Pass": ("BOOLEAN", {"default": True}),
+                "Depth_Pass": ("BOOLEAN", {"default": True}),
+                # RGB frames for FBX_Canny_Blender (Cycles RGB + Canny source)
+                "RGB_Pass": ("BOOLEAN", {"default": True}),
+                # Mesh export for NumPy depth / Mesh Geometry edges
+                "Mesh_Pass": ("BOOLEAN", {"default": False}),
+            },
+            "hidden": {"unique_id": "UNIQUE_ID"},
+        }
+
+    RETURN_TYPES = ("FBX_MULTIPASS", "STRING",)
+    RETURN_NAMES = ("Multipass", "Multipass_Info",)
+    FUNCTION = "run_multipass"
+    CATEGORY = "Animation/FBX_Clivey"
+
+    @classmethod
+    def IS_CHANGED(cls, unique_id=None, **kwargs):
+        # The output folder is pinned (see fbx_scratch) but can still be
+        # deleted by hand or by another process's janitor
+        out_dir = pinned_job_dir(unique_id)
+        if out_dir is not None and not os.path.isdir(out_dir):
+            _generations[unique_id] = _generations.get(unique_id, 0) + 1
+            unpin_job_dir(unique_id)
+        return _generations.get(unique_id, 0)
+
+    def _get_script_path(self):
+        here = os.path.dirname(os.path.abspath(__file__))
+        path = os.path.join(here, "fbx_multipass_extract.py")
+        if not os.path.isfile(path):
+            raise RuntimeError(
+                f"FBX Multipass (Blender): fbx_multipass_extract.py not found:\n{path}"
+            )
+        return path
+
+    async def run_multipass(
+        self,
+        Blender_Executable,
+        FBX_File,
+        Frame_Mode,
+        Num_Frames,
+        Start_Frame,
+        End_Frame,
+        Frame_Step,
+        Output_Width,
+        Output_Height,
+        Zoom_Factor,
+        View_Mode,
+        Depth_Engine,
+        Pose_Pass,
+        Depth_Pass,
+        RGB_Pass,
+        Mesh_Pass,
+        unique_id=None,
+    ):
+        blender_exe = Blender_Executable.strip().strip('"')
+        if not blender_exe or not os.path.isfile(blender_exe):
+            raise RuntimeError(
+                f"FBX Multipass (Blender): Blender executable not found:\n{blender_exe}"
+            )
+
+        fbx_path = FBX_File.strip().strip('"')
+        if not fbx_path or not os.path.isfile(fbx_path):
+            raise RuntimeError(
+                f"FBX Multipass (Blender): FBX file not found:\n{fbx_path}"
+            )
+
+        passes = [
+            name for name, on in (
+                ("pose", Pose_Pass),
+                ("depth", Depth_Pass),
+                ("rgb", RGB_Pass),
+                ("mesh", Mesh_Pass),
+            ) if on
+        ]
+        if not passes:
+            raise RuntimeError("FBX Multipass (Blender): no passes enabled.")
+
+        timer = StageTimer()
+        prof = start_profile()
+        script_path = self._get_script_path()
+
+        if Frame_Mode == "Frame_Spread_TotalAnim":
+            if End_Frame <= Start_Frame:
+                End_Frame = Start_Frame + max(Num_Frames - 1, 0)
+        else:
+            if End_Frame < Start_Frame:
+                End_Frame = Start_Frame
+
+        out_dir = new_job_dir("fbx_pose_blender_multipass")
+
+        args = [
+            blender_exe,
+            "-b",
+            "-P", script_path,
+            "--",
+            "--fbx", fbx_path,
+            "--out", out_dir,
+            "--frame_mode", Frame_Mode,
+            "--num_frames", str(Num_Frames),
+            "--start_frame", str(Start_Frame),
+            "--end_frame", str(End_Frame),
+            "--frame_step", str(Frame_Step),
+            "--out_width", str(Output_Width),
+            "--out_height", str(Output_Height),
+            "--zoom_factor", str(Zoom_Factor),
+            "--view_mode", View_Mode,
+            "--depth_engine", DEPTH_ENGINES.get(Depth_Engine, "CYCLES"),
+            "--passes", ",".join(passes),
+        ]
+
+        result = await run_blender(args, "FBX Multipass (Blender)")
+
+        if result.returncode != 0:
+            raise RuntimeError(
+                "FBX Multipass (Blender): Blender multipass extractor failed.\n"
+                f"Command: {' '.join(args)}\n"
+                f"STDOUT:\n{result.stdout}\n"
+                f"STDERR:\n{result.stderr}\n"
+            )
+
+        info_path = os.path.join(out_dir, "multipass_info.json")
+        if not os.path.isfile(info_path):
+            raise RuntimeError(
+                "FBX Multipass (Blender): multipass_info.json not produced by Blender script.\n"
+                f"Output dir: {out_dir}\n"
+                f"STDOUT:\n{result.stdout}\n"
+                f"STDERR:\n{result.stderr}\n"
+            )
+        with timer.stage("json_load"):
+            with open(info_path, "r", encoding="utf-8") as f:
+                info = json.load(f)
+
+        info.setdefault("fbx_file", fbx_path)
+        info.setdefault("num_frames_requested", Num_Frames)
+        info["depth_engine_label"] = Depth_Engine
+        attach_timings(info, timer, result.seconds, prof, "fbx_multipass_node")
+
+        # The folder outlives this node (consumers read it later, and again when
+        # ComfyUI re-runs them against this node's cached output), so it stays
+        # pinned until this node produces its next result
+        pin_job_dir(out_dir, unique_id)
+
+        multipass = {"out_dir": out_dir, "info": info}
+        return (multipass, json.dumps(info))
@@ -1,3 +1,8 @@
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
 # Grouping for basic OpenPose-style colors
 JOINT_GROUPS = {
     "hips": "torso",
@@ -157,3 +162,81 @@ def get_segment_color(jname_a: str, jname_b: str, color_mode: str):
     g = (col_a[1] + col_b[1]) // 2
     b = (col_a[2] + col_b[2]) // 2
     return (r, g, b)
+
+
+# Fixed joint layout used to index the palette arrays and the shared-memory
+# joint block. Same order the Blender extractor emits joints for a rig without
+# face bones (the usual case): the CANONICAL_JOINTS body / finger bones, then
+# nose, eyes and ears as _ensure_face_joints_3d adds them, then its face
+# clusters. A rig that does have eye / ear bones emits those in CANONICAL_JOINTS
+# order instead, so the shared-memory path restores the rig's own order from
+# frame_info["joint_order"] (dict order is the dot draw order).
+POSE_JOINT_NAMES = (
+    [
+        "hips", "spine", "chest", "neck", "head",
+        "left_shoulder", "left_elbow", "left_wrist",
+        "right_shoulder", "right_elbow", "right_wrist",
+        "left_hip", "left_knee", "left_ankle",
+        "right_hip", "right_knee", "right_ankle",
+        "left_thumb_base", "left_thumb_tip",
+        "left_index_base", "left_index_tip",
+        "left_middle_base", "left_middle_tip",
+        "left_ring_base", "left_ring_tip",
+        "left_pinky_base", "left_pinky_tip",
+        "right_thumb_base", "right_thumb_tip",
+        "right_index_base", "right_index_tip",
+        "right_middle_base", "right_middle_tip",
+        "right_ring_base", "right_ring_tip",
+        "right_pinky_base", "right_pinky_tip",
+        "nose", "left_eye", "right_eye", "left_ear", "right_ear",
+    ]
+    + [f"nose_dot_{i}" for i in range(6)]
+    + [f"eye_L_{i}" for i in range(5)]
+    + [f"eye_R_{i}" for i in range(5)]
+    + [f"mouth_{i}" for i in range(8)]
+    + [f"chin_{i}" for i in range(11)]
+)
+
+POSE_JOINT_INDEX = {name: idx for idx, name in enumerate(POSE_JOINT_NAMES)}
+
+
+# Palette compiled once per (color_mode, segment list):
+#   joint_colors   uint8 [J, 3] aligned to POSE_JOINT_NAMES
+#   segment_colors uint8 [S, 3] aligned to the segment list passed in
+#   joint_fills / segment_fills are the same colours as plain tuples for PIL.
+# Any joint not in POSE_JOINT_NAMES has no group, so it is white in every mode.
+PosePalette = namedtuple(
+    "PosePalette",
+    ["joint_colors", "segment_colors", "joint_fills", "segment_fills"],
+)
+
+
+@lru_cache(maxsize=None)
+def get_palette(color_mode: str, segments=()):
+    """
+    segments: tuple of (joint_a, joint_b) pairs (must be hashable).
+    """
+    joint_colors = np.array(
+        [get_joint_color(jname, color_mode) for jname in POSE_JOINT_NAMES],
+        dtype=np.uint8,
+    )
+
+    if color_mode == "White":
+        segment_colors = np.full((len(segments), 3), 255, dtype=np.uint8)
+    elif segments:
+        col_a = np.array([get_joint_color(a, color_mode) for a, _ in segments], dtype=np.uint16)
+        col_b = np.array([get_joint_color(b, color_mode) for _, b in segments], dtype=np.uint16)
+        segment_colors = ((col_a + col_b) // 2).astype(np.uint8)
+    else:
+        segment_colors = np.zeros((0, 3), dtype=np.uint8)
+
+    joint_colors.setflags(write=False)
+    segment_colors.setflags(write=False)
+
+    joint_fills = {
+        jname: tuple(int(c) for c in joint_colors[idx])
+        for jname, idx in POSE_JOINT_INDEX.items()
+    }
+    segment_fills = [tuple(int(c) for c in row) for row in segment_colors]
+
+    return PosePalette(joint_colors, segment_colors, joint_fills, segment_fills)
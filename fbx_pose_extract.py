@@ -6,9 +6,24 @@ import os
 import json
 from mathutils import Vector
 import math
+import time
+
+# Blender doesn't put the -P script's folder on sys.path; the helper modules live there
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:
+    sys.path.append(_HERE)
+
+from fbx_timing import StageTimer, dump_profile, start_profile
 
 
 _FACE_PREV_FWD = None
+
+# Stream transport: one line per record on stdout, prefix + JSON. The header
+# carries the frame count, then one frame record per evaluated frame.
+STREAM_HEADER_PREFIX = "@FBX_FRAMES "
+STREAM_FRAME_PREFIX = "@FBX_FRAME "
+
+
 def parse_args():
     argv = sys.argv
     if "--" in argv:
@@ -24,6 +39,13 @@ def parse_args():
         "start_frame": 0,
         "end_frame": 100,
         "frame_step": 1,
+        # Shared-memory transport: comma separated joint names (the node's
+        # POSE_JOINT_NAMES), block name and frame capacity
+        "joint_layout": "",
+        "shm_name": "",
+        "shm_frames": 0,
+        # 1 = print each frame's joints on stdout as soon as it is evaluated
+        "stream": 0,
     }
 
     key = None
@@ -32,7 +54,7 @@ def parse_args():
             key = item[2:]
         else:
             if key in args:
-                if key in ["num_frames", "start_frame", "end_frame", "frame_step"]:
+                if key in ["num_frames", "start_frame", "end_frame", "frame_step", "shm_frames", "stream"]:
                     args[key] = int(item)
                 else:
                     args[key] = item
@@ -719,7 +741,75 @@ def _ensure_face_joints_3d(joints_vec):
              jaw_right * (t * t))
         joints_vec[f"chin_{i}"] = p
 
+def extract_frame_joints(arm, pbone_map, timer=None):
+    """World-space joints (+ generated face points) for the current frame."""
+    joints_vec = {}
+    for cname in CANONICAL_JOINTS:
+        pbone = pbone_map.get(cname)
+        if pbone is None:
+            continue
+        world_pos = arm.matrix_world @ pbone.head
+        joints_vec[cname] = world_pos
+
+    t0 = time.perf_counter()
+    _ensure_face_joints_3d(joints_vec)
+    if timer is not None:
+        timer.add("face_synthesis", time.perf_counter() - t0)
+
+    joints = {}
+    for cname, v in joints_vec.items():
+        joints[cname] = [float(v.x), float(v.y), float(v.z)]
+    return joints
+
+
+def evaluate_frame(scene, f, arm, pbone_map, timer=None):
+    """Set the scene to frame f and return its joints (timed as one frame_eval sample)."""
+    t0 = time.perf_counter()
+    scene.frame_set(f)
+    bpy.context.view_layer.update()
+    joints = extract_frame_joints(arm, pbone_map, timer)
+    if timer is not None:
+        timer.sample("frame_eval", time.perf_counter() - t0)
+    return joints
+
+
+def write_joints_to_shm(scene, arm, pbone_map, frames, shm_name, capacity, layout, timer=None):
+    """
+    Shared-memory transport: write each frame's joints straight into the
+    node's float32 [capacity, len(layout), 3] block (NaN = joint missing).
+    Returns (frames written, joint names in the order this rig produces them);
+    the block is in layout order, the node needs the rig's order back because
+    it is the dot draw order on the JSON / stream paths.
+    """
+    import numpy as np
+
+    from fbx_shm import attach_block, release_block
+
+    index = {name: j for j, name in enumerate(layout)}
+    shm, block = attach_block(shm_name, (capacity, len(layout), 3), np.float32)
+    count = 0
+    joint_order = []
+    try:
+        for f in frames[:capacity]:
+            row = block[count]
+            row.fill(np.nan)
+            joints = evaluate_frame(scene, f, arm, pbone_map, timer)
+            if not joint_order:
+                joint_order = list(joints.keys())
+            for cname, pos in joints.items():
+                j = index.get(cname)
+                if j is not None:
+                    row[j] = pos
+            count += 1
+    finally:
+        block = row = None
+        release_block(shm)
+    return count, joint_order
+
+
 def main():
+    timer = StageTimer()
+    prof = start_profile()
     args = parse_args()
 
     fbx_path = args["fbx"]
@@ -735,8 +825,10 @@ def main():
 
     os.makedirs(out_dir, exist_ok=True)
 
-    clear_scene()
-    import_fbx(fbx_path)
+    with timer.stage("factory_reset"):
+        clear_scene()
+    with timer.stage("fbx_import"):
+        import_fbx(fbx_path)
 
     arm = find_armature()
     if arm is None:
@@ -746,43 +838,48 @@ def main():
     action, f_start, f_end = get_action_and_range(arm)
     frame_indices = compute_frames(args, f_start, f_end)
 
-    pbone_map, found_joints, missing_joints = build_pose_bone_map(arm)
+    with timer.stage("bone_mapping"):
+        pbone_map, found_joints, missing_joints = build_pose_bone_map(arm)
 
     scene = bpy.context.scene
 
-    frames_out = []
-    for f in frame_indices:
-        scene.frame_set(f)
-        bpy.context.view_layer.update()
-
-        joints_vec = {}
-        for cname in CANONICAL_JOINTS:
-            pbone = pbone_map.get(cname)
-            if pbone is None:
-                continue
-            world_pos = arm.matrix_world @ pbone.head
-            joints_vec[cname] = world_pos
-
-        _ensure_face_joints_3d(joints_vec)
-
-        joints = {}
-        for cname, v in joints_vec.items():
-            joints[cname] = [float(v.x), float(v.y), float(v.z)]
-
-        frames_out.append({
-            "frame_index": int(f),
-            "joints": joints,
-        })
-
-    data = {
-        "fbx_file": os.path.abspath(fbx_path),
-        "frame_indices": frame_indices,
-        "frames": frames_out,
-    }
-
-    out_json = os.path.join(out_dir, "joint_data.json")
-    with open(out_json, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    layout = [name for name in args["joint_layout"].split(",") if name]
+    shm_count = 0
+    joint_order = []
+    if args["shm_name"] and layout:
+        # No joint_data.json on this path, the node reads the block
+        shm_count, joint_order = write_joints_to_shm(
+            scene, arm, pbone_map, frame_indices,
+            args["shm_name"], max(args["shm_frames"], 0), layout, timer,
+        )
+    elif args["stream"]:
+        # No joint_data.json on this path, the node reads the records as they come
+        print(STREAM_HEADER_PREFIX + json.dumps({"total": len(frame_indices)}), flush=True)
+        for i, f in enumerate(frame_indices):
+            record = {
+                "i": i,
+                "frame_index": int(f),
+                "joints": evaluate_frame(scene, f, arm, pbone_map, timer),
+            }
+            print(STREAM_FRAME_PREFIX + json.dumps(record), flush=True)
+    else:
+        frames_out = []
+        for f in frame_indices:
+            frames_out.append({
+                "frame_index": int(f),
+                "joints": evaluate_frame(scene, f, arm, pbone_map, timer),
+            })
+
+        data = {
+            "fbx_file": os.path.abspath(fbx_path),
+            "frame_indices": frame_indices,
+            "frames": frames_out,
+        }
+
+        out_json = os.path.join(out_dir, "joint_data.json")
+        with timer.stage("file_write"):
+            with open(out_json, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
 
     frame_info = {
         "fbx_file": os.path.abspath(fbx_path),
@@ -797,6 +894,13 @@ def main():
         "found_joints": found_joints,
         "missing_joints": missing_joints,
     }
+    if args["shm_name"]:
+        frame_info["shm_count"] = shm_count
+        frame_info["joint_order"] = joint_order
+    profile_path = dump_profile(prof, "fbx_pose_extract")
+    if profile_path:
+        frame_info["profile"] = profile_path
+    frame_info["timings"] = timer.summary()
     info_path = os.path.join(out_dir, "frame_info.json")
     with open(info_path, "w", encoding="utf-8") as f:
         json.dump(frame_info, f, indent=2)
@@ -8,6 +8,19 @@ import numpy as np
 from PIL import Image, ImageDraw
 import torch
 
+from .fbx_pose_colors import WHITE_COLOR, get_palette
+
+# The colour tables used to live in this module; re-exported for code that
+# still imports them from here (not used below).
+from .fbx_pose_colors import (
+    JOINT_GROUPS,
+    GROUP_COLORS_OPENPOSE,
+    CONTROLNET_JOINT_COLORS,
+    get_joint_color,
+    get_segment_color,
+)
+from .fbx_pose_render_cache import draw_cached
+
 # BODY + hands skeleton segments (BODY_25 style)
 SKELETON_SEGMENTS = [
     # Hips & spine
@@ -78,165 +91,8 @@ FACE_SEGMENTS = [
     ("nose", "head"),
 ]
 
-# Grouping for colors (OpenPose-style)
-JOINT_GROUPS = {
-    "hips": "torso",
-    "spine": "torso",
-    "chest": "torso",
-    "neck": "torso",
-    "head": "torso",
-
-    "left_shoulder": "left_arm",
-    "left_elbow": "left_arm",
-    "left_wrist": "left_arm",
-
-    "right_shoulder": "right_arm",
-    "right_elbow": "right_arm",
-    "right_wrist": "right_arm",
-
-    "left_hip": "left_leg",
-    "left_knee": "left_leg",
-    "left_ankle": "left_leg",
-
-    "right_hip": "right_leg",
-    "right_knee": "right_leg",
-    "right_ankle": "right_leg",
-
-    "left_thumb_base": "left_hand",
-    "left_thumb_tip": "left_hand",
-    "left_index_base": "left_hand",
-    "left_index_tip": "left_hand",
-    "left_middle_base": "left_hand",
-    "left_middle_tip": "left_hand",
-    "left_ring_base": "left_hand",
-    "left_ring_tip": "left_hand",
-    "left_pinky_base": "left_hand",
-    "left_pinky_tip": "left_hand",
-
-    "right_thumb_base": "right_hand",
-    "right_thumb_tip": "right_hand",
-    "right_index_base": "right_hand",
-    "right_index_tip": "right_hand",
-    "right_middle_base": "right_hand",
-    "right_middle_tip": "right_hand",
-    "right_ring_base": "right_hand",
-    "right_ring_tip": "right_hand",
-    "right_pinky_base": "right_hand",
-    "right_pinky_tip": "right_hand",
-
-    "nose": "face",
-    "left_eye": "face",
-    "right_eye": "face",
-    "left_ear": "face",
-    "right_ear": "face",
-}
-
-GROUP_COLORS_OPENPOSE = {
-    "torso":      (255, 255, 0),
-    "left_arm":   (0, 255, 0),
-    "right_arm":  (0, 128, 255),
-    "left_leg":   (255, 0, 255),
-    "right_leg":  (255, 128, 0),
-    "left_hand":  (0, 200, 0),
-    "right_hand": (0, 100, 220),
-    "face":       (255, 0, 0),
-}
-
-# Per-joint colors approximating modern ControlNet OpenPose style.
-CONTROLNET_JOINT_COLORS = {
-    # Torso / core
-    "hips":          (0, 255, 0),
-    "spine":         (0, 220, 0),
-    "chest":         (0, 200, 255),
-    "neck":          (0, 100, 255),
-    "head":          (255, 0, 255),
-
-    # Left arm: warm gradient
-    "left_shoulder": (255, 0, 0),
-    "left_elbow":    (255, 128, 0),
-    "left_wrist":    (255, 255, 0),
-
-    # Right arm: cool gradient
-    "right_shoulder": (0, 128, 255),
-    "right_elbow":    (0, 200, 255),
-    "right_wrist":    (0, 255, 200),
-
-    # Left leg: green-ish
-    "left_hip":   (0, 255, 0),
-    "left_knee":  (0, 220, 120),
-    "left_ankle": (0, 200, 180),
-
-    # Right leg: blue/teal
-    "right_hip":   (0, 255, 128),
-    "right_knee":  (0, 220, 200),
-    "right_ankle": (0, 200, 255),
-
-    # Left hand fingers
-    "left_thumb_base":  (255, 255, 0),
-    "left_thumb_tip":   (255, 220, 0),
-    "left_index_base":  (0, 180, 255),
-    "left_index_tip":   (0, 140, 255),
-    "left_middle_base": (0, 255, 180),
-    "left_middle_tip":  (0, 255, 140),
-    "left_ring_base":   (255, 0, 180),
-    "left_ring_tip":    (255, 0, 140),
-    "left_pinky_base":  (180, 0, 255),
-    "left_pinky_tip":   (140, 0, 255),
-
-    # Right hand fingers
-    "right_thumb_base":  (255, 255, 0),
-    "right_thumb_tip":   (255, 220, 0),
-    "right_index_base":  (0, 180, 255),
-    "right_index_tip":   (0, 140, 255),
-    "right_middle_base": (0, 255, 180),
-    "right_middle_tip":  (0, 255, 140),
-    "right_ring_base":   (255, 0, 180),
-    "right_ring_tip":    (255, 0, 140),
-    "right_pinky_base":  (180, 0, 255),
-    "right_pinky_tip":   (140, 0, 255),
-
-    # Face (white dots)
-    "nose":      (255, 255, 255),
-    "left_eye":  (255, 255, 255),
-    "right_eye": (255, 255, 255),
-    "left_ear":  (255, 255, 255),
-    "right_ear": (255, 255, 255),
-}
-
-WHITE_COLOR = (255, 255, 255)
-
-
-def get_joint_color(jname: str, color_mode: str):
-    """Return RGB tuple for a joint based on the selected color mode."""
-    if color_mode == "White":
-        return WHITE_COLOR
-
-    if color_mode == "ControlNet Colors":
-        col = CONTROLNET_JOINT_COLORS.get(jname)
-        if col is not None:
-            return col
-        group = JOINT_GROUPS.get(jname)
-        if group is not None:
-            return GROUP_COLORS_OPENPOSE.get(group, WHITE_COLOR)
-        return WHITE_COLOR
-
-    # Default "OpenPose"
-    group = JOINT_GROUPS.get(jname)
-    if group is None:
-        return WHITE_COLOR
-    return GROUP_COLORS_OPENPOSE.get(group, WHITE_COLOR)
-
-
-def get_segment_color(jname_a: str, jname_b: str, color_mode: str):
-    """Colour for a bone segment between two joints."""
-    if color_mode == "White":
-        return WHITE_COLOR
-    col_a = get_joint_color(jname_a, color_mode)
-    col_b = get_joint_color(jname_b, color_mode)
-    r = (col_a[0] + col_b[0]) // 2
-    g = (col_a[1] + col_b[1]) // 2
-    b = (col_a[2] + col_b[2]) // 2
-    return (r, g, b)
+# Colour tables + compiled palettes live in fbx_pose_colors (shared by all drawers)
+_DRAW_SEGMENTS = tuple(SKELETON_SEGMENTS) + tuple(FACE_SEGMENTS)
 
 
 def _estimate_yaw_angle_for_auto(first_frame_positions):
@@ -596,6 +452,178 @@ def project_and_normalize(
     return projected_frames
 
 
+# View plane axes / depth axis per camera view, as rows over (rx, ry, rz):
+# the same mapping as _world_to_view / _depth_for_view, in matrix form
+_VIEW_AXES = {
+    "Front": ((1.0, 0.0, 0.0), (0.0, 0.0, 1.0), (0.0, 1.0, 0.0)),
+    "Auto (Face Camera)": ((1.0, 0.0, 0.0), (0.0, 0.0, 1.0), (0.0, 1.0, 0.0)),
+    "Back": ((-1.0, 0.0, 0.0), (0.0, 0.0, 1.0), (0.0, 1.0, 0.0)),
+    "Left Side": ((0.0, -1.0, 0.0), (0.0, 0.0, 1.0), (1.0, 0.0, 0.0)),
+    "Right Side": ((0.0, 1.0, 0.0), (0.0, 0.0, 1.0), (1.0, 0.0, 0.0)),
+    "Top": ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0)),
+}
+
+
+def _cam_curves(cam_profile_str, num_frames):
+    """CameraDirector profile -> (extra yaw radians [F], zoom multiplier [F])."""
+    yaw = np.zeros(num_frames, dtype=np.float64)
+    zoom = np.ones(num_frames, dtype=np.float64)
+    if not cam_profile_str:
+        return yaw, zoom
+    try:
+        cam_profile = json.loads(cam_profile_str)
+    except Exception:
+        return yaw, zoom
+    if not isinstance(cam_profile, dict):
+        return yaw, zoom
+
+    for idx, value in enumerate((cam_profile.get("rotation") or [])[:num_frames]):
+        try:
+            yaw[idx] = math.radians(float(value))
+        except Exception:
+            pass
+    for idx, value in enumerate((cam_profile.get("zoom") or [])[:num_frames]):
+        try:
+            zoom[idx] = max(float(value), 0.01)
+        except Exception:
+            pass
+    return yaw, zoom
+
+
+def project_views(
+    joint_frames,
+    width,
+    height,
+    views,
+    zoom_factor=1.0,
+    projection_mode="Orthographic (Stable)",
+    cam_profile_str=None,
+):
+    """
+    project_and_normalize(..., inplace=False) for several cameras at once.
+
+    views: list of (camera_view, extra_yaw_degrees) pairs, e.g.
+    [("Front", 0), ("Left Side", 0)] or an orbit [("Front", 0), ("Front", 90), ...].
+
+    The clip is packed into one [F, J, 3] array and every view is rotated,
+    projected and fitted (global bounds per view) in a single [V, F, J]
+    numpy pass instead of V Python loops over every joint. Returns one list
+    of projected frames per view, same format as project_and_normalize.
+    """
+    try:
+        zoom_factor = float(zoom_factor)
+    except Exception:
+        zoom_factor = 1.0
+    if zoom_factor <= 0.0:
+        zoom_factor = 1.0
+
+    projection_mode = str(projection_mode or "Orthographic (Stable)")
+    perspective = projection_mode == "Perspective (Experimental)"
+
+    # Pack the clip: union of joint names as columns, NaN where a frame lacks one
+    joint_index = {}
+    for frame_positions in joint_frames:
+        for jname in frame_positions:
+            if jname not in joint_index:
+                joint_index[jname] = len(joint_index)
+    num_frames = len(joint_frames)
+    world = np.full((num_frames, len(joint_index), 3), np.nan, dtype=np.float64)
+    for f, frame_positions in enumerate(joint_frames):
+        if frame_positions:
+            cols = [joint_index[jname] for jname in frame_positions]
+            world[f, cols] = [tuple(pos) for pos in frame_positions.values()]
+
+    if not views or world.size == 0:
+        return [[{} for _ in joint_frames] for _ in views]
+
+    auto_yaw = 0.0
+    if any(view == "Auto (Face Camera)" for view, _ in views):
+        for frame_positions in joint_frames:
+            if frame_positions:
+                auto_yaw = _estimate_yaw_angle_for_auto(frame_positions)
+                break
+
+    cam_yaw, cam_zoom = _cam_curves(cam_profile_str, num_frames)
+
+    # [V, F] total yaw; tiny angles are skipped like _apply_yaw does
+    view_yaw = np.array(
+        [
+            (auto_yaw if view == "Auto (Face Camera)" else 0.0) + math.radians(float(extra or 0.0))
+            for view, extra in views
+        ],
+        dtype=np.float64,
+    )
+    yaw = view_yaw[:, None] + cam_yaw[None, :]
+    yaw[np.abs(yaw) < 1e-6] = 0.0
+    cos_y = np.cos(yaw)[..., None]
+    sin_y = np.sin(yaw)[..., None]
+
+    wx, wy, wz = world[..., 0], world[..., 1], world[..., 2]
+    rotated = np.empty((len(views),) + world.shape, dtype=np.float64)
+    rotated[..., 0] = cos_y * wx - sin_y * wy
+    rotated[..., 1] = sin_y * wx + cos_y * wy
+    rotated[..., 2] = wz
+
+    axes = np.array([_VIEW_AXES.get(view, _VIEW_AXES["Front"]) for view, _ in views], dtype=np.float64)
+    # [V, F, J] view-plane coordinates and depth
+    sx = np.einsum("vfjc,vc->vfj", rotated, axes[:, 0])
+    sy = np.einsum("vfjc,vc->vfj", rotated, axes[:, 1])
+
+    present = ~np.isnan(world).any(axis=-1)
+    has_data = present.any()
+    if not has_data:
+        return [[{} for _ in joint_frames] for _ in views]
+
+    flat_x = sx.reshape(len(views), -1)
+    flat_y = sy.reshape(len(views), -1)
+    min_x, max_x = np.nanmin(flat_x, axis=1), np.nanmax(flat_x, axis=1)
+    min_y, max_y = np.nanmin(flat_y, axis=1), np.nanmax(flat_y, axis=1)
+
+    width_3d = max_x - min_x
+    height_3d = max_y - min_y
+    width_3d[width_3d <= 1e-6] = 1.0
+    height_3d[height_3d <= 1e-6] = 1.0
+    global_scale = np.minimum((width * 0.9) / width_3d, (height * 0.9) / height_3d) * zoom_factor
+    cx = (min_x + max_x) * 0.5
+    cy = (min_y + max_y) * 0.5
+
+    # [V, F] per-frame scale: perspective factor (mean depth in the clip's
+    # depth range, +-20%) times the CameraDirector zoom
+    frame_factor = np.ones((len(views), num_frames), dtype=np.float64)
+    if perspective:
+        depth = np.einsum("vfjc,vc->vfj", rotated, axes[:, 2])
+        flat_d = depth.reshape(len(views), -1)
+        d_min, d_max = np.nanmin(flat_d, axis=1), np.nanmax(flat_d, axis=1)
+        counts = present.sum(axis=1)
+        mean_depth = np.where(present[None], depth, 0.0).sum(axis=2) / np.maximum(counts, 1)
+        span = d_max - d_min
+        valid = span > 0
+        t = np.clip((mean_depth - d_min[:, None]) / np.where(valid, span, 1.0)[:, None], 0.0, 1.0)
+        frame_factor = np.where(valid[:, None], 1.0 + 0.4 * (0.5 - t) * 2.0, 1.0)
+    scale = global_scale[:, None] * frame_factor * cam_zoom[None, :]
+
+    u = width * 0.5 + (sx - cx[:, None, None]) * scale[..., None]
+    v = height * 0.5 - (sy - cy[:, None, None]) * scale[..., None]
+
+    # Back to per-frame dicts, each frame keeping its own joint order (draw order)
+    results = []
+    for vi in range(len(views)):
+        u_v = u[vi].tolist()
+        v_v = v[vi].tolist()
+        frames_out = []
+        for f, frame_positions in enumerate(joint_frames):
+            if not frame_positions:
+                frames_out.append({})
+                continue
+            u_f, v_f = u_v[f], v_v[f]
+            frames_out.append({
+                jname: (u_f[joint_index[jname]], v_f[joint_index[jname]])
+                for jname in frame_positions
+            })
+        results.append(frames_out)
+    return results
+
+
 def _generate_face_points_2d(frame_proj):
     head = frame_proj.get("head")
     neck = frame_proj.get("neck")
@@ -643,43 +671,58 @@ def _generate_face_points_2d(frame_proj):
             frame_proj["right_ear"] = (hx + ear_offset, hy)
 
 
-def draw_pose_images(projected_frames, width, height, joint_size, line_thickness, color_mode, face_mode):
-    images = []
-    for frame_proj in projected_frames:
-        if face_mode in ["Dots Only (BODY_25)", "Full Face (FACE_70)"]:
-            _generate_face_points_2d(frame_proj)
+def _draw_pose_frame(frame_proj, width, height, joint_size, line_thickness, color_mode, face_mode):
+    palette = get_palette(color_mode, _DRAW_SEGMENTS)
+    segment_fills = palette.segment_fills
+    joint_fills = palette.joint_fills
 
-        img = Image.new("RGB", (width, height), (0, 0, 0))
-        draw = ImageDraw.Draw(img)
+    img = Image.new("RGB", (width, height), (0, 0, 0))
+    draw = ImageDraw.Draw(img)
 
-        # BODY_25 skeleton
-        for a, b in SKELETON_SEGMENTS:
+    # BODY_25 skeleton
+    for seg_idx, (a, b) in enumerate(SKELETON_SEGMENTS):
+        if a not in frame_proj or b not in frame_proj:
+            continue
+        x1, y1 = frame_proj[a]
+        x2, y2 = frame_proj[b]
+        color = segment_fills[seg_idx]
+        draw.line((x1, y1, x2, y2), fill=color, width=line_thickness)
+
+    # Optional face skeleton
+    if face_mode == "Full Face (FACE_70)":
+        face_offset = len(SKELETON_SEGMENTS)
+        for seg_idx, (a, b) in enumerate(FACE_SEGMENTS):
             if a not in frame_proj or b not in frame_proj:
                 continue
             x1, y1 = frame_proj[a]
             x2, y2 = frame_proj[b]
-            color = get_segment_color(a, b, color_mode)
+            color = segment_fills[face_offset + seg_idx]
             draw.line((x1, y1, x2, y2), fill=color, width=line_thickness)
 
-        # Optional face skeleton
-        if face_mode == "Full Face (FACE_70)":
-            for a, b in FACE_SEGMENTS:
-                if a not in frame_proj or b not in frame_proj:
-                    continue
-                x1, y1 = frame_proj[a]
-                x2, y2 = frame_proj[b]
-                color = get_segment_color(a, b, color_mode)
-                draw.line((x1, y1, x2, y2), fill=color, width=line_thickness)
-
-        r = joint_size
-        for jname, (x, y) in frame_proj.items():
-            if face_mode == "Off" and jname in ("nose", "left_eye", "right_eye", "left_ear", "right_ear"):
-                continue
-            color = get_joint_color(jname, color_mode)
-            draw.ellipse((x - r, y - r, x + r, y + r), fill=color)
+    r = joint_size
+    for jname, (x, y) in frame_proj.items():
+        if face_mode == "Off" and jname in ("nose", "left_eye", "right_eye", "left_ear", "right_ear"):
+            continue
+        color = joint_fills.get(jname, WHITE_COLOR)
+        draw.ellipse((x - r, y - r, x + r, y + r), fill=color)
+
+    return np.array(img, dtype=np.uint8)
+
+
+def draw_pose_images(projected_frames, width, height, joint_size, line_thickness, color_mode, face_mode):
+    if face_mode in ["Dots Only (BODY_25)", "Full Face (FACE_70)"]:
+        for frame_proj in projected_frames:
+            _generate_face_points_2d(frame_proj)
 
-        npimg = np.array(img, dtype=np.uint8)
-        images.append(npimg)
+    # Identical frames (holds, padding, re-queues) are drawn once, see fbx_pose_render_cache
+    style = ("BODY_25", width, height, joint_size, line_thickness, color_mode, face_mode)
+    images = draw_cached(
+        projected_frames,
+        style,
+        lambda frame_proj: _draw_pose_frame(
+            frame_proj, width, height, joint_size, line_thickness, color_mode, face_mode
+        ),
+    )
 
     if not images:
         blank = np.zeros((height, width, 3), dtype=np.uint8)
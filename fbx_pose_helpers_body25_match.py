@@ -4,14 +4,17 @@
 # - Can treat the reference as:full body upper body (head->hips) or auto-detected
 
 import math
+import time
 import numpy as np
 import torch
 
 from .fbx_pose_helpers_body25 import (
     project_and_normalize as base_project_and_normalize,
+    project_views as base_project_views,
     draw_pose_images as base_draw_pose_images,
     numpy_to_comfy_image,
 )
+from .fbx_timing import StageTimer
 
 # Joints we definitely want to hide when we treat the reference as "upper body".
 LEG_JOINTS = {
@@ -22,11 +25,66 @@ LEG_JOINTS = {
 }
 
 
+# Frames per chunk for the bbox reducer, keeps the channel-sum temp small on long videos
+REF_BBOX_CHUNK = 64
+
+
+def _compute_ref_bboxes_batch(ref_image, threshold=0.01):
+    """
+    Vectorised bbox of the non-black pixels for every frame of a ref image batch.
+
+    ref_image: Comfy IMAGE tensor [B,H,W,C] or [H,W,C] in 0..1.
+
+    Uses row/column any() reductions, so no per-pixel coordinate lists, and
+    stays on the tensor's device. Returns (bboxes, valid) or None:
+
+        bboxes: float32 [B, 4] -> (min_x, max_x, min_y, max_y) in *source* pixels
+        valid:  bool [B], False where nothing is above the threshold
+                (those rows of bboxes are meaningless)
+    """
+    if ref_image is None or not isinstance(ref_image, torch.Tensor):
+        return None
+
+    img = ref_image.detach()
+    if img.ndim == 3:
+        img = img.unsqueeze(0)
+    if img.ndim != 4 or img.shape[0] == 0:
+        return None
+
+    b, h, w, c = img.shape
+    device = img.device
+    ys = torch.arange(h, device=device)
+    xs = torch.arange(w, device=device)
+
+    bboxes = torch.empty((b, 4), dtype=torch.float32, device=device)
+    valid = torch.empty((b,), dtype=torch.bool, device=device)
+
+    for start in range(0, b, REF_BBOX_CHUNK):
+        chunk = img[start:start + REF_BBOX_CHUNK]
+        if c == 1:
+            mask = chunk[..., 0] > threshold
+        else:
+            mask = chunk.sum(dim=-1) > threshold
+
+        rows = mask.any(dim=2)  # [n, H]
+        cols = mask.any(dim=1)  # [n, W]
+
+        end = start + chunk.shape[0]
+        bboxes[start:end, 0] = torch.where(cols, xs, w).amin(dim=1)
+        bboxes[start:end, 1] = torch.where(cols, xs, -1).amax(dim=1)
+        bboxes[start:end, 2] = torch.where(rows, ys, h).amin(dim=1)
+        bboxes[start:end, 3] = torch.where(rows, ys, -1).amax(dim=1)
+        valid[start:end] = rows.any(dim=1)
+
+    return bboxes, valid
+
+
 def _compute_ref_bbox_from_image(ref_image, out_width, out_height, threshold=0.01):
     """
     ref_image: Comfy IMAGE tensor [B,H,W,C] or [H,W,C] in 0..1.
 
-    Returns bbox in *output-coordinate space* (scaled to out_width/out_height):
+    Returns bbox of the *first* frame in *output-coordinate space*
+    (scaled to out_width/out_height):
 
         (min_x, max_x, min_y, max_y, img_w, img_h)
 
@@ -38,29 +96,20 @@ def _compute_ref_bbox_from_image(ref_image, out_width, out_height, threshold=0.0
     img = ref_image
     if img.ndim == 4:
         # [B, H, W, C] -> take first frame
-        img = img[0]
-    if img.ndim != 3:
+        img = img[:1]
+    if img.ndim not in (3, 4):
         return None
 
-    img_np = img.detach().cpu().numpy()  # [H, W, C]
-    h, w, c = img_np.shape
-
-    if c == 1:
-        mask = img_np[..., 0]
-    else:
-        mask = img_np.sum(axis=-1)
-
-    mask = mask > threshold
-    coords = np.argwhere(mask)
-    if coords.size == 0:
+    result = _compute_ref_bboxes_batch(img, threshold)
+    if result is None:
+        return None
+    bboxes, valid = result
+    if not bool(valid[0]):
         return None
 
-    ys = coords[:, 0]
-    xs = coords[:, 1]
-    min_x = xs.min()
-    max_x = xs.max()
-    min_y = ys.min()
-    max_y = ys.max()
+    h = img.shape[-3]
+    w = img.shape[-2]
+    min_x, max_x, min_y, max_y = bboxes[0].tolist()
 
     # Scale bbox to the node's output resolution, in case they differ
     scale_x = float(out_width) / float(w)
@@ -191,12 +240,127 @@ def _apply_camera_pan_rotation(joint_frames, start_deg, end_deg, camera_view):
     return rotated_frames
 
 
+# Alignment_Mode that follows a reference *video* frame by frame
+TRACK_ALIGNMENT_MODE = "Track Ref Video (Per-Frame)"
+
+# Centered moving-average window (frames) applied to the per-frame ref bboxes
+REF_TRACK_SMOOTH_WINDOW = 5
+
+# Joints used for the top / bottom extents of the animation, per body mode
+TOP_JOINTS = ("head", "neck", "chest")
+FULL_BOTTOM_JOINTS = (
+    "left_ankle", "right_ankle",
+    "left_knee", "right_knee",
+    "hips", "left_hip", "right_hip",
+)
+UPPER_BOTTOM_JOINTS = ("hips", "left_hip", "right_hip", "spine", "chest")
+
+
+def _frames_to_array(projected_frames):
+    """
+    list[dict[joint_name -> (x, y)]] -> (joint_index, arr)
+
+    joint_index: dict[joint_name -> column]
+    arr:         float64 [F, J, 2], NaN where a frame lacks that joint
+    """
+    joint_index = {}
+    for frame_proj in projected_frames:
+        for jname in frame_proj:
+            if jname not in joint_index:
+                joint_index[jname] = len(joint_index)
+
+    arr = np.full((len(projected_frames), len(joint_index), 2), np.nan, dtype=np.float64)
+    for f, frame_proj in enumerate(projected_frames):
+        if frame_proj:
+            cols = [joint_index[jname] for jname in frame_proj]
+            arr[f, cols] = list(frame_proj.values())
+    return joint_index, arr
+
+
+def _array_to_frames(projected_frames, joint_index, arr, keep=None):
+    """
+    Inverse of _frames_to_array. Each frame keeps its original joint order
+    (draw order matters for overlapping dots); keep is an optional bool [F, J]
+    mask of joints to emit.
+    """
+    out = []
+    for f, frame_proj in enumerate(projected_frames):
+        row = arr[f]
+        if keep is None:
+            out.append({
+                jname: (float(row[joint_index[jname], 0]), float(row[joint_index[jname], 1]))
+                for jname in frame_proj
+            })
+        else:
+            keep_row = keep[f]
+            out.append({
+                jname: (float(row[joint_index[jname], 0]), float(row[joint_index[jname], 1]))
+                for jname in frame_proj
+                if keep_row[joint_index[jname]]
+            })
+    return out
+
+
+def _nanmin_cols(values, cols):
+    """Per-frame min over the given joint columns (NaN if none present)."""
+    if not cols:
+        return np.full(values.shape[0], np.nan)
+    return np.fmin.reduce(values[:, cols], axis=1)
+
+
+def _nanmax_cols(values, cols):
+    if not cols:
+        return np.full(values.shape[0], np.nan)
+    return np.fmax.reduce(values[:, cols], axis=1)
+
+
+def _clip_bounds(joint_index, arr, body_mode):
+    """
+    Whole-animation bounds of the projected joints, in the same "body segment"
+    sense as the alignment (full or upper body):
+
+        (top_y, bottom_y, min_x, max_x) or None if there is no usable data.
+
+    Top prefers head/neck/chest, bottom prefers feet/knees/hips (full) or
+    hips/spine/chest (upper); frames missing all of those fall back to any joint.
+    """
+    if arr.size == 0:
+        return None
+
+    xs = arr[..., 0]
+    ys = arr[..., 1]
+    all_cols = list(range(arr.shape[1]))
+    has_data = ~np.isnan(ys).all(axis=1)
+    if not has_data.any():
+        return None
+
+    bottom_names = FULL_BOTTOM_JOINTS if body_mode == "full" else UPPER_BOTTOM_JOINTS
+    top_cols = [joint_index[j] for j in TOP_JOINTS if j in joint_index]
+    bottom_cols = [joint_index[j] for j in bottom_names if j in joint_index]
+
+    frame_top = _nanmin_cols(ys, top_cols)
+    frame_top = np.where(np.isnan(frame_top), _nanmin_cols(ys, all_cols), frame_top)
+    frame_bottom = _nanmax_cols(ys, bottom_cols)
+    frame_bottom = np.where(np.isnan(frame_bottom), _nanmax_cols(ys, all_cols), frame_bottom)
+
+    return (
+        float(frame_top[has_data].min()),
+        float(frame_bottom[has_data].max()),
+        float(_nanmin_cols(xs, all_cols)[has_data].min()),
+        float(_nanmax_cols(xs, all_cols)[has_data].max()),
+    )
+
+
 def _align_projected_frames_to_bbox(projected_frames, bbox, alignment_mode):
     """
     Aligns the 2D coordinates of projected_frames into the reference bbox
     using a *single* global scale/center for the whole animation to avoid
     per-frame zooming.
 
+    Works on the whole clip as one [F, J, 2] array: masked min/max reductions
+    for the bounds, one affine transform for every frame, and the upper-body
+    crop as a boolean keep-mask.
+
     projected_frames: list[dict[joint_name -> (x,y)]]
     bbox: (min_x, max_x, min_y, max_y, img_w, img_h)
     alignment_mode: node-level Alignment_Mode string.
@@ -214,70 +378,15 @@ def _align_projected_frames_to_bbox(projected_frames, bbox, alignment_mode):
     # Decide "full" vs "upper" once for the whole clip
     body_mode = _decide_body_mode(alignment_mode, bbox)
 
-    # ------------------------------------------------------------------
-    # Pass 1: compute global bounds over the entire animation, in the
-    #         same "body segment" sense as before (full or upper body).
-    # ------------------------------------------------------------------
-    global_top_y = None
-    global_bottom_y = None
-    global_min_x = None
-    global_max_x = None
-
-    for frame_proj in projected_frames:
-        if not frame_proj:
-            continue
-
-        # Determine our own top/bottom Y extents for the relevant body part.
-        top_candidates = []
-        # Prefer head/neck/chest for the top
-        for j in ("head", "neck", "chest"):
-            if j in frame_proj:
-                top_candidates.append(frame_proj[j][1])
-
-        # Fallback: any joint
-        if not top_candidates:
-            top_candidates = [y for (_, y) in frame_proj.values()]
-
-        bottom_candidates = []
-        if body_mode == "full":
-            # Use feet / knees / hips for full-body bottom
-            for j in (
-                "left_ankle", "right_ankle",
-                "left_knee", "right_knee",
-                "hips", "left_hip", "right_hip"
-            ):
-                if j in frame_proj:
-                    bottom_candidates.append(frame_proj[j][1])
-        else:
-            # Upper-body: use hips / spine / chest as bottom
-            for j in ("hips", "left_hip", "right_hip", "spine", "chest"):
-                if j in frame_proj:
-                    bottom_candidates.append(frame_proj[j][1])
-
-        if not bottom_candidates:
-            bottom_candidates = [y for (_, y) in frame_proj.values()]
-
-        frame_top_y = float(min(top_candidates))
-        frame_bottom_y = float(max(bottom_candidates))
-
-        if global_top_y is None or frame_top_y < global_top_y:
-            global_top_y = frame_top_y
-        if global_bottom_y is None or frame_bottom_y > global_bottom_y:
-            global_bottom_y = frame_bottom_y
-
-        xs = [x for (x, _) in frame_proj.values()]
-        frame_min_x = float(min(xs))
-        frame_max_x = float(max(xs))
-
-        if global_min_x is None or frame_min_x < global_min_x:
-            global_min_x = frame_min_x
-        if global_max_x is None or frame_max_x > global_max_x:
-            global_max_x = frame_max_x
-
-    if global_top_y is None or global_bottom_y is None:
+    # Global bounds over the entire animation, in the same "body segment"
+    # sense as the reference (full or upper body).
+    joint_index, arr = _frames_to_array(projected_frames)
+    bounds = _clip_bounds(joint_index, arr, body_mode)
+    if bounds is None:
         # No usable data; return as-is.
         return projected_frames
 
+    global_top_y, global_bottom_y, global_min_x, global_max_x = bounds
     global_height = global_bottom_y - global_top_y
     if global_height <= 1e-3:
         return projected_frames
@@ -287,46 +396,141 @@ def _align_projected_frames_to_bbox(projected_frames, bbox, alignment_mode):
     # Unified scale factor for the whole animation
     scale = ref_height / global_height
 
-    # ------------------------------------------------------------------
-    # Pass 2: apply the same global scale + center to every frame.
-    # ------------------------------------------------------------------
-    aligned_frames = []
+    # Same global scale + center for every frame:
+    #  vertical   -> normalised position within the global segment, into the ref bbox
+    #  horizontal -> center-align and scale with same factor as vertical
+    aligned = np.empty_like(arr)
+    aligned[..., 1] = min_y_ref + (arr[..., 1] - global_top_y) / global_height * ref_height
+    aligned[..., 0] = ref_center_x + (arr[..., 0] - global_center_x) * scale
 
-    for frame_proj in projected_frames:
-        if not frame_proj:
-            aligned_frames.append({})
-            continue
+    keep = None
+    if body_mode == "upper":
+        # Drop explicit leg joints (knees/ankles) and hard crop anything that
+        # sits below the reference bbox bottom.
+        keep = aligned[..., 1] <= max_y_ref
+        leg_cols = [joint_index[j] for j in LEG_JOINTS if j in joint_index]
+        if leg_cols:
+            keep[:, leg_cols] = False
 
-        aligned = {}
-        for jname, (x, y) in frame_proj.items():
-            # Normalized vertical position within the global segment
-            y_rel = (y - global_top_y) / global_height  # 0 at top, 1 at bottom
-            y_new = min_y_ref + y_rel * ref_height
+    return _array_to_frames(projected_frames, joint_index, aligned, keep)
 
-            # Horizontal: center-align and scale with same factor as vertical
-            x_offset = x - global_center_x
-            x_new = ref_center_x + x_offset * scale
 
-            aligned[jname] = (float(x_new), float(y_new))
+def _compute_ref_bboxes_from_images(ref_image, out_width, out_height, threshold=0.01):
+    """
+    Per-frame version of _compute_ref_bbox_from_image.
 
-        if body_mode == "upper":
-            # 1) Drop explicit leg joints (knees/ankles).
-            aligned = {
-                jname: pos
-                for jname, pos in aligned.items()
-                if jname not in LEG_JOINTS
-            }
+    Returns (bboxes, valid) as numpy arrays, or None:
+        bboxes: float64 [B, 4] (min_x, max_x, min_y, max_y) in output space
+        valid:  bool [B]
+    """
+    result = _compute_ref_bboxes_batch(ref_image, threshold)
+    if result is None:
+        return None
+    bboxes, valid = result
+
+    h = ref_image.shape[-3]
+    w = ref_image.shape[-2]
+    scale = torch.tensor(
+        [out_width / float(w), out_width / float(w), out_height / float(h), out_height / float(h)],
+        dtype=torch.float32,
+        device=bboxes.device,
+    )
+    bboxes = (bboxes * scale).cpu().numpy().astype(np.float64)
+    return bboxes, valid.cpu().numpy()
+
+
+def _smooth_ref_bboxes(bboxes, valid, window=REF_TRACK_SMOOTH_WINDOW):
+    """
+    Fill frames with no detected skeleton from their neighbours, then run a
+    centered moving average over time so the stickman does not jitter with
+    the DWPose detections. bboxes: [B, 4]. Returns None if nothing is valid.
+    """
+    if not valid.any():
+        return None
+
+    num = bboxes.shape[0]
+    idx = np.arange(num)
+
+    # Forward fill, then back fill the leading gap with the first valid frame
+    last_valid = np.maximum.accumulate(np.where(valid, idx, -1))
+    last_valid[last_valid < 0] = int(np.argmax(valid))
+    filled = bboxes[last_valid]
 
-            # 2) Hard crop: drop any joint that sits below the reference bbox bottom.
-            cropped = {}
-            for jname, (x_new, y_new) in aligned.items():
-                if y_new <= max_y_ref:
-                    cropped[jname] = (x_new, y_new)
-            aligned = cropped
+    window = int(window)
+    if window <= 1 or num < 2:
+        return filled
+    if window % 2 == 0:
+        window += 1
 
-        aligned_frames.append(aligned)
+    half = window // 2
+    padded = np.pad(filled, ((half, half), (0, 0)), mode="edge")
+    csum = np.concatenate([np.zeros((1, 4)), np.cumsum(padded, axis=0)], axis=0)
+    return (csum[window:] - csum[:-window]) / float(window)
 
-    return aligned_frames
+
+def _align_projected_frames_to_ref_track(projected_frames, ref_bboxes, ref_valid, img_w, img_h, alignment_mode):
+    """
+    Per-frame alignment to a reference pose *video*.
+
+    The FBX clip keeps a single global normalisation (so its own motion is
+    preserved), but every frame is mapped into that frame's reference bbox
+    (smoothed over time) instead of one bbox for the whole clip. Pose frame i
+    uses reference frame min(i, B - 1).
+
+    ref_bboxes: [B, 4] output-space bboxes, ref_valid: bool [B].
+    """
+    smoothed = _smooth_ref_bboxes(ref_bboxes, ref_valid)
+    if smoothed is None or not projected_frames:
+        return projected_frames
+
+    # Decide "full" vs "upper" once for the whole clip from the median framing
+    median = np.median(smoothed, axis=0)
+    median_bbox = (
+        float(median[0]), float(median[1]), float(median[2]), float(median[3]),
+        float(img_w), float(img_h),
+    )
+    body_mode = _decide_body_mode(alignment_mode, median_bbox)
+
+    joint_index, arr = _frames_to_array(projected_frames)
+    bounds = _clip_bounds(joint_index, arr, body_mode)
+    if bounds is None:
+        return projected_frames
+
+    global_top_y, global_bottom_y, global_min_x, global_max_x = bounds
+    global_height = global_bottom_y - global_top_y
+    if global_height <= 1e-3:
+        return projected_frames
+    global_center_x = (global_min_x + global_max_x) * 0.5
+
+    num_frames = arr.shape[0]
+    ref_idx = np.minimum(np.arange(num_frames), smoothed.shape[0] - 1)
+    per_frame = smoothed[ref_idx]  # [F, 4]
+
+    min_y_ref = per_frame[:, 2:3]
+    max_y_ref = per_frame[:, 3:4]
+    ref_height = max_y_ref - min_y_ref
+    ref_center_x = (per_frame[:, 0:1] + per_frame[:, 1:2]) * 0.5
+    usable = ref_height > 1e-3  # [F, 1]
+
+    xs = arr[..., 0]
+    ys = arr[..., 1]
+    scale = ref_height / global_height
+    y_new = min_y_ref + (ys - global_top_y) / global_height * ref_height
+    x_new = ref_center_x + (xs - global_center_x) * scale
+
+    aligned = np.empty_like(arr)
+    aligned[..., 0] = np.where(usable, x_new, xs)
+    aligned[..., 1] = np.where(usable, y_new, ys)
+
+    keep = None
+    if body_mode == "upper":
+        keep = ~np.isnan(aligned[..., 1])
+        leg_cols = [joint_index[j] for j in LEG_JOINTS if j in joint_index]
+        if leg_cols:
+            keep[:, leg_cols] = False
+        keep &= ~(usable & (aligned[..., 1] > max_y_ref))
+
+    return _array_to_frames(projected_frames, joint_index, aligned, keep)
 
 
 def generate_aligned_pose_images(
@@ -344,6 +548,7 @@ def generate_aligned_pose_images(
     alignment_mode,
     projection_mode="Orthographic (Stable)",
     cam_profile_str=None,
+    timer=None,
 ):
     """
     High-level helper for the "match image" node:
@@ -353,43 +558,166 @@ def generate_aligned_pose_images(
        - Compute bbox of non-black pixels
        - Align our projected joints to that bbox (full or upper body),
          using a *whole-animation* global bounding box for stability.
+       - In "Track Ref Video (Per-Frame)" mode every ref frame gets its own
+         (temporally smoothed) bbox and the clip follows it frame by frame.
     3. Draw pose images and convert to Comfy tensor.
+
+    timer: optional fbx_timing.StageTimer, gets projection / alignment /
+    rasterization / tensor_conversion stage times.
     """
+    timer = timer if timer is not None else StageTimer()
+
     # Step 1: base projection (our "raw" FBX stickman), with optional
     # per-frame CameraDirector yaw/zoom applied inside BODY_25 helper.
-    projected = base_project_and_normalize(
-        joint_frames,
-        output_width,
-        output_height,
-        camera_view,
-        zoom_factor,
-        inplace,
-        projection_mode,
-        cam_profile_str=cam_profile_str,
-    )
-
-    # Step 2: optional alignment to reference pose image
-    if alignment_mode != "Off" and ref_pose_image is not None:
-        bbox = _compute_ref_bbox_from_image(
-            ref_pose_image,
+    with timer.stage("projection"):
+        projected = base_project_and_normalize(
+            joint_frames,
             output_width,
             output_height,
+            camera_view,
+            zoom_factor,
+            inplace,
+            projection_mode,
+            cam_profile_str=cam_profile_str,
         )
-        if bbox is not None:
-            projected = _align_projected_frames_to_bbox(
-                projected,
-                bbox,
-                alignment_mode,
-            )
-
-    # Step 3: draw and convert
-    images_np = base_draw_pose_images(
+
+    # Steps 2 + 3: optional alignment, then draw and convert
+    t_ref = time.perf_counter()
+    ref_target = _ref_alignment_target(ref_pose_image, output_width, output_height, alignment_mode)
+    timer.add("alignment", time.perf_counter() - t_ref)
+    return _align_and_draw(
         projected,
         output_width,
         output_height,
-        joint_size,
-        line_thickness,
         color_mode,
         face_mode,
+        joint_size,
+        line_thickness,
+        ref_target,
+        alignment_mode,
+        timer,
     )
-    return numpy_to_comfy_image(images_np)
+
+
+def _ref_alignment_target(ref_pose_image, output_width, output_height, alignment_mode):
+    """
+    What the reference image (or video) aligns to, measured once:
+    ("track", (bboxes, valid)) per ref frame for Track Ref Video (see
+    _compute_ref_bboxes_from_images), ("bbox", bbox) for the other modes,
+    None when there is nothing to align to.
+    """
+    if ref_pose_image is None or alignment_mode == "Off":
+        return None
+    if alignment_mode == TRACK_ALIGNMENT_MODE:
+        ref_track = _compute_ref_bboxes_from_images(ref_pose_image, output_width, output_height)
+        return ("track", ref_track) if ref_track is not None else None
+    bbox = _compute_ref_bbox_from_image(ref_pose_image, output_width, output_height)
+    return ("bbox", bbox) if bbox is not None else None
+
+
+def _align_and_draw(
+    projected,
+    output_width,
+    output_height,
+    color_mode,
+    face_mode,
+    joint_size,
+    line_thickness,
+    ref_target,
+    alignment_mode,
+    timer,
+):
+    """
+    Align projected frames to ref_target (from _ref_alignment_target, None =
+    no alignment), draw them, return the IMAGE batch.
+    """
+    t_align = time.perf_counter()
+    if ref_target is not None and ref_target[0] == "track":
+        ref_track = ref_target[1]
+        projected = _align_projected_frames_to_ref_track(
+            projected,
+            ref_track[0],
+            ref_track[1],
+            output_width,
+            output_height,
+            alignment_mode,
+        )
+    elif ref_target is not None:
+        projected = _align_projected_frames_to_bbox(
+            projected,
+            ref_target[1],
+            alignment_mode,
+        )
+
+    timer.add("alignment", time.perf_counter() - t_align)
+
+    # Draw and convert
+    with timer.stage("rasterization"):
+        images_np = base_draw_pose_images(
+            projected,
+            output_width,
+            output_height,
+            joint_size,
+            line_thickness,
+            color_mode,
+            face_mode,
+        )
+    with timer.stage("tensor_conversion"):
+        return numpy_to_comfy_image(images_np)
+
+
+def generate_multiview_pose_images(
+    joint_frames,
+    output_width,
+    output_height,
+    views,
+    zoom_factor,
+    color_mode,
+    face_mode,
+    joint_size,
+    line_thickness,
+    ref_pose_image,
+    alignment_mode,
+    projection_mode="Orthographic (Stable)",
+    cam_profile_str=None,
+    timer=None,
+):
+    """
+    generate_aligned_pose_images (root-motion framing, inplace=False) for
+    several cameras: views is a list of (camera_view, extra_yaw_degrees).
+    All views are projected in one vectorised pass (project_views) and the
+    reference bbox / track is measured once, then each view is aligned and
+    drawn. Returns one IMAGE batch per view.
+    """
+    timer = timer if timer is not None else StageTimer()
+
+    with timer.stage("projection"):
+        projected_views = base_project_views(
+            joint_frames,
+            output_width,
+            output_height,
+            views,
+            zoom_factor,
+            projection_mode,
+            cam_profile_str=cam_profile_str,
+        )
+
+    t_ref = time.perf_counter()
+    ref_target = _ref_alignment_target(ref_pose_image, output_width, output_height, alignment_mode)
+    timer.add("alignment", time.perf_counter() - t_ref)
+
+    return [
+        _align_and_draw(
+            projected,
+            output_width,
+            output_height,
+            color_mode,
+            face_mode,
+            joint_size,
+            line_thickness,
+            ref_target,
+            alignment_mode,
+            timer,
+        )
+        for projected in projected_views
+    ]
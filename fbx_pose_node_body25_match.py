@@ -7,13 +7,292 @@
 
 import os
 import json
-import uuid
-import subprocess
-import tempfile
 
 import numpy as np
 
-from .fbx_pose_helpers_body25_match import generate_aligned_pose_images
+from .fbx_blender_process import run_blender
+from .fbx_pose_helpers_body25_match import (
+    TRACK_ALIGNMENT_MODE,
+    generate_aligned_pose_images,
+    generate_multiview_pose_images,
+)
+from .fbx_pose_colors import POSE_JOINT_NAMES
+from .fbx_scratch import finish_job_dir, new_job_dir
+from .fbx_shm import create_block, release_block
+from .fbx_timing import StageTimer, attach_timings, start_profile
+
+
+def _cam_profile_static(cam_profile_str, first_idx, last_idx):
+    """
+    True if the CameraDirector profile gives the same yaw/zoom for every frame
+    index in [first_idx, last_idx], i.e. a pose held over that range renders
+    identically. Mirrors the lookup in project_and_normalize (out-of-range
+    indices fall back to 0 rotation / 1.0 zoom).
+    """
+    if not cam_profile_str:
+        return True
+    try:
+        cam_profile = json.loads(cam_profile_str)
+    except Exception:
+        return True
+    if not isinstance(cam_profile, dict):
+        return True
+
+    for key, default in (("rotation", 0.0), ("zoom", 1.0)):
+        curve = cam_profile.get(key) or []
+        values = set()
+        for idx in range(first_idx, last_idx + 1):
+            values.add(curve[idx] if 0 <= idx < len(curve) else default)
+            if len(values) > 1:
+                return False
+    return True
+
+
+# Stream transport record prefixes (must match fbx_pose_extract.py)
+STREAM_HEADER_PREFIX = "@FBX_FRAMES "
+STREAM_FRAME_PREFIX = "@FBX_FRAME "
+
+
+def _progress_bar(total):
+    """ComfyUI's progress bar when running inside ComfyUI, else None."""
+    try:
+        from comfy.utils import ProgressBar
+    except Exception:
+        return None
+    return ProgressBar(max(int(total), 1))
+
+
+def _clean_joints(joints):
+    cleaned = {}
+    for jname, pos in joints.items():
+        if not isinstance(pos, (list, tuple)) or len(pos) != 3:
+            continue
+        cleaned[jname] = [float(pos[0]), float(pos[1]), float(pos[2])]
+    return cleaned
+
+
+async def _stream_joint_frames(args, expected):
+    """
+    Run the extractor with --stream 1 and collect the joint frames as Blender
+    prints them, ticking the progress bar per frame instead of waiting for
+    the process to exit. Returns (BlenderResult, joint_frames).
+    """
+    joint_frames = []
+    state = {"total": expected}
+    pbar = _progress_bar(expected)
+
+    def _on_line(line):
+        if line.startswith(STREAM_FRAME_PREFIX):
+            try:
+                record = json.loads(line[len(STREAM_FRAME_PREFIX):])
+            except ValueError:
+                return True
+            joint_frames.append(_clean_joints(record.get("joints", {})))
+            if pbar is not None:
+                pbar.update_absolute(len(joint_frames), state["total"])
+            return False
+        if line.startswith(STREAM_HEADER_PREFIX):
+            # Start of a run (also of a retried one): drop anything collected so far
+            del joint_frames[:]
+            try:
+                state["total"] = int(json.loads(line[len(STREAM_HEADER_PREFIX):]).get("total", expected))
+            except ValueError:
+                pass
+            return False
+        return True
+
+    result = await run_blender(args, "FBX Pose BODY_25 Match (Blender)", on_stdout_line=_on_line)
+    return result, joint_frames
+
+
+def _joint_frames_from_block(block, count, names=POSE_JOINT_NAMES, order=None):
+    """
+    Joints array [F, J, 3] (NaN = missing) -> per-frame joint dicts. order is
+    the joint order the extractor produced (frame_info["joint_order"]); the
+    dicts follow it, since it is the dot draw order. Default: column order.
+    """
+    columns = list(range(len(names)))
+    if order:
+        index = {name: j for j, name in enumerate(names)}
+        ordered = [index[name] for name in order if name in index]
+        seen = set(ordered)
+        columns = ordered + [j for j in columns if j not in seen]
+
+    joint_frames = []
+    for row in block[:count]:
+        present = ~np.isnan(row).any(axis=1)
+        joint_frames.append({
+            names[j]: [float(v) for v in row[j]]
+            for j in columns
+            if present[j]
+        })
+    return joint_frames
+
+
+def _joint_block_from_frames(joint_frames):
+    """
+    Per-frame joint dicts -> (names, float64 [F, J, 3], NaN = missing). Every
+    joint is kept, also ones outside POSE_JOINT_NAMES, and the columns follow
+    the order the frames list their joints in, so the dicts read back from the
+    block are the ones that went in (same values, same draw order).
+    """
+    index = {}
+    for joints in joint_frames:
+        for jname in joints:
+            if jname not in index:
+                index[jname] = len(index)
+
+    block = np.full((len(joint_frames), len(index), 3), np.nan, dtype=np.float64)
+    for i, joints in enumerate(joint_frames):
+        for jname, pos in joints.items():
+            j = index.get(jname)
+            if j is not None:
+                block[i, j] = pos
+    return list(index), block
+
+
+def make_fbx_joints(names, positions, frame_info):
+    """
+    FBX_JOINTS value: the extracted world-space joints (float64 [F, J, 3],
+    NaN = missing, one column per name) plus what a render node needs to
+    reproduce FBX_Extraction's output without Blender.
+    """
+    return {
+        "joint_names": list(names),
+        "positions": positions,
+        "frame_indices": list(frame_info.get("frame_indices") or []),
+        "num_frames_requested": int(frame_info.get("num_frames_requested", positions.shape[0])),
+        "fbx_file": frame_info.get("fbx_file", ""),
+    }
+
+
+def fbx_joints_to_frames(joints):
+    """FBX_JOINTS value -> fresh per-frame joint dicts (safe to hand to the render helpers)."""
+    positions = joints["positions"]
+    return _joint_frames_from_block(positions, positions.shape[0], joints["joint_names"])
+
+
+def _pad_plan(joint_frames, num_frames, cam_profile_str, alignment_mode=None, ref_image=None):
+    """
+    (frames to render, pad_count): if fewer frames than requested, pad with
+    the last frame. The held pose renders identically, so only the real
+    frames go through projection / alignment / drawing and the pad is tacked
+    on at the end. If Cam_In still rotates/zooms over the padded range, or a
+    tracked reference video keeps moving past the last real frame, the padded
+    frames render differently and have to go through the full pipeline.
+    """
+    num_actual = len(joint_frames)
+    pad_count = max(num_frames - num_actual, 0)
+    if not pad_count:
+        return joint_frames, 0
+
+    ref_tracks_pad = (
+        alignment_mode == TRACK_ALIGNMENT_MODE
+        and ref_image is not None
+        and int(ref_image.shape[0]) > num_actual
+    )
+    if ref_tracks_pad or not _cam_profile_static(cam_profile_str, num_actual - 1, num_frames - 1):
+        return list(joint_frames) + [joint_frames[-1]] * pad_count, 0
+    return joint_frames, pad_count
+
+
+def _pad_batch(pose_tensor, pad_count):
+    if not pad_count:
+        return pose_tensor
+    import torch
+    pad = pose_tensor[-1:].expand(pad_count, -1, -1, -1)
+    return torch.cat([pose_tensor, pad], dim=0)
+
+
+def render_joint_frames(
+    joint_frames,
+    num_frames,
+    width,
+    height,
+    camera_view,
+    zoom_factor,
+    color_mode,
+    face_mode,
+    joint_size,
+    line_thickness,
+    ref_image,
+    alignment_mode,
+    projection_mode,
+    cam_profile_str=None,
+    timer=None,
+):
+    """
+    Stickman batch for the extracted joint frames, padded to num_frames with
+    the last pose. Shared by FBX_Extraction and FBX_Pose_Render.
+    """
+    if not joint_frames:
+        import torch
+        return torch.zeros((1, height, width, 3), dtype=torch.float32)
+
+    frames, pad_count = _pad_plan(joint_frames, num_frames, cam_profile_str, alignment_mode, ref_image)
+    pose_tensor = generate_aligned_pose_images(
+        frames,
+        width,
+        height,
+        camera_view,
+        zoom_factor,
+        False,
+        color_mode,
+        face_mode,
+        joint_size,
+        line_thickness,
+        ref_image,
+        alignment_mode,
+        projection_mode,
+        cam_profile_str=cam_profile_str,
+        timer=timer,
+    )
+    return _pad_batch(pose_tensor, pad_count)
+
+
+def render_joint_frames_multiview(
+    joint_frames,
+    num_frames,
+    width,
+    height,
+    views,
+    zoom_factor,
+    color_mode,
+    face_mode,
+    joint_size,
+    line_thickness,
+    ref_image,
+    alignment_mode,
+    projection_mode,
+    cam_profile_str=None,
+    timer=None,
+):
+    """
+    render_joint_frames for several cameras, views being (camera_view,
+    extra_yaw_degrees) pairs projected in one pass. One batch per view.
+    """
+    if not joint_frames:
+        import torch
+        return [torch.zeros((1, height, width, 3), dtype=torch.float32) for _ in views]
+
+    frames, pad_count = _pad_plan(joint_frames, num_frames, cam_profile_str, alignment_mode, ref_image)
+    batches = generate_multiview_pose_images(
+        frames,
+        width,
+        height,
+        views,
+        zoom_factor,
+        color_mode,
+        face_mode,
+        joint_size,
+        line_thickness,
+        ref_image,
+        alignment_mode,
+        projection_mode,
+        cam_profile_str=cam_profile_str,
+        timer=timer,
+    )
+    return [_pad_batch(batch, pad_count) for batch in batches]
 
 
 class FBX_Extraction:
@@ -67,18 +346,30 @@ class FBX_Extraction:
                         "Match Full Body",
                         "Upper Body (Head-Hips)",
                         "Auto (Full/Partial)",
+                        "Track Ref Video (Per-Frame)",
                     ],
                     {"default": "Match Full Body"},
                 ),
+                # Shared Memory: Blender writes joints straight into a block the
+                # node maps, no joint_data.json. Stream: frames arrive on stdout
+                # as Blender evaluates them, with progress reporting
+                "Transport": (
+                    ["JSON Files", "Shared Memory", "Stream (stdout)"],
+                    {"default": "JSON Files"},
+                ),
             },
             "optional": {
                 "Ref_Pose_Image": ("IMAGE",),
                 "Cam_In": ("STRING", {"default": "", "multiline": False}),
+                # Shared FBX_Multipass_Blender result instead of a Blender run here
+                "Multipass": ("FBX_MULTIPASS",),
             },
         }
 
-    RETURN_TYPES = ("IMAGE", "STRING",)
-    RETURN_NAMES = ("Pose_Images", "Frame_Info",)
+    # Joints: the extracted skeleton, for FBX_Pose_Render nodes to re-render
+    # (other size / view / style) without another Blender run
+    RETURN_TYPES = ("IMAGE", "STRING", "FBX_JOINTS",)
+    RETURN_NAMES = ("Pose_Images", "Frame_Info", "Joints",)
     FUNCTION = "generate_pose_images"
     CATEGORY = "Animation/FBX_Clivey"
 
@@ -91,14 +382,7 @@ class FBX_Extraction:
             )
         return path
 
-    def _blank_image_stack(self, frames, width, height):
-        import torch
-        if frames <= 0:
-            frames = 1
-        arr = np.zeros((frames, height, width, 3), dtype=np.float32)
-        return torch.from_numpy(arr)
-
-    def generate_pose_images(
+    async def generate_pose_images(
         self,
         Blender_Executable,
         FBX_File,
@@ -118,8 +402,10 @@ class FBX_Extraction:
         Zoom_Factor,
 
         Alignment_Mode,
+        Transport="JSON Files",
         Cam_In=None,
         Ref_Pose_Image=None,
+        Multipass=None,
     ):
         Inplace = False
         blender_exe = Blender_Executable.strip().strip('"')
@@ -134,107 +420,150 @@ class FBX_Extraction:
                 f"FBX Pose BODY_25 Match (Blender): FBX file not found:\n{fbx_path}"
             )
 
-        script_path = self._get_script_path()
+        timer = StageTimer()
+        prof = start_profile()
+        blender_seconds = None
+        joint_frames = None
+        if Multipass is not None:
+            from .fbx_multipass_node import multipass_output
 
-        if Frame_Mode == "Frame_Spread_TotalAnim":
-            if End_Frame <= Start_Frame:
-                End_Frame = Start_Frame + max(Num_Frames - 1, 0)
+            out_dir, multipass_info = multipass_output(
+                Multipass, "pose", "FBX Pose BODY_25 Match (Blender)"
+            )
+            blender_stdout = blender_stderr = "(shared multipass job)"
         else:
-            if End_Frame < Start_Frame:
-                End_Frame = Start_Frame
+            multipass_info = None
+            script_path = self._get_script_path()
 
-        out_dir = os.path.join(
-            tempfile.gettempdir(),
-            f"fbx_pose_blender_body25_match_{uuid.uuid4().hex}",
-        )
-        os.makedirs(out_dir, exist_ok=True)
-
-        args = [
-            blender_exe,
-            "-b",
-            "-P", script_path,
-            "--",
-            "--fbx", fbx_path,
-            "--out", out_dir,
-            "--frame_mode", Frame_Mode,
-            "--num_frames", str(Num_Frames),
-            "--start_frame", str(Start_Frame),
-            "--end_frame", str(End_Frame),
-            "--frame_step", str(Frame_Step),
-        ]
-
-        result = subprocess.run(
-            args,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=False,
-        )
+            if Frame_Mode == "Frame_Spread_TotalAnim":
+                if End_Frame <= Start_Frame:
+                    End_Frame = Start_Frame + max(Num_Frames - 1, 0)
+            else:
+                if End_Frame < Start_Frame:
+                    End_Frame = Start_Frame
 
-        if result.returncode != 0:
-            raise RuntimeError(
-                "FBX Pose BODY_25 Match (Blender): Blender pose extractor failed.\n"
-                f"Command: {' '.join(args)}\n"
-                f"STDOUT:\n{result.stdout}\n"
-                f"STDERR:\n{result.stderr}\n"
-            )
+            out_dir = new_job_dir("fbx_pose_blender_body25_match")
 
-        joint_json_path = os.path.join(out_dir, "joint_data.json")
-        if not os.path.isfile(joint_json_path):
-            raise RuntimeError(
-                "FBX Pose BODY_25 Match (Blender): joint_data.json not produced by Blender script.\n"
-                f"Output dir: {out_dir}\n"
-                f"STDOUT:\n{result.stdout}\n"
-                f"STDERR:\n{result.stderr}\n"
-            )
+            args = [
+                blender_exe,
+                "-b",
+                "-P", script_path,
+                "--",
+                "--fbx", fbx_path,
+                "--out", out_dir,
+                "--frame_mode", Frame_Mode,
+                "--num_frames", str(Num_Frames),
+                "--start_frame", str(Start_Frame),
+                "--end_frame", str(End_Frame),
+                "--frame_step", str(Frame_Step),
+            ]
 
-        with open(joint_json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        frames = data.get("frames", [])
-        joint_frames = []
-        for fitem in frames:
-            joints = fitem.get("joints", {})
-            cleaned = {}
-            for jname, pos in joints.items():
-                if not isinstance(pos, (list, tuple)) or len(pos) != 3:
-                    continue
-                cleaned[jname] = [float(pos[0]), float(pos[1]), float(pos[2])]
-            joint_frames.append(cleaned)
-
-        num_actual = len(joint_frames)
-
-        if num_actual == 0:
-            pose_tensor = self._blank_image_stack(
-                1, Output_Width, Output_Height
-            )
-        else:
-            # If fewer frames than requested, pad with last frame
-            if num_actual < Num_Frames:
-                last_frame = joint_frames[-1]
-                pad_count = Num_Frames - num_actual
-                for _ in range(pad_count):
-                    joint_frames.append(last_frame)
-
-            pose_tensor = generate_aligned_pose_images(
-                joint_frames,
-                Output_Width,
-                Output_Height,
-                Camera_View,
-                Zoom_Factor,
-                Inplace,
-                Color_Mode,
-                Face_Mode,
-                Joint_Size,
-                Line_Thickness,
-                Ref_Pose_Image,
-                Alignment_Mode,
-                Projection_Mode,
-                cam_profile_str=Cam_In,
-            )
+            shm = shm_block = None
+            if Transport == "Shared Memory":
+                # Frame_Spread / Frame_Range never yield more than Num_Frames frames
+                capacity = max(Num_Frames, 1)
+                shm, shm_block = create_block((capacity, len(POSE_JOINT_NAMES), 3), np.float32)
+                args += [
+                    "--joint_layout", ",".join(POSE_JOINT_NAMES),
+                    "--shm_name", shm.name,
+                    "--shm_frames", str(capacity),
+                ]
+
+            elif Transport == "Stream (stdout)":
+                args += ["--stream", "1"]
+
+            try:
+                if Transport == "Stream (stdout)":
+                    result, joint_frames = await _stream_joint_frames(args, Num_Frames)
+                else:
+                    result = await run_blender(args, "FBX Pose BODY_25 Match (Blender)")
+                blender_stdout = result.stdout
+                blender_stderr = result.stderr
+                blender_seconds = result.seconds
+
+                if result.returncode != 0:
+                    raise RuntimeError(
+                        "FBX Pose BODY_25 Match (Blender): Blender pose extractor failed.\n"
+                        f"Command: {' '.join(args)}\n"
+                        f"STDOUT:\n{blender_stdout}\n"
+                        f"STDERR:\n{blender_stderr}\n"
+                    )
+
+                if joint_frames is not None and not joint_frames:
+                    raise RuntimeError(
+                        "FBX Pose BODY_25 Match (Blender): no joint frames streamed by Blender script.\n"
+                        f"STDOUT:\n{blender_stdout}\n"
+                        f"STDERR:\n{blender_stderr}\n"
+                    )
+
+                if shm is not None:
+                    shm_count = 0
+                    joint_order = None
+                    try:
+                        with open(os.path.join(out_dir, "frame_info.json"), "r", encoding="utf-8") as f:
+                            shm_info = json.load(f)
+                        shm_count = int(shm_info.get("shm_count", 0))
+                        joint_order = shm_info.get("joint_order")
+                    except Exception:
+                        pass
+                    if shm_count <= 0:
+                        raise RuntimeError(
+                            "FBX Pose BODY_25 Match (Blender): no joint frames written to shared memory.\n"
+                            f"Output dir: {out_dir}\n"
+                            f"STDOUT:\n{blender_stdout}\n"
+                            f"STDERR:\n{blender_stderr}\n"
+                        )
+                    with timer.stage("joint_load"):
+                        joint_frames = _joint_frames_from_block(
+                            shm_block, min(shm_count, capacity), order=joint_order
+                        )
+            finally:
+                if shm is not None:
+                    shm_block = None
+                    release_block(shm, unlink=True)
+
+        if joint_frames is None:
+            joint_json_path = os.path.join(out_dir, "joint_data.json")
+            if not os.path.isfile(joint_json_path):
+                raise RuntimeError(
+                    "FBX Pose BODY_25 Match (Blender): joint_data.json not produced by Blender script.\n"
+                    f"Output dir: {out_dir}\n"
+                    f"STDOUT:\n{blender_stdout}\n"
+                    f"STDERR:\n{blender_stderr}\n"
+                )
+
+            with timer.stage("joint_load"):
+                with open(joint_json_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+
+                frames = data.get("frames", [])
+                joint_frames = [_clean_joints(fitem.get("joints", {})) for fitem in frames]
+
+        # Before rendering: keep the joints as extracted for the Joints output
+        joint_names, joint_block = _joint_block_from_frames(joint_frames)
+
+        pose_tensor = render_joint_frames(
+            joint_frames,
+            Num_Frames,
+            Output_Width,
+            Output_Height,
+            Camera_View,
+            Zoom_Factor,
+            Color_Mode,
+            Face_Mode,
+            Joint_Size,
+            Line_Thickness,
+            Ref_Pose_Image,
+            Alignment_Mode,
+            Projection_Mode,
+            cam_profile_str=Cam_In,
+            timer=timer,
+        )
 
         frame_info_path = os.path.join(out_dir, "frame_info.json")
-        if os.path.isfile(frame_info_path):
+        if multipass_info is not None:
+            frame_info = multipass_info
+        elif os.path.isfile(frame_info_path):
             try:
                 with open(frame_info_path, "r", encoding="utf-8") as f:
                     frame_info = json.load(f)
@@ -256,5 +585,11 @@ class FBX_Extraction:
         frame_info.setdefault("inplace", bool(Inplace))
         frame_info.setdefault("alignment_mode", Alignment_Mode)
         frame_info.setdefault("skeleton_style", "BODY_25_MATCH_IMAGE")
+        frame_info.setdefault("transport", "JSON Files" if multipass_info is not None else Transport)
+        attach_timings(frame_info, timer, blender_seconds, prof, "fbx_pose_node")
+
+        if multipass_info is None:
+            # Everything is loaded, the job folder can go
+            finish_job_dir(out_dir)
 
-        return (pose_tensor, json.dumps(frame_info))
+        return (pose_tensor, json.dumps(frame_info), make_fbx_joints(joint_names, joint_block, frame_info))
@@ -0,0 +1,312 @@
+# Renders stickmen from a FBX_Extraction "Joints" output (FBX_JOINTS) without
+# running Blender again. One extraction can feed several of these with
+# different sizes / views / styles / reference images; each one only pays for
+# projection + drawing.
+#
+# FBX_Pose_Render_MultiView does several cameras (a list of views, or an orbit
+# of N yaw angles) from one extraction, projected in a single vectorised pass.
+
+import json
+
+import torch
+
+from .fbx_pose_node_body25_match import (
+    fbx_joints_to_frames,
+    render_joint_frames,
+    render_joint_frames_multiview,
+)
+from .fbx_timing import StageTimer, attach_timings, start_profile
+
+CAMERA_VIEWS = ["Front", "Back", "Left Side", "Right Side", "Top", "Auto (Face Camera)"]
+
+# Views that get their own output socket on the multi-view node (the rest are
+# only in All_Views)
+MULTIVIEW_OUTPUTS = 4
+
+
+def _parse_views(text):
+    """
+    "Front, Left Side, 45" -> [("Front", 0.0), ("Left Side", 0.0), ("Front", 45.0)].
+    A number is a yaw (degrees) around the Front camera.
+    """
+    views = []
+    lookup = {v.lower(): v for v in CAMERA_VIEWS}
+    for item in (text or "").replace("\n", ",").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if item.lower() in lookup:
+            views.append((lookup[item.lower()], 0.0))
+            continue
+        try:
+            views.append(("Front", float(item)))
+        except ValueError:
+            raise RuntimeError(
+                f"FBX Pose Render (Multi-View): unknown view '{item}'.\n"
+                f"Use {', '.join(CAMERA_VIEWS)} or a yaw angle in degrees."
+            )
+    return views
+
+
+def _orbit_views(count):
+    """N cameras evenly around the character, starting at Front."""
+    return [("Front", 360.0 * i / count) for i in range(count)]
+
+
+class FBX_Pose_Render:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "Joints": ("FBX_JOINTS",),
+                # 0 = as many frames as FBX_Extraction was asked for (padded with the last pose)
+                "Num_Frames": ("INT", {"default": 0, "min": 0, "max": 9999}),
+                "Output_Width": ("INT", {"default": 1024, "min": 64, "max": 2048}),
+                "Output_Height": ("INT", {"default": 1024, "min": 64, "max": 2048}),
+                "Camera_View": (CAMERA_VIEWS, {"default": "Front"}),
+                "Projection_Mode": (
+                    ["Orthographic (Stable)", "Perspective (Experimental)"],
+                    {"default": "Perspective (Experimental)"},
+                ),
+                "Color_Mode": (
+                    ["White", "OpenPose", "ControlNet Colors"],
+                    {"default": "ControlNet Colors"},
+                ),
+                "Face_Mode": (
+                    ["Off", "Dots Only (BODY_25)", "Full Face (FACE_70)"],
+                    {"default": "Full Face (FACE_70)"},
+                ),
+                "Joint_Size": ("INT", {"default": 4, "min": 1, "max": 50}),
+                "Line_Thickness": ("INT", {"default": 2, "min": 1, "max": 50}),
+                "Zoom_Factor": (
+                    "FLOAT",
+                    {"default": 1.0, "min": 0.1, "max": 20.0, "step": 0.1},
+                ),
+                "Alignment_Mode": (
+                    [
+                        "Off",
+                        "Match Full Body",
+                        "Upper Body (Head-Hips)",
+                        "Auto (Full/Partial)",
+                        "Track Ref Video (Per-Frame)",
+                    ],
+                    {"default": "Match Full Body"},
+                ),
+            },
+            "optional": {
+                "Ref_Pose_Image": ("IMAGE",),
+                "Cam_In": ("STRING", {"default": "", "multiline": False}),
+            },
+        }
+
+    RETURN_TYPES = ("IMAGE", "STRING",)
+    RETURN_NAMES = ("Pose_Images", "Frame_Info",)
+    FUNCTION = "render_pose_images"
+    CATEGORY = "Animation/FBX_Clivey"
+
+    def render_pose_images(
+        self,
+        Joints,
+        Num_Frames,
+        Output_Width,
+        Output_Height,
+        Camera_View,
+        Projection_Mode,
+        Color_Mode,
+        Face_Mode,
+        Joint_Size,
+        Line_Thickness,
+        Zoom_Factor,
+        Alignment_Mode,
+        Ref_Pose_Image=None,
+        Cam_In=None,
+    ):
+        if not isinstance(Joints, dict) or "positions" not in Joints:
+            raise RuntimeError("FBX Pose Render: Joints input is not a FBX_Extraction Joints output.")
+
+        timer = StageTimer()
+        prof = start_profile()
+
+        with timer.stage("joint_load"):
+            joint_frames = fbx_joints_to_frames(Joints)
+        num_frames = Num_Frames if Num_Frames > 0 else Joints.get("num_frames_requested", len(joint_frames))
+
+        pose_tensor = render_joint_frames(
+            joint_frames,
+            num_frames,
+            Output_Width,
+            Output_Height,
+            Camera_View,
+            Zoom_Factor,
+            Color_Mode,
+            Face_Mode,
+            Joint_Size,
+            Line_Thickness,
+            Ref_Pose_Image,
+            Alignment_Mode,
+            Projection_Mode,
+            cam_profile_str=Cam_In,
+            timer=timer,
+        )
+
+        frame_info = {
+            "fbx_file": Joints.get("fbx_file", ""),
+            "frame_indices": list(Joints.get("frame_indices", [])),
+            "num_frames_requested": num_frames,
+            "camera_view": Camera_View,
+            "projection_mode": Projection_Mode,
+            "color_mode": Color_Mode,
+            "face_mode": Face_Mode,
+            "output_width": Output_Width,
+            "output_height": Output_Height,
+            "zoom_factor": Zoom_Factor,
+            "alignment_mode": Alignment_Mode,
+            "skeleton_style": "BODY_25_MATCH_IMAGE",
+            "source": "FBX_JOINTS",
+        }
+        attach_timings(frame_info, timer, None, prof, "fbx_pose_render_node")
+
+        return (pose_tensor, json.dumps(frame_info))
+
+
+class FBX_Pose_Render_MultiView:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "Joints": ("FBX_JOINTS",),
+                # Comma separated camera views; a number is a yaw angle around Front
+                "Views": ("STRING", {"default": "Front, Left Side, Right Side, Back", "multiline": False}),
+                # > 0: ignore Views and orbit N cameras evenly around the character
+                "Orbit_Views": ("INT", {"default": 0, "min": 0, "max": 72}),
+                # View by View: all frames of view 1, then view 2, ...
+                # Frame by Frame: frame 1 of every view, then frame 2, ...
+                "Batch_Order": (
+                    ["View by View", "Frame by Frame"],
+                    {"default": "View by View"},
+                ),
+                # 0 = as many frames as FBX_Extraction was asked for (padded with the last pose)
+                "Num_Frames": ("INT", {"default": 0, "min": 0, "max": 9999}),
+                "Output_Width": ("INT", {"default": 1024, "min": 64, "max": 2048}),
+                "Output_Height": ("INT", {"default": 1024, "min": 64, "max": 2048}),
+                "Projection_Mode": (
+                    ["Orthographic (Stable)", "Perspective (Experimental)"],
+                    {"default": "Perspective (Experimental)"},
+                ),
+                "Color_Mode": (
+                    ["White", "OpenPose", "ControlNet Colors"],
+                    {"default": "ControlNet Colors"},
+                ),
+                "Face_Mode": (
+                    ["Off", "Dots Only (BODY_25)", "Full Face (FACE_70)"],
+                    {"default": "Full Face (FACE_70)"},
+                ),
+                "Joint_Size": ("INT", {"default": 4, "min": 1, "max": 50}),
+                "Line_Thickness": ("INT", {"default": 2, "min": 1, "max": 50}),
+                "Zoom_Factor": (
+                    "FLOAT",
+                    {"default": 1.0, "min": 0.1, "max": 20.0, "step": 0.1},
+                ),
+                "Alignment_Mode": (
+                    [
+                        "Off",
+                        "Match Full Body",
+                        "Upper Body (Head-Hips)",
+                        "Auto (Full/Partial)",
+                        "Track Ref Video (Per-Frame)",
+                    ],
+                    {"default": "Off"},
+                ),
+            },
+            "optional": {
+                "Ref_Pose_Image": ("IMAGE",),
+                "Cam_In": ("STRING", {"default": "", "multiline": False}),
+            },
+        }
+
+    RETURN_TYPES = ("IMAGE",) * (1 + MULTIVIEW_OUTPUTS) + ("STRING",)
+    RETURN_NAMES = ("All_Views",) + tuple(f"View_{i + 1}" for i in range(MULTIVIEW_OUTPUTS)) + ("Views_Info",)
+    FUNCTION = "render_views"
+    CATEGORY = "Animation/FBX_Clivey"
+
+    def render_views(
+        self,
+        Joints,
+        Views,
+        Orbit_Views,
+        Batch_Order,
+        Num_Frames,
+        Output_Width,
+        Output_Height,
+        Projection_Mode,
+        Color_Mode,
+        Face_Mode,
+        Joint_Size,
+        Line_Thickness,
+        Zoom_Factor,
+        Alignment_Mode,
+        Ref_Pose_Image=None,
+        Cam_In=None,
+    ):
+        if not isinstance(Joints, dict) or "positions" not in Joints:
+            raise RuntimeError("FBX Pose Render (Multi-View): Joints input is not a FBX_Extraction Joints output.")
+
+        views = _orbit_views(Orbit_Views) if Orbit_Views > 0 else _parse_views(Views)
+        if not views:
+            raise RuntimeError("FBX Pose Render (Multi-View): no views given.")
+
+        timer = StageTimer()
+        prof = start_profile()
+
+        with timer.stage("joint_load"):
+            joint_frames = fbx_joints_to_frames(Joints)
+        num_frames = Num_Frames if Num_Frames > 0 else Joints.get("num_frames_requested", len(joint_frames))
+
+        batches = render_joint_frames_multiview(
+            joint_frames,
+            num_frames,
+            Output_Width,
+            Output_Height,
+            views,
+            Zoom_Factor,
+            Color_Mode,
+            Face_Mode,
+            Joint_Size,
+            Line_Thickness,
+            Ref_Pose_Image,
+            Alignment_Mode,
+            Projection_Mode,
+            cam_profile_str=Cam_In,
+            timer=timer,
+        )
+
+        with timer.stage("batch_concat"):
+            if Batch_Order == "Frame by Frame":
+                all_views = torch.stack(batches, dim=1).reshape((-1,) + tuple(batches[0].shape[1:]))
+            else:
+                all_views = torch.cat(batches, dim=0)
+
+        # Sockets past the number of views get a single black frame
+        blank = torch.zeros((1, Output_Height, Output_Width, 3), dtype=torch.float32)
+        per_view = [batches[i] if i < len(batches) else blank for i in range(MULTIVIEW_OUTPUTS)]
+
+        views_info = {
+            "fbx_file": Joints.get("fbx_file", ""),
+            "frame_indices": list(Joints.get("frame_indices", [])),
+            "num_frames_requested": num_frames,
+            "frames_per_view": int(batches[0].shape[0]),
+            "views": [{"camera_view": view, "yaw_offset": yaw} for view, yaw in views],
+            "batch_order": Batch_Order,
+            "projection_mode": Projection_Mode,
+            "color_mode": Color_Mode,
+            "face_mode": Face_Mode,
+            "output_width": Output_Width,
+            "output_height": Output_Height,
+            "zoom_factor": Zoom_Factor,
+            "alignment_mode": Alignment_Mode,
+            "skeleton_style": "BODY_25_MATCH_IMAGE",
+            "source": "FBX_JOINTS",
+        }
+        attach_timings(views_info, timer, None, prof, "fbx_pose_render_multiview")
+
+        return (all_views, *per_view, json.dumps(views_info))
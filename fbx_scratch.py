@@ -0,0 +1,194 @@
+# Scratch space for the Blender job folders (PNGs, JSON, mesh exports).
+# Every node used to drop a fbx_*_{uuid} folder in the system temp dir and
+# never remove it, so a week of renders left thousands of them behind.
+#
+#   - all job folders live under one root (FBX_IMPORT_SCRATCH_DIR, default
+#     <tempdir>/fbx_import_scratch)
+#   - a job folder is removed as soon as its node has loaded the results
+#   - folders that are kept (failed runs, FBX_IMPORT_KEEP_OUTPUTS=1) are
+#     trimmed oldest-first once the root goes over FBX_IMPORT_SCRATCH_MAX_MB
+#   - multipass results are pinned to their node while ComfyUI can still serve
+#     them from its cache, and only join the trimmable folders once the node
+#     produces a new one
+#   - the old fbx_pose_blender_* / fbx_canny_blender_* folders left in the temp
+#     dir by earlier versions are swept by the same janitor
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+SCRATCH_DIR_ENV = "FBX_IMPORT_SCRATCH_DIR"
+SCRATCH_MAX_MB_ENV = "FBX_IMPORT_SCRATCH_MAX_MB"
+KEEP_OUTPUTS_ENV = "FBX_IMPORT_KEEP_OUTPUTS"
+
+DEFAULT_MAX_BYTES = 2048 * 1024 * 1024
+
+# Folders touched more recently than this are never trimmed, so a job running
+# in another ComfyUI process (or a multipass result about to be read) is safe
+JANITOR_GRACE_SECONDS = 10 * 60
+
+# Don't walk the scratch tree more often than this
+JANITOR_INTERVAL_SECONDS = 60
+
+# A job folder whose node raised never gets finish_job_dir(); after this long
+# it stops counting as in use and is trimmed like any kept folder
+ACTIVE_MAX_SECONDS = 24 * 60 * 60
+
+LEGACY_PREFIXES = ("fbx_pose_blender_", "fbx_canny_blender_")
+
+_lock = threading.Lock()
+_active = {}
+# owner (node id) -> the job folder its cached output points at
+_pinned = {}
+_last_sweep = 0.0
+
+
+def scratch_root():
+    root = os.environ.get(SCRATCH_DIR_ENV, "").strip()
+    if not root:
+        root = os.path.join(tempfile.gettempdir(), "fbx_import_scratch")
+    os.makedirs(root, exist_ok=True)
+    return root
+
+
+def scratch_budget():
+    """Byte budget for kept folders (FBX_IMPORT_SCRATCH_MAX_MB)."""
+    try:
+        return int(float(os.environ[SCRATCH_MAX_MB_ENV]) * 1024 * 1024)
+    except (KeyError, ValueError):
+        return DEFAULT_MAX_BYTES
+
+
+def keep_outputs():
+    return os.environ.get(KEEP_OUTPUTS_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def new_job_dir(prefix):
+    """Create a fresh job folder under the scratch root (and maybe trim old ones)."""
+    path = os.path.join(scratch_root(), f"{prefix}_{uuid.uuid4().hex}")
+    os.makedirs(path, exist_ok=True)
+    with _lock:
+        _active[path] = time.time()
+    run_janitor()
+    return path
+
+
+def touch_job_dir(path):
+    """Mark a kept folder as recently used so the janitor trims it last."""
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+def finish_job_dir(path, success=True):
+    """
+    Done with a job folder: delete it after a successful load unless outputs
+    are being kept, otherwise leave it for the janitor's byte budget.
+    """
+    with _lock:
+        _active.pop(path, None)
+    if success and not keep_outputs():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        touch_job_dir(path)
+
+
+def pin_job_dir(path, owner):
+    """
+    Keep a finished job folder away from the janitor for as long as it is
+    owner's latest result (multipass outputs that ComfyUI may serve from its
+    cache). The folder the owner pinned before is handed over to the janitor.
+    """
+    with _lock:
+        _active.pop(path, None)
+        previous = _pinned.get(owner)
+        _pinned[owner] = path
+    if previous is not None and previous != path:
+        touch_job_dir(previous)
+    touch_job_dir(path)
+
+
+def unpin_job_dir(owner):
+    """Forget owner's pinned folder (it went missing), without touching it."""
+    with _lock:
+        _pinned.pop(owner, None)
+
+
+def pinned_job_dir(owner):
+    """The folder owner has pinned, or None."""
+    with _lock:
+        return _pinned.get(owner)
+
+
+def _dir_size(path):
+    total = 0
+    for base, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(base, name))
+            except OSError:
+                pass
+    return total
+
+
+def _candidates():
+    """(mtime, path) of every job folder the janitor owns, oldest first."""
+    found = []
+    roots = [(scratch_root(), None)]
+    legacy_root = tempfile.gettempdir()
+    if os.path.abspath(legacy_root) != os.path.abspath(roots[0][0]):
+        roots.append((legacy_root, LEGACY_PREFIXES))
+
+    for root, prefixes in roots:
+        try:
+            entries = list(os.scandir(root))
+        except OSError:
+            continue
+        for entry in entries:
+            if prefixes is not None and not entry.name.startswith(prefixes):
+                continue
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                found.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                continue
+    found.sort()
+    return found
+
+
+def run_janitor(max_bytes=None, force=False):
+    """
+    Trim kept job folders oldest-first until they fit in the byte budget.
+    Folders in use or pinned by this process or touched within the grace
+    window are skipped. Returns the number of bytes freed.
+    """
+    global _last_sweep
+    now = time.time()
+    with _lock:
+        if not force and now - _last_sweep < JANITOR_INTERVAL_SECONDS:
+            return 0
+        _last_sweep = now
+        active = {path for path, started in _active.items() if now - started < ACTIVE_MAX_SECONDS}
+        active.update(_pinned.values())
+
+    if max_bytes is None:
+        max_bytes = scratch_budget()
+
+    sized = [(mtime, path, _dir_size(path)) for mtime, path in _candidates()]
+    total = sum(size for _mtime, _path, size in sized)
+
+    freed = 0
+    for mtime, path, size in sized:
+        if total <= max_bytes:
+            break
+        if path in active or now - mtime < JANITOR_GRACE_SECONDS:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        freed += size
+    return freed
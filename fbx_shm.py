@@ -0,0 +1,120 @@
+# Shared-memory frame blocks between the ComfyUI nodes and the Blender
+# subprocess. The node allocates a block sized for the whole clip, passes its
+# name on the command line, Blender attaches and writes each frame straight
+# into it, and the node maps it as a NumPy array - no PNG encode/decode and no
+# per-frame files.
+#
+# Imported both by the node package and by the Blender scripts (via sys.path),
+# so this file must not import bpy, torch or anything relative.
+
+import uuid
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def _block_size(shape, dtype):
+    return max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+
+
+def create_block(shape, dtype):
+    """
+    Allocate a named block for an array of shape/dtype (node side).
+    Returns (shm, array view). Call release_block(shm, unlink=True) when done.
+    """
+    name = f"fbx_{uuid.uuid4().hex[:16]}"
+    shm = shared_memory.SharedMemory(name=name, create=True, size=_block_size(shape, dtype))
+    arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return shm, arr
+
+
+def attach_block(name, shape, dtype):
+    """
+    Attach to a block created by the node (Blender side). The block is
+    unregistered from this process's resource tracker, otherwise Python
+    unlinks it when Blender exits and the node loses the data.
+    """
+    try:
+        shm = shared_memory.SharedMemory(name=name, create=False, track=False)
+    except TypeError:
+        # Python < 3.13 has no track= argument
+        shm = shared_memory.SharedMemory(name=name, create=False)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+    arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return shm, arr
+
+
+def release_block(shm, unlink=False):
+    """Close (and optionally unlink) a block; array views must be dropped first."""
+    try:
+        shm.close()
+    except Exception:
+        pass
+    if unlink:
+        try:
+            shm.unlink()
+        except Exception:
+            pass
+
+
+def viewer_pixels(image, out=None):
+    """
+    Read a Blender image (e.g. bpy.data.images['Viewer Node']) into a
+    top-down float32 [H, W, 4] array. Blender stores rows bottom-up.
+    """
+    width, height = image.size
+    flat = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(flat)
+    pixels = flat.reshape(height, width, 4)[::-1]
+    if out is None:
+        return np.ascontiguousarray(pixels)
+    out[...] = pixels
+    return out
+
+
+# Colour management the RGB passes render with, on the PNG and the Viewer
+# readback paths alike. Viewer pixels are scene-linear and linear_to_srgb is
+# only Blender's display transform under these settings (Filmic / AgX, the
+# factory defaults, can't be reproduced here), so both paths force them.
+STANDARD_VIEW_SETTINGS = (
+    ("view_transform", "Standard"),
+    ("look", "None"),
+    ("exposure", 0.0),
+    ("gamma", 1.0),
+)
+
+
+def apply_standard_view(view_settings):
+    """Set a scene's (or an image format's) view_settings to STANDARD_VIEW_SETTINGS."""
+    for attr, value in STANDARD_VIEW_SETTINGS:
+        setattr(view_settings, attr, value)
+
+
+def linear_to_srgb(linear):
+    """
+    Standard sRGB transfer curve, for turning linear render pixels into display
+    values (what Blender writes under STANDARD_VIEW_SETTINGS).
+    """
+    linear = np.clip(linear, 0.0, 1.0)
+    return np.where(
+        linear <= 0.0031308,
+        linear * 12.92,
+        1.055 * np.power(linear, 1.0 / 2.4) - 0.055,
+    )
+
+
+def rgb_to_gray(rgb):
+    """
+    uint8 [..., 3] RGB -> uint8 grey with PIL's convert("L") fixed-point
+    weights (R*299/1000 + G*587/1000 + B*114/1000, rounded), so every path
+    that feeds Canny gives the same grey for the same 8-bit pixels.
+    """
+    acc = rgb[..., 0].astype(np.uint32) * 19595
+    acc += rgb[..., 1].astype(np.uint32) * 38470
+    acc += rgb[..., 2].astype(np.uint32) * 7471
+    acc += 0x8000
+    return (acc >> 16).astype(np.uint8)
@@ -0,0 +1,86 @@
+# CPU linear blend skinning for the skin data written by fbx_depth_extract.py.
+# The mesh, weights and inverse binds are exported once; every frame after
+# that is only a [B, 4, 4] bone matrix stack, and all frames are re-posed here
+# in batched matrix ops instead of Blender evaluating the mesh per frame.
+#
+#   v_f = sum_k  w[v, k] * (bone_mats[f, idx[v, k]] @ inv_bind[idx[v, k]]) @ rest[v]
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Frame chunks are skinned in parallel (matmul / einsum release the GIL)
+SKIN_WORKERS = min(8, os.cpu_count() or 1)
+
+# Rough cap on the gathered per-vertex matrices of one chunk (bytes)
+SKIN_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def skin_matrices(bone_mats, inv_bind):
+    """bone_mats [F, B, 4, 4] @ inv_bind [B, 4, 4] -> affine rows [F, B, 3, 4]."""
+    mats = np.matmul(np.asarray(bone_mats, dtype=np.float32), np.asarray(inv_bind, dtype=np.float32))
+    return mats[:, :, :3, :]
+
+
+def skin_vertices(rest, bone_idx, bone_w, skin_mats, workers=SKIN_WORKERS):
+    """
+    Linear blend skinning of all frames.
+
+    rest [V, 3], bone_idx [V, K], bone_w [V, K] (rows sum to 1),
+    skin_mats [F, B, 3, 4] from skin_matrices(). Returns float32 [F, V, 3].
+
+    Per frame the K influences are blended into one 3x4 matrix per vertex
+    first (sparse weights x bone matrices), then applied once.
+    """
+    rest = np.asarray(rest, dtype=np.float32)
+    bone_idx = np.asarray(bone_idx)
+    bone_w = np.asarray(bone_w, dtype=np.float32)
+
+    num_frames = skin_mats.shape[0]
+    num_verts = rest.shape[0]
+    out = np.empty((num_frames, num_verts, 3), dtype=np.float32)
+    if num_frames == 0 or num_verts == 0:
+        out.fill(np.nan)
+        return out
+
+    # Only the influences actually used (zero weights are padding)
+    used = bone_w.any(axis=0)
+    bone_idx = bone_idx[:, used]
+    bone_w = bone_w[:, used]
+
+    per_frame = num_verts * 12 * 4
+    step = max(1, SKIN_CHUNK_BYTES // per_frame)
+
+    def _run(start):
+        stop = min(start + step, num_frames)
+        mats = skin_mats[start:stop]
+        blended = np.zeros((stop - start, num_verts, 3, 4), dtype=np.float32)
+        for k in range(bone_idx.shape[1]):
+            blended += bone_w[None, :, k, None, None] * mats[:, bone_idx[:, k]]
+        out[start:stop] = (
+            np.einsum("fvij,vj->fvi", blended[..., :3], rest, optimize=True)
+            + blended[..., 3]
+        )
+
+    starts = range(0, num_frames, step)
+    if len(starts) == 1:
+        _run(0)
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            list(pool.map(_run, starts))
+    return out
+
+
+def skin_mesh_frames(mesh):
+    """
+    Fill mesh["verts"] [F, V, 3] from the skin arrays of a load_mesh_frames()
+    dict (rest / bone_idx / bone_w / inv_bind / bone_mats). No-op if the
+    export already contains baked vertices.
+    """
+    if "verts" in mesh or "bone_mats" not in mesh:
+        return mesh
+    mats = skin_matrices(mesh["bone_mats"], mesh["inv_bind"])
+    mesh["verts"] = skin_vertices(mesh["rest"], mesh["bone_idx"], mesh["bone_w"], mats)
+    return mesh
+
@@ -0,0 +1,105 @@
+# Per-stage wall-time recording for the Blender scripts and the nodes.
+# Both sides fill a StageTimer and put timer.summary() into their info JSON
+# under "timings", so a slow job shows where the time went without attaching
+# a profiler to Blender. Set FBX_IMPORT_PROFILE_DIR to also get cProfile
+# dumps (.prof, open with snakeviz / pstats) from both processes.
+#
+# Imported by the Blender scripts via sys.path too: no bpy, torch or
+# relative imports here.
+
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+PROFILE_DIR_ENV = "FBX_IMPORT_PROFILE_DIR"
+
+
+class StageTimer:
+    """Accumulated seconds per stage, plus per-item samples for mean / p95."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._totals = {}
+        self._samples = {}
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name, seconds):
+        self._totals[name] = self._totals.get(name, 0.0) + float(seconds)
+
+    def sample(self, name, seconds):
+        """One per-frame measurement; also counted in the stage total."""
+        self._samples.setdefault(name, []).append(float(seconds))
+        self.add(name, seconds)
+
+    def summary(self):
+        out = {name: round(sec, 6) for name, sec in self._totals.items()}
+        for name, values in self._samples.items():
+            ordered = sorted(values)
+            p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+            out[f"{name}_count"] = len(values)
+            out[f"{name}_mean"] = round(sum(values) / len(values), 6)
+            out[f"{name}_p95"] = round(p95, 6)
+        out["total"] = round(time.perf_counter() - self.started, 6)
+        return out
+
+
+def start_profile():
+    """cProfile.Profile already enabled if FBX_IMPORT_PROFILE_DIR is set, else None."""
+    if not os.environ.get(PROFILE_DIR_ENV, "").strip():
+        return None
+    import cProfile
+    prof = cProfile.Profile()
+    prof.enable()
+    return prof
+
+
+def dump_profile(prof, label):
+    """Stop the profiler and write <FBX_IMPORT_PROFILE_DIR>/<label>_<id>.prof; returns the path."""
+    if prof is None:
+        return None
+    prof.disable()
+    profile_dir = os.environ.get(PROFILE_DIR_ENV, "").strip()
+    try:
+        os.makedirs(profile_dir, exist_ok=True)
+        path = os.path.join(profile_dir, f"{label}_{uuid.uuid4().hex[:8]}.prof")
+        prof.dump_stats(path)
+    except OSError:
+        return None
+    return path
+
+
+def attach_timings(info, timer, blender_seconds=None, prof=None, label="node"):
+    """
+    Node side: put {"blender": <script timings>, "node": timer.summary()} into
+    info["timings"] (and the .prof paths into info["profiles"]). Blender
+    launch overhead is the wall time of the run minus what the script saw.
+    """
+    blender = info.pop("timings", None) or {}
+    if "blender" in blender:
+        # Already attached once (a FBX_Multipass_Blender result): keep its Blender side
+        blender = blender["blender"]
+    if blender_seconds is not None:
+        timer.add("blender_run", blender_seconds)
+        if "total" in blender:
+            timer.add("blender_launch", max(blender_seconds - blender["total"], 0.0))
+
+    profiles = dict(info.pop("profiles", None) or {})
+    blender_profile = info.pop("profile", None)
+    if blender_profile:
+        profiles["blender"] = blender_profile
+    node_profile = dump_profile(prof, label)
+    if node_profile:
+        profiles["node"] = node_profile
+    if profiles:
+        info["profiles"] = profiles
+
+    info["timings"] = {"blender": blender, "node": timer.summary()}
+    return info